@@ -0,0 +1,248 @@
+"""
+Measures the overhead of the SDK alone against a local mock exchange, without network latency
+or server side rate limits: orders/s, cancels/s, call latency percentiles and websocket events/s.
+
+The mock exchange runs in a separate process, see `benchmarks.mock_exchange`. The socket.io client
+logs every received event at the INFO level, the benchmark raises its level to WARNING so console
+output is not measured. Results are written as JSON, pass the file of a previous run with --compare
+to see the change between versions.
+
+Usage:
+    python -m benchmarks.bench_client --orders 2000 --concurrency 16 --events 50000
+    python -m benchmarks.bench_client --compare benchmarks/results/bench_client-0.3.18-1500fe8.json
+"""
+import argparse
+import asyncio
+import importlib.metadata
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import socket
+import subprocess
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ultrade import Client, Signer, socket_options
+from ultrade.socket_client import STREAM_EVENTS
+
+from .mock_exchange import PAIR, run
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def measure_calls(
+    calls: List[Callable[[], Awaitable]], concurrency: int, items_per_call: int = 1
+) -> Tuple[Dict[str, float], list]:
+    latencies = []
+    results = [None] * len(calls)
+    pending = iter(enumerate(calls))
+
+    async def worker():
+        for index, call in pending:
+            started = time.perf_counter()
+            results[index] = await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    return {
+        "calls": len(calls),
+        "per_second": round(len(calls) * items_per_call / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }, results
+
+
+async def measure_websocket(client: Client, events: int) -> Dict[str, float]:
+    received = 0
+    done = asyncio.Event()
+
+    def on_event(event, args):
+        nonlocal received
+        received += 1
+        if received == events:
+            done.set()
+
+    # every stream the mock exchange emits, the burst size travels in the options
+    streams = [stream for stream in STREAM_EVENTS if stream != socket_options.ERROR]
+    started = time.perf_counter()
+    handler_id = await client.subscribe(
+        {"symbol": PAIR["pair_key"], "streams": streams, "options": {"events": events}},
+        on_event,
+        inline=True,
+    )
+    await asyncio.wait_for(done.wait(), timeout=max(60, events / 1000))
+    elapsed = time.perf_counter() - started
+    await client.unsubscribe(handler_id)
+    return {"events": events, "per_second": round(events / elapsed, 1)}
+
+
+async def run_benchmarks(url: str, args) -> Dict[str, dict]:
+    client = Client(
+        "testnet",
+        api_url=url,
+        websocket_url=url,
+        verify_network=False,
+        rate_limits=None,
+        json_codec=args.json_codec,
+    )
+    results = {}
+    async with client:
+        signer = Signer.create_signer(os.urandom(32).hex())
+        results["login"], _ = await measure_calls([lambda: client.set_login_user(signer)], 1)
+        await client.get_pair_info(PAIR["pair_key"])
+
+        def order(i: int):
+            side = "B" if i % 2 else "S"
+            return lambda: client.create_order(PAIR["id"], side, "L", 1_000_000, 10 ** 18 + i)
+
+        results["create_order"], orders = await measure_calls(
+            [order(i) for i in range(args.orders)], args.concurrency
+        )
+        results["cancel_order"], _ = await measure_calls(
+            [lambda order_id=order["id"]: client.cancel_order(order_id) for order in orders],
+            args.concurrency,
+        )
+
+        batch = [
+            {"pair_id": PAIR["id"], "order_side": "B", "order_type": "L", "amount": 1_000_000, "price": 10 ** 18 + i}
+            for i in range(args.batch)
+        ]
+        batches = max(1, args.orders // args.batch)
+        results["create_bulk_orders"], created = await measure_calls(
+            [lambda: client.create_bulk_orders(batch) for _ in range(batches)],
+            args.concurrency,
+            items_per_call=args.batch,
+        )
+        results["cancel_bulk_orders"], _ = await measure_calls(
+            [
+                lambda ids=[order["id"] for order in orders]: client.cancel_bulk_orders(ids, PAIR["id"])
+                for orders in created
+            ],
+            args.concurrency,
+            items_per_call=args.batch,
+        )
+        results["get_depth"], _ = await measure_calls(
+            [lambda: client.get_depth(PAIR["pair_key"]) for _ in range(args.orders)],
+            args.concurrency,
+        )
+        results["get_orders_with_trades"], _ = await measure_calls(
+            [client.get_orders_with_trades for _ in range(args.orders // 10 or 1)],
+            args.concurrency,
+        )
+        results["websocket"] = await measure_websocket(client, args.events)
+    return results
+
+
+def sdk_version() -> Dict[str, Optional[str]]:
+    try:
+        version = importlib.metadata.version("ultrade-sdk")
+    except importlib.metadata.PackageNotFoundError:
+        version = "dev"
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(__file__),
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"version": version, "commit": commit}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def print_results(results: Dict[str, dict], previous: Optional[Dict[str, dict]] = None):
+    header = f"{'benchmark':<24}{'per second':>12}{'p50 ms':>10}{'p99 ms':>10}"
+    print(header + (f"{'vs previous':>14}" if previous else ""))
+    for name, result in results.items():
+        line = (
+            f"{name:<24}{result.get('per_second', ''):>12}"
+            f"{result.get('p50_ms', ''):>10}{result.get('p99_ms', ''):>10}"
+        )
+        before = (previous or {}).get(name, {}).get("per_second")
+        if before and "per_second" in result:
+            line += f"{result['per_second'] / before:>13.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=50, help="orders per bulk request")
+    parser.add_argument("--events", type=int, default=50000, help="websocket events of the burst")
+    parser.add_argument("--json-codec", default=None, help="json_codec option of the client")
+    parser.add_argument("--url", help="use a mock exchange that is already running")
+    parser.add_argument("--output", help="result file, defaults to benchmarks/results/bench_client-<version>-<commit>.json")
+    parser.add_argument("--compare", help="result file of a previous run")
+    args = parser.parse_args()
+    logging.getLogger("socketio.client").setLevel(logging.WARNING)
+
+    process = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        context = multiprocessing.get_context("spawn")
+        ready = context.Event()
+        process = context.Process(target=run, args=(port, ready), daemon=True)
+        process.start()
+        if not ready.wait(30):
+            raise RuntimeError("Mock exchange did not start")
+        url = f"http://127.0.0.1:{port}"
+
+    try:
+        results = asyncio.run(run_benchmarks(url, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join()
+
+    version = sdk_version()
+    report = {
+        **version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": int(time.time()),
+        "config": {
+            "orders": args.orders,
+            "concurrency": args.concurrency,
+            "batch": args.batch,
+            "events": args.events,
+            "json_codec": args.json_codec,
+        },
+        "results": results,
+    }
+    previous = None
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)["results"]
+    print(f"SDK {version['version']} ({version['commit']}), {args.orders} orders, concurrency {args.concurrency}")
+    print_results(results, previous)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"bench_client-{version['version']}-{version['commit']}.json")
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Measures websocket event dispatch throughput of the SocketController.
+
+The stream is a synthetic depth/trades recording, or a log written by `Client.start_recording`,
+replayed straight into the controller, so the numbers only include the dispatch overhead,
+up to the last callback. "legacy" is the previous dispatcher,
+which ran every callback, plus a placeholder per event, in the default executor.
+
+Usage:
+    python -m benchmarks.bench_dispatch --events 20000 --subscribers 4
+    python -m benchmarks.bench_dispatch --recording depth.ulog
+"""
+import argparse
+import asyncio
+import time
+
+from ultrade import socket_options
+from ultrade.constants import EVENT_LIST
+from ultrade.socket_client import SocketController
+from ultrade.utils.recorder import EventReplayer
+
+
+class LegacySocketController:
+    def __init__(self):
+        self.callbacks_pool = {
+            event: [(lambda *args: stream_value, stream_value)]
+            for event, stream_value in EVENT_LIST
+        }
+
+    def event_from_stream(self, stream):
+        return [event for event in self.callbacks_pool if self.callbacks_pool[event][0][1] == stream]
+
+    def handle_subscribe(self, sub_options, callback, inline=False):
+        for opt in sub_options["streams"]:
+            for event in self.event_from_stream(opt):
+                self.callbacks_pool[event].append((callback, "id"))
+
+    def close(self):
+        pass
+
+    async def callback_handler(self, event, args, id=None):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *[loop.run_in_executor(None, callback, event, args) for callback, _ in self.callbacks_pool[event]]
+        )
+
+
+def make_recording(count: int):
+    recording = []
+    for i in range(count):
+        if i % 4:
+            recording.append(("depth", {"buy": [[str(1000 - i % 10), "5"]], "sell": [], "U": i, "u": i}))
+        else:
+            recording.append(("lastTrade", {"price": "1000", "amount": "1", "tradeId": i}))
+    return recording
+
+
+async def run(controller, recording, subscribers, callback, inline, delivered):
+    for _ in range(subscribers):
+        controller.handle_subscribe(
+            {"streams": [socket_options.DEPTH, socket_options.TRADES]}, callback, inline
+        )
+    expected = delivered() + len(recording) * subscribers
+    started = time.perf_counter()
+    for event, args in recording:
+        await controller.callback_handler(event, args)
+    # queued subscriptions deliver asynchronously, wait until every event was handled
+    while delivered() < expected:
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    controller.close()
+    return len(recording) / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--subscribers", type=int, default=4)
+    parser.add_argument("--recording", help="event log to replay instead of the synthetic stream")
+    args = parser.parse_args()
+
+    if args.recording:
+        recording = [(event, payload) for _, event, payload in EventReplayer(args.recording)]
+    else:
+        recording = make_recording(args.events)
+    received = 0
+
+    def sync_callback(event, data):
+        nonlocal received
+        received += 1
+
+    async def async_callback(event, data):
+        nonlocal received
+        received += 1
+
+    runs = [
+        ("legacy", LegacySocketController, sync_callback, False),
+        ("executor", SocketController, sync_callback, False),
+        ("async", SocketController, async_callback, False),
+        ("inline", SocketController, sync_callback, True),
+    ]
+    print(f"{len(recording)} events, {args.subscribers} subscribers")
+    print(f"{'dispatch':<10}{'events/s':>12}")
+    for name, controller_class, callback, inline in runs:
+        rate = await run(
+            controller_class(), recording, args.subscribers, callback, inline, lambda: received
+        )
+        print(f"{name:<10}{rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+Measures order encoding throughput of `get_order_bytes` against the encoding it replaced,
+which normalized every address and ABI-encoded price and amount for each order.
+
+Usage:
+    python -m benchmarks.bench_encode --orders 20000
+"""
+import argparse
+import base64
+import random
+import struct
+import time
+
+import eth_abi
+
+from ultrade.utils.encode import determine_address_type, get_order_bytes, normalize_address
+
+
+def legacy_get_order_bytes(data: dict) -> bytes:
+    order = bytearray()
+    order.extend(data["version"].to_bytes(2, "big"))
+    order.extend(data["expiredTime"].to_bytes(4, "big"))
+    order.extend(data["orderSide"].encode())
+    order.extend(eth_abi.encode(["uint256"], [data["price"]]))
+    order.extend(eth_abi.encode(["uint256"], [data["amount"]]))
+    order.extend(data["orderType"].encode())
+    order.extend(normalize_address(data["address"], determine_address_type(data["chainId"], False)))
+    order.extend(data["chainId"].to_bytes(2, "big"))
+    order.extend(
+        normalize_address(
+            data["baseTokenAddress"],
+            determine_address_type(data["baseTokenChainId"], True, data["baseTokenAddress"]),
+        )
+    )
+    order.extend(data["baseTokenChainId"].to_bytes(4, "big"))
+    order.extend(
+        normalize_address(
+            data["priceTokenAddress"],
+            determine_address_type(data["priceTokenChainId"], True, data["priceTokenAddress"]),
+        )
+    )
+    order.extend(data["priceTokenChainId"].to_bytes(4, "big"))
+    order.extend(data["companyId"].to_bytes(2, "big"))
+    order.extend(struct.pack(">Q", random.randint(0, 9007199254740991)))
+    order.extend(struct.pack(">d", data["decimalPrice"]))
+    order.extend(b"\x00" * 50)
+    return bytes(bytearray(base64.b64encode(bytes(order))))
+
+
+def make_orders(count: int, login_chain_id: int):
+    address = (
+        "0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A"
+        if login_chain_id != 8
+        else "AYMTFVGJTEEXK6GZMKP2TLZEWY3R3OV2HNCFETMU5G7FTS3Q6DJM5KRPUU"
+    )
+    return [
+        {
+            "version": 1,
+            "pairId": 47,
+            "companyId": 1,
+            "address": address,
+            "chainId": login_chain_id,
+            "orderSide": "B" if i % 2 else "S",
+            "orderType": "L",
+            "price": 10 ** 18 + i,
+            "amount": 1_000_000 + i,
+            "decimalPrice": 1.0 + i / 1000,
+            "expiredTime": int(time.time()) + 3600,
+            "baseTokenAddress": "0",
+            "baseTokenChainId": 8,
+            "priceTokenAddress": "157824770",
+            "priceTokenChainId": 8,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(encode, orders) -> float:
+    started = time.perf_counter()
+    for data in orders:
+        encode(data)
+    return len(orders) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{args.orders} orders")
+    print(f"{'login':<12}{'legacy orders/s':>17}{'template orders/s':>19}{'speedup':>9}")
+    for name, chain_id in (("ethereum", 2), ("algorand", 8)):
+        orders = make_orders(args.orders, chain_id)
+        legacy = measure(legacy_get_order_bytes, orders)
+        fast = measure(get_order_bytes, orders)
+        print(f"{name:<12}{legacy:>17.0f}{fast:>19.0f}{fast / legacy:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares the JSON codec backends on typical API payloads.
+
+Usage:
+    python -m benchmarks.bench_json --iterations 2000
+"""
+import argparse
+import time
+
+from ultrade.utils.json_codec import CODECS
+
+
+def make_depth(levels: int) -> dict:
+    return {
+        "buy": [[str(10 ** 18 - i * 1000), str(1_000_000 + i)] for i in range(levels)],
+        "sell": [[str(10 ** 18 + i * 1000), str(1_000_000 + i)] for i in range(levels)],
+        "pair": "algo_usdc",
+        "ts": 1700000000000,
+        "U": 1000,
+        "u": 1001,
+    }
+
+
+def make_orders(count: int) -> list:
+    return [
+        {
+            "id": 1000 + i,
+            "pairId": 47,
+            "pair": "algo_usdc",
+            "status": 1,
+            "side": i % 2,
+            "type": 0,
+            "price": "1.05",
+            "amount": "100.0",
+            "filledAmount": "25.0",
+            "total": "105.0",
+            "createdAt": 1700000000000 + i,
+            "trades": [
+                {"tradeId": 5000 + i, "price": "1.05", "amount": "25.0", "createdAt": 1700000000000},
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def measure(func, payload, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(payload)
+    return (time.perf_counter() - started) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    payloads = {
+        "depth(100)": make_depth(100),
+        "orders(200)": make_orders(200),
+        "cancel": {"orderId": 123456789},
+    }
+    print(f"{'payload':<14}{'codec':<10}{'loads us':>10}{'dumps us':>10}{'canonical us':>14}")
+    for payload_name, payload in payloads.items():
+        for codec in CODECS.values():
+            encoded = codec.dumps(payload)
+            loads = measure(codec.loads, encoded, args.iterations)
+            dumps = measure(codec.dumps, payload, args.iterations)
+            canonical = measure(codec.canonical_dumps, payload, args.iterations)
+            print(
+                f"{payload_name:<14}{codec.name:<10}{loads * 1e6:>10.1f}{dumps * 1e6:>10.1f}"
+                f"{canonical * 1e6:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
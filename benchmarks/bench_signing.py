@@ -0,0 +1,123 @@
+"""
+Measures bulk order signing throughput and event loop responsiveness.
+For Ethereum keys, the signatures/s of every signing backend are reported first.
+
+Usage:
+    python -m benchmarks.bench_signing --orders 2000 --key-type ethereum
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from algosdk import account, mnemonic
+
+from ultrade import Signer
+from ultrade.signers.ethereum import SIGNING_BACKENDS, EthereumSigner
+from ultrade.types import CreateOrder
+from ultrade.utils.encode import get_order_bytes
+from ultrade.utils.signing import create_signing_executor, sign_orders
+
+
+def make_signer(key_type: str) -> Signer:
+    if key_type == "algorand":
+        private_key, _ = account.generate_account()
+        return Signer.create_signer(mnemonic.from_private_key(private_key))
+    return Signer.create_signer(os.urandom(32).hex())
+
+
+def make_orders(signer: Signer, count: int):
+    return [
+        CreateOrder(
+            1,
+            pair_id=47,
+            company_id=1,
+            login_address=signer.address,
+            login_chain_id=signer.wormhole_chain_id,
+            order_side="B" if i % 2 else "S",
+            order_type="L",
+            amount=1_000_000 + i,
+            price=10 ** 18 + i,
+            decimal_price=1.0,
+            base_token_address="0",
+            base_token_chain_id=8,
+            price_token_address="157824770",
+            price_token_chain_id=8,
+            expiration_date_in_seconds=int(time.time()) + 3600,
+        ).data
+        for i in range(count)
+    ]
+
+
+def compare_backends(orders):
+    private_key = os.urandom(32).hex()
+    messages = [get_order_bytes(order) for order in orders]
+    print(f"{'backend':<14}{'signatures/s':>14}")
+    for name in SIGNING_BACKENDS:
+        signer = EthereumSigner(private_key, signing_backend=name)
+        started = time.perf_counter()
+        for message in messages:
+            signer.sign_data(message)
+        print(f"{name:<14}{len(messages) / (time.perf_counter() - started):>14.0f}")
+    print()
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.001) -> float:
+    max_lag = 0.0
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, loop.time() - started - interval)
+    return max_lag
+
+
+async def run_pool(signer, orders, kind, workers):
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+
+    if kind == "inline":
+        sign_orders(signer, orders)
+    else:
+        executor = create_signing_executor(kind, workers)
+        chunk_size = -(-len(orders) // workers)
+        await asyncio.gather(
+            *[
+                loop.run_in_executor(executor, sign_orders, signer, orders[i: i + chunk_size])
+                for i in range(0, len(orders), chunk_size)
+            ]
+        )
+        executor.shutdown()
+
+    elapsed = time.perf_counter() - started
+    stop.set()
+    max_lag = await lag_task
+    return elapsed, max_lag
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--key-type", choices=["algorand", "ethereum"], default="ethereum")
+    args = parser.parse_args()
+
+    signer = make_signer(args.key_type)
+    orders = make_orders(signer, args.orders)
+    cpus = os.cpu_count() or 1
+
+    if args.key_type == "ethereum":
+        compare_backends(orders)
+    print(f"{args.orders} orders, {args.key_type} signer, {cpus} CPUs")
+    print(f"{'pool':<10}{'workers':>8}{'orders/s':>12}{'orders/s/core':>15}{'max loop lag ms':>17}")
+    runs = [("inline", 1)] + [(kind, cpus) for kind in ("thread", "process")]
+    for kind, workers in runs:
+        elapsed, max_lag = await run_pool(signer, orders, kind, workers)
+        rate = args.orders / elapsed
+        print(f"{kind:<10}{workers:>8}{rate:>12.0f}{rate / workers:>15.0f}{max_lag * 1000:>17.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
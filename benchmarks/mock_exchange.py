@@ -0,0 +1,251 @@
+"""
+Local stand-in for the Ultrade REST API and websocket, used by the offline benchmarks.
+
+It answers the endpoints called by `Client` with small fixed payloads and keeps the open
+orders in memory, so creating and cancelling orders behaves like the real API. On a
+websocket subscription with `{"events": n}` in its options, it sends a burst of n events
+of the subscribed streams, cycling through `EVENT_LIST` without the error event.
+
+Usage:
+    python -m benchmarks.mock_exchange --port 8080
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+import socketio
+from aiohttp import web
+
+from ultrade.constants import EVENT_LIST
+
+PAIR = {
+    "id": 47,
+    "pairId": 47,
+    "pair_key": "algo_usdc",
+    "is_active": True,
+    "is_verified": 0,
+    "base_chain_id": 8,
+    "base_currency": "algo",
+    "base_decimal": 6,
+    "base_id": "0",
+    "price_chain_id": 8,
+    "price_currency": "usdc",
+    "price_decimal": 6,
+    "price_id": "157824770",
+    "pair_name": "ALGO_USDC",
+    "min_price_increment": "100",
+    "min_order_size": "1000000",
+    "min_size_increment": "1000000",
+    "created_at": "2023-04-27T14:11:24.199Z",
+    "updated_at": "2023-05-04T16:46:05.000Z",
+}
+
+DEPTH_LEVELS = 100
+# distinct messages of a websocket burst, encoded once and cycled
+BURST_CYCLE = 1000
+
+
+def make_depth(symbol: str, levels: int, update_id: int) -> dict:
+    return {
+        "pair": symbol,
+        "buy": [[str(1_000_000 - i * 100), str(1_000_000 + i)] for i in range(levels)],
+        "sell": [[str(1_000_100 + i * 100), str(1_000_000 + i)] for i in range(levels)],
+        "ts": int(time.time() * 1000),
+        "U": update_id,
+        "u": update_id,
+    }
+
+
+def make_event(event: str, symbol: str, sequence: int):
+    if event == "depth":
+        return {
+            "pair": symbol,
+            "buy": [[str(1_000_000 - sequence % 10 * 100), str(sequence)]],
+            "sell": [],
+            "U": sequence,
+            "u": sequence,
+        }
+    if event == "maintenance":
+        return 0
+    return {"pair": symbol, "price": str(1_000_000 + sequence), "amount": "1000000", "id": sequence}
+
+
+class MockExchange:
+    """
+    aiohttp application serving the REST endpoints and the socket.io server of the exchange.
+    """
+
+    def __init__(self):
+        self.app = web.Application()
+        self.server = socketio.AsyncServer(async_mode="aiohttp")
+        self.server.attach(self.app)
+        self.server.on("subscribe", self.on_subscribe)
+        self.orders = {}
+        self._order_ids = itertools.count(1)
+        self.requests = 0
+        routes = [
+            ("GET", "/system/time", self.system_time),
+            ("PUT", "/wallet/signin", self.signin),
+            ("GET", "/wallet/transactions", self.empty_list),
+            ("GET", "/market/markets", self.markets),
+            ("GET", "/market/market", self.market),
+            ("GET", "/market/price", self.price),
+            ("GET", "/market/depth", self.depth),
+            ("GET", "/market/symbols", self.symbols),
+            ("GET", "/market/last-trades", self.empty_list),
+            ("GET", "/market/settings", self.settings),
+            ("GET", "/market/chains", self.empty_list),
+            ("GET", "/market/codex-app-id", self.codex_app_id),
+            ("GET", "/market/cctp-assets", self.empty_dict),
+            ("GET", "/market/cctp-unified-assets", self.empty_dict),
+            ("GET", "/market/assets", self.empty_list),
+            ("GET", "/market/balances", self.empty_list),
+            ("GET", "/market/orders-with-trades", self.open_orders),
+            ("GET", "/market/order/{order_id}", self.get_order),
+            ("POST", "/market/order", self.create_order),
+            ("DELETE", "/market/order", self.cancel_order),
+            ("GET", "/market/orders", self.open_orders),
+            ("POST", "/market/orders", self.create_orders),
+            ("DELETE", "/market/orders", self.cancel_orders),
+        ]
+        for method, path, handler in routes:
+            self.app.router.add_route(method, path, self.counted(handler))
+
+    def counted(self, handler):
+        async def wrapper(request):
+            self.requests += 1
+            return await handler(request)
+
+        return wrapper
+
+    async def system_time(self, request):
+        return web.json_response({"currentTime": int(time.time() * 1000)})
+
+    async def signin(self, request):
+        body = await request.json()
+        return web.Response(text=f"token-{body['data']['address']}")
+
+    async def empty_list(self, request):
+        return web.json_response([])
+
+    async def empty_dict(self, request):
+        return web.json_response({})
+
+    async def markets(self, request):
+        return web.json_response([PAIR])
+
+    async def market(self, request):
+        return web.json_response(PAIR)
+
+    async def price(self, request):
+        symbol = request.query.get("symbol", PAIR["pair_key"])
+        return web.json_response(
+            {"pairId": PAIR["id"], "pair": symbol, "askPrice": "1000100", "bidPrice": "1000000", "lastPrice": "1000000"}
+        )
+
+    async def depth(self, request):
+        symbol = request.query.get("symbol", PAIR["pair_key"])
+        levels = min(int(request.query.get("depth", DEPTH_LEVELS)), DEPTH_LEVELS)
+        return web.json_response(make_depth(symbol, levels, next(self._order_ids)))
+
+    async def symbols(self, request):
+        return web.json_response([{"pairKey": PAIR["pair_key"]}])
+
+    async def settings(self, request):
+        return web.json_response({"company.enabled": "1", "companyId": 1})
+
+    async def codex_app_id(self, request):
+        return web.Response(text="157824770")
+
+    def place(self, data: dict) -> dict:
+        order_id = next(self._order_ids)
+        order = {"id": order_id, "status": 1, "pairId": data["pairId"], "orderSide": data["orderSide"]}
+        self.orders[order_id] = order
+        return order
+
+    async def create_order(self, request):
+        body = await request.json()
+        return web.json_response(self.place(body["data"]))
+
+    async def create_orders(self, request):
+        body = await request.json()
+        return web.json_response([self.place(order["data"]) for order in body["arrayData"]])
+
+    async def cancel_order(self, request):
+        body = await request.json()
+        if self.orders.pop(body["data"]["orderId"], None) is None:
+            return web.json_response(
+                {"statusCode": 404, "message": "Order not found", "error": "Not Found"}, status=404
+            )
+        return web.Response()
+
+    async def cancel_orders(self, request):
+        body = await request.json()
+        return web.json_response(
+            [
+                {"orderId": order_id, "isCancelled": self.orders.pop(order_id, None) is not None}
+                for order_id in body["data"]["orderIds"]
+            ]
+        )
+
+    async def open_orders(self, request):
+        return web.json_response(list(self.orders.values()))
+
+    async def get_order(self, request):
+        order = self.orders.get(int(request.match_info["order_id"]))
+        if order is None:
+            return web.json_response({"statusCode": 404, "message": "Order not found"}, status=404)
+        return web.json_response(order)
+
+    async def on_subscribe(self, sid, data):
+        count = int((data.get("options") or {}).get("events", 0))
+        streams = set(data.get("streams") or [])
+        events = [event for event, stream in EVENT_LIST if stream in streams and event != "error"]
+        if not count or not events:
+            return
+        # socket.io event packets, sent straight over engine.io to keep the server cheap
+        packets = [
+            "2" + json.dumps([event, make_event(event, data["symbol"], sequence)], separators=(",", ":"))
+            for sequence, event in zip(range(1, BURST_CYCLE + 1), itertools.cycle(events))
+        ]
+        eio_sid = self.server.manager.eio_sid_from_sid(sid, "/")
+        for sent, packet in zip(range(count), itertools.cycle(packets)):
+            await self.server.eio.send(eio_sid, packet)
+            if sent % 256 == 255:
+                await asyncio.sleep(0)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def run(port: int, ready=None):
+    """
+    Serves the mock exchange until the process is stopped, `ready` is set once it listens.
+    """
+
+    async def serve():
+        exchange = MockExchange()
+        url = await exchange.start(port=port)
+        print(f"Mock exchange listening on {url}")
+        if ready is not None:
+            ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    run(args.port)
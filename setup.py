@@ -20,6 +20,7 @@ setuptools.setup(
     install_requires=required_packages,
     extras_require={
         "dev": ["pytest>=7.0", "twine>=4.0.2"],
+        "fast": ["msgspec>=0.18", "coincurve>=18"],
     },
     python_requires='>=3.10'
 )
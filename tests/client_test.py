@@ -3,7 +3,10 @@ import asyncio
 
 from ultrade import Client, Signer
 from ultrade.types import ClientOptions
-from .test_credentials import (
+import pytest
+
+pytest.importorskip("tests.test_credentials", reason="tests/test_credentials.py with the test credentials is missing")
+from .test_credentials import (  # noqa: E402
     TEST_MNEMONIC_KEY,
     TEST_MAINNET_ALGOD_ADDRESS,
     TEST_ALGOD_TOKEN,
@@ -23,12 +26,18 @@ class TestClient(unittest.TestCase):
 
     def test_configure_with_invalid_network(self):
         options: ClientOptions = {"algo_sdk_client": self.algod_client}
+        client = Client(network="testnet", **options)
         with self.assertRaises(ValueError) as context:
-            Client(network="testnet", **options)
+            self._run_async(client.verify_network())
 
         expected_error_message = "Network of the AlgodClient should be the same as the network specified in the options"
         self.assertEqual(str(context.exception), expected_error_message)
 
+    def test_skip_network_verification(self):
+        options: ClientOptions = {"algo_sdk_client": self.algod_client, "verify_network": False}
+        client = Client(network="testnet", **options)
+        self._run_async(client.verify_network())
+
     def test_login_eth(self):
         options = ClientOptions()
         options["api_url"] = "https://api.dev.ultradedev.net"
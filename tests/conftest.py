@@ -1,20 +1,26 @@
 from ultrade import Client, Signer
-from .test_credentials import (
-    TEST_API_URL,
-    TEST_SOCKET_URL,
-    TEST_ETH_PRIVATE_KEY,
-    TRADING_KEY,
-    TRADING_KEY_MNEMONIC,
-    TRADING_KEY_ADDRESS,
-)
+import pytest
 import pytest_asyncio
 
+# the live tests read their credentials from the local, gitignored tests/test_credentials.py
+try:
+    from . import test_credentials as credentials
+except ImportError:
+    credentials = None
+
+
+def require_credentials():
+    if credentials is None:
+        pytest.skip("tests/test_credentials.py with the live test credentials is missing")
+    return credentials
+
 
 @pytest_asyncio.fixture
 async def client():
-    login_user = Signer.create_signer(TEST_ETH_PRIVATE_KEY)
+    credentials = require_credentials()
+    login_user = Signer.create_signer(credentials.TEST_ETH_PRIVATE_KEY)
     client_instance = Client(
-        network="testnet", api_url=TEST_API_URL, websocket_url=TEST_SOCKET_URL
+        network="testnet", api_url=credentials.TEST_API_URL, websocket_url=credentials.TEST_SOCKET_URL
     )
     await client_instance.set_login_user(login_user)
     return client_instance
@@ -22,12 +28,13 @@ async def client():
 
 @pytest_asyncio.fixture
 async def trading_client():
+    credentials = require_credentials()
     client_instance = Client(
-        network="testnet", api_url=TEST_API_URL, websocket_url=TEST_SOCKET_URL
+        network="testnet", api_url=credentials.TEST_API_URL, websocket_url=credentials.TEST_SOCKET_URL
     )
     client_instance.set_trading_key(
-        trading_key=TRADING_KEY,
-        address=TRADING_KEY_ADDRESS,
-        trading_key_mnemonic=TRADING_KEY_MNEMONIC,
+        trading_key=credentials.TRADING_KEY,
+        address=credentials.TRADING_KEY_ADDRESS,
+        trading_key_mnemonic=credentials.TRADING_KEY_MNEMONIC,
     )
     return client_instance
@@ -2,7 +2,8 @@ import asyncio
 from ultrade.sdk_client import Client, Signer
 from ultrade.types import OrderStatus
 import pytest
-from .test_credentials import (
+pytest.importorskip("tests.test_credentials", reason="tests/test_credentials.py with the test credentials is missing")
+from .test_credentials import (  # noqa: E402
     TEST_API_URL,
     TEST_ETH_PRIVATE_KEY,
     TEST_MNEMONIC_KEY,
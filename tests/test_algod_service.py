@@ -0,0 +1,94 @@
+import base64
+
+from algosdk import account, mnemonic
+from algosdk.transaction import SuggestedParams
+
+from ultrade.utils import algod_service
+from ultrade.utils.algod_service import AlgodService
+
+
+class FakeAlgod:
+    def __init__(self, first_round=1000, validity=1000):
+        self.first_round = first_round
+        self.validity = validity
+        self.calls = {"suggested_params": 0, "application_info": 0}
+
+    def suggested_params(self):
+        self.calls["suggested_params"] += 1
+        return SuggestedParams(
+            fee=0,
+            first=self.first_round,
+            last=self.first_round + self.validity,
+            gh=base64.b64encode(b"\x01" * 32).decode(),
+            gen="testnet-v1.0",
+            flat_fee=False,
+            min_fee=1000,
+        )
+
+    def application_info(self, app_id):
+        self.calls["application_info"] += 1
+        key = base64.b64encode(b"UL_SUPERADMIN_APP").decode()
+        return {"params": {"global-state": [{"key": key, "value": {"type": 2, "uint": 77}}]}}
+
+
+def make_service(client):
+    private_key, _ = account.generate_account()
+    return AlgodService(client, mnemonic.from_private_key(private_key))
+
+
+class TestAlgodServiceCache:
+    def test_group_building_reuses_params_and_app_state(self):
+        client = FakeAlgod()
+        service = make_service(client)
+        sender = service.get_account_address()
+
+        for _ in range(3):
+            app_call = service.make_app_call_txn(5, [b"arg"], 12, fee=3000)
+            transfer = service.make_transfer_txn(5, 12, sender, 100)
+            payment = service.make_payment_txn(12, sender, 100)
+
+        assert client.calls == {"suggested_params": 1, "application_info": 1}
+        assert (service.stats["algod_calls"], service.stats["algod_calls_saved"]) == (2, 10)
+        assert app_call.foreign_apps == [77]
+        # the fee set on the app call does not leak into the cached params
+        assert app_call.fee == 3000
+        assert transfer.fee == payment.fee == 1000
+
+    def test_identical_transfers_get_distinct_ids(self):
+        service = make_service(FakeAlgod())
+        sender = service.get_account_address()
+
+        transfers = [service.make_transfer_txn(5, 12, sender, 100) for _ in range(2)]
+
+        assert transfers[0].first_valid_round == transfers[1].first_valid_round
+        assert transfers[0].get_txid() != transfers[1].get_txid()
+
+    def test_params_are_refreshed_before_last_valid_round(self, monkeypatch):
+        client = FakeAlgod()
+        service = make_service(client)
+        now = [0.0]
+        monkeypatch.setattr(algod_service.time, "monotonic", lambda: now[0])
+
+        service.get_transaction_params()
+        now[0] = (1000 - service.params_margin - 1) * algod_service.ALGORAND_MIN_ROUND_TIME
+        service.get_transaction_params()
+        assert client.calls["suggested_params"] == 1
+
+        now[0] += algod_service.ALGORAND_MIN_ROUND_TIME
+        client.first_round = 1900
+        params = service.get_transaction_params()
+        assert client.calls["suggested_params"] == 2
+        assert params.first == 1900
+
+    def test_invalidation(self):
+        client = FakeAlgod()
+        service = make_service(client)
+
+        service.get_super_app_id(12)
+        service.get_transaction_params()
+        service.invalidate_app_state(12)
+        service.invalidate_transaction_params()
+        service.get_super_app_id(12)
+        service.get_transaction_params()
+
+        assert client.calls == {"suggested_params": 2, "application_info": 2}
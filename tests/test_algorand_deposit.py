@@ -0,0 +1,111 @@
+import pytest
+from algosdk import account, mnemonic, transaction
+from algosdk.logic import get_application_address
+from eth_utils import keccak
+
+from ultrade.signers.algorand import AlgorandSigner, MAX_GROUP_DEPOSITS
+from ultrade.utils.encode import normalize_address, determine_address_type
+
+CODEX_APP_ID = 1000
+
+
+class RecordingAlgodService:
+    def __init__(self):
+        self.params_calls = 0
+        self.groups = []
+        self.waits = []
+
+    async def get_transaction_params_async(self):
+        self.params_calls += 1
+        return transaction.SuggestedParams(0, 100, 1100, "A" * 43 + "=", "testnet-v1.0", False, None, 1000)
+
+    async def send_transaction_grp_async(self, signed_group):
+        self.groups.append(signed_group)
+        return signed_group[0].get_txid()
+
+    async def wait_for_confirmation_async(self, tx_id, wait_rounds=0):
+        self.waits.append(tx_id)
+        return {"confirmed-round": 102}
+
+
+def make_signer():
+    private_key, _ = account.generate_account()
+    return AlgorandSigner(mnemonic.from_private_key(private_key))
+
+
+@pytest.fixture
+def deposit_config():
+    return {
+        "algod_service": RecordingAlgodService(),
+        "login_user": make_signer(),
+        "codex_app_id": CODEX_APP_ID,
+    }
+
+
+@pytest.mark.asyncio
+class TestAlgorandDepositGroup:
+    async def test_group_of_eight_deposits(self, deposit_config):
+        signer = make_signer()
+        service = deposit_config["algod_service"]
+        deposits = [(0, 1_000_000)] + [(str(157824770 + i), 10 + i) for i in range(7)]
+
+        tx_id = await signer._deposit_group(deposits, deposit_config)
+
+        assert (service.params_calls, len(service.groups), service.waits) == (1, 1, [tx_id])
+        signed = service.groups[0]
+        txns = [stxn.transaction for stxn in signed]
+        assert len(txns) == 16
+        assert len({txn.group for txn in txns}) == 1
+        assert all(stxn.signature for stxn in signed)
+
+        login_user = deposit_config["login_user"]
+        box_prefix = normalize_address(
+            login_user.address, determine_address_type(login_user.wormhole_chain_id, False)
+        ) + login_user.wormhole_chain_id.to_bytes(8, "big")
+        codex_address = get_application_address(CODEX_APP_ID)
+        for (asset_id, amount), transfer, app_call in zip(deposits, txns[::2], txns[1::2]):
+            asset_id = int(asset_id)
+            if asset_id == 0:
+                assert isinstance(transfer, transaction.PaymentTxn)
+                assert transfer.amt == amount
+            else:
+                assert isinstance(transfer, transaction.AssetTransferTxn)
+                assert (transfer.index, transfer.amount) == (asset_id, amount)
+            assert transfer.receiver == codex_address
+            box_name = box_prefix + asset_id.to_bytes(32, "big") + signer.wormhole_chain_id.to_bytes(8, "big")
+            assert [(box.app_index, box.name) for box in app_call.boxes] == [(0, keccak(box_name))]
+            assert app_call.index == CODEX_APP_ID
+
+    async def test_single_deposit_uses_the_same_group_builder(self, deposit_config):
+        signer = make_signer()
+        service = deposit_config["algod_service"]
+
+        tx_id = await signer._deposit(500, "157824770", deposit_config)
+
+        assert [len(group) for group in service.groups] == [2]
+        assert service.waits == [tx_id]
+
+    async def test_identical_deposits_get_distinct_ids(self, deposit_config):
+        signer = make_signer()
+        service = deposit_config["algod_service"]
+
+        # both deposits are built from the same cached params
+        first = await signer._deposit(500, "157824770", deposit_config)
+        second = await signer._deposit(500, "157824770", deposit_config)
+
+        assert first != second
+        first_ids, second_ids = ({stxn.get_txid() for stxn in group} for group in service.groups)
+        assert not first_ids & second_ids
+
+    async def test_invalid_groups(self, deposit_config):
+        signer = make_signer()
+
+        with pytest.raises(ValueError):
+            await signer._deposit_group([], deposit_config)
+        with pytest.raises(ValueError):
+            await signer._deposit_group([(0, 1)] * (MAX_GROUP_DEPOSITS + 1), deposit_config)
+        with pytest.raises(Exception, match="valid Algorand asset id"):
+            await signer._deposit_group([("0xabc", 1)], deposit_config)
+        with pytest.raises(ValueError, match="once per group"):
+            await signer._deposit_group([(0, 5), ("157824770", 1), ("0", 5)], deposit_config)
+        assert deposit_config["algod_service"].groups == []
@@ -0,0 +1,175 @@
+import asyncio
+import base64
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from algosdk import account, encoding, error, transaction
+from algosdk.v2client.algod import AlgodClient
+
+from ultrade import Client
+from ultrade.utils.algod_service import AlgodService
+from ultrade.utils.async_algod import AsyncAlgodClient
+from ultrade.utils.confirmations import ConfirmationTracker
+
+ROUND_TIME = 0.02
+
+
+class FakeAlgod:
+    """
+    Serves the algod endpoints used by the SDK, transactions are confirmed two rounds after they are sent.
+    """
+
+    def __init__(self):
+        self.round = 100
+        self.sent = {}
+        self.bodies = []
+        self.tokens = set()
+        self.app = web.Application(middlewares=[self.record_token])
+        self.app.router.add_get("/genesis", self.genesis)
+        self.app.router.add_get("/v2/status", self.status)
+        self.app.router.add_get("/v2/status/wait-for-block-after/{round}", self.wait_for_block)
+        self.app.router.add_get("/v2/transactions/params", self.params)
+        self.app.router.add_post("/v2/transactions", self.send)
+        self.app.router.add_get("/v2/transactions/pending/{txid}", self.pending)
+
+    @web.middleware
+    async def record_token(self, request, handler):
+        self.tokens.add(request.headers.get("X-Algo-API-Token"))
+        return await handler(request)
+
+    async def genesis(self, request):
+        return web.json_response({"id": "v1.0", "network": "testnet"})
+
+    async def status(self, request):
+        return web.json_response({"last-round": self.round})
+
+    async def wait_for_block(self, request):
+        await asyncio.sleep(ROUND_TIME)
+        self.round = max(self.round, int(request.match_info["round"]) + 1)
+        return web.json_response({"last-round": self.round})
+
+    async def params(self, request):
+        return web.json_response(
+            {
+                "fee": 0,
+                "last-round": self.round,
+                "genesis-hash": base64.b64encode(b"\x01" * 32).decode(),
+                "genesis-id": "testnet-v1.0",
+                "consensus-version": "future",
+                "min-fee": 1000,
+            }
+        )
+
+    async def send(self, request):
+        self.bodies.append(await request.read())
+        txid = f"TX{len(self.bodies)}"
+        self.sent[txid] = self.round
+        return web.json_response({"txId": txid})
+
+    async def pending(self, request):
+        txid = request.match_info["txid"]
+        if txid == "REJECTED":
+            return web.json_response({"pool-error": "overspend", "confirmed-round": 0})
+        if txid not in self.sent:
+            return web.json_response({"message": "txn does not exist"}, status=404)
+        confirmed = self.sent[txid] + 2
+        return web.json_response(
+            {"pool-error": "", "confirmed-round": confirmed if self.round >= confirmed else 0}
+        )
+
+
+@pytest_asyncio.fixture
+async def algod(unused_tcp_port):
+    node = FakeAlgod()
+    runner = web.AppRunner(node.app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", unused_tcp_port).start()
+    client = AsyncAlgodClient(f"http://127.0.0.1:{unused_tcp_port}", "secret")
+    yield node, client
+    await client.close()
+    await runner.cleanup()
+
+
+def make_payment(params):
+    private_key, address = account.generate_account()
+    return transaction.PaymentTxn(address, params, address, 1000).sign(private_key)
+
+
+@pytest.mark.asyncio
+class TestAsyncAlgodClient:
+    async def test_params_send_and_confirm(self, algod):
+        node, client = algod
+
+        params = await client.suggested_params()
+        assert (params.first, params.last, params.min_fee, params.gen) == (100, 1100, 1000, "testnet-v1.0")
+
+        signed = [make_payment(params), make_payment(params)]
+        txid = await client.send_transactions(signed)
+        expected_body = b"".join(base64.b64decode(encoding.msgpack_encode(txn)) for txn in signed)
+        assert node.bodies == [expected_body]
+
+        info = await ConfirmationTracker(client).wait(txid, 4)
+        assert info["confirmed-round"] == 102
+        assert node.tokens == {"secret"}
+
+    async def test_errors(self, algod):
+        _, client = algod
+        tracker = ConfirmationTracker(client)
+
+        with pytest.raises(error.TransactionRejectedError):
+            await tracker.wait("REJECTED", 4)
+        with pytest.raises(error.ConfirmationTimeoutError):
+            await tracker.wait("UNKNOWN", 2)
+        with pytest.raises(error.AlgodHTTPError) as raised:
+            await client.pending_transaction_info("UNKNOWN")
+        assert raised.value.code == 404
+
+    async def test_concurrent_waits_keep_the_loop_responsive(self, algod):
+        node, client = algod
+        service = AlgodService(None, async_client=client)
+        params = await service.get_transaction_params_async()
+        txids = [await service.send_transaction_grp_async([make_payment(params)]) for _ in range(10)]
+
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(ROUND_TIME / 4)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        started = asyncio.get_running_loop().time()
+        results = await asyncio.gather(*[service.wait_for_transaction_async(txid) for txid in txids])
+        elapsed = asyncio.get_running_loop().time() - started
+        ticker.cancel()
+
+        assert all(result["confirmed-round"] > 0 for result in results)
+        # the waits run side by side instead of one after the other
+        assert elapsed < 10 * 2 * ROUND_TIME
+        assert ticks > 2
+
+    async def test_service_falls_back_to_sync_client_in_executor(self, algod):
+        node, client = algod
+        service = AlgodService(AlgodClient("secret", client.algod_address))
+
+        params = await service.get_transaction_params_async()
+        txid = await service.send_transaction_grp_async([make_payment(params)])
+        info = await service.wait_for_confirmation_async(txid, 4)
+
+        assert info["confirmed-round"] == params.first + 2
+        assert service.stats["algod_calls"] == 1
+
+    async def test_network_is_verified_without_the_executor(self, algod):
+        _, client = algod
+        algod_client = AlgodClient("secret", client.algod_address)
+
+        def blocking_genesis():
+            raise AssertionError("the blocking client should not be called")
+
+        algod_client.genesis = blocking_genesis
+        sdk_client = Client(network="testnet", algo_sdk_client=algod_client)
+
+        await sdk_client.verify_network()
+        await sdk_client.close()
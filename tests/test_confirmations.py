@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from algosdk import error
+
+from ultrade.utils.confirmations import ConfirmationTracker
+
+
+class FakeNode:
+    def __init__(self, confirmed_at=None, rejected=(), unknown=()):
+        self.round = 10
+        self.confirmed_at = confirmed_at or {}
+        self.rejected = set(rejected)
+        self.unknown = set(unknown)
+        self.calls = {"status": 0, "status_after_block": 0, "pending_transaction_info": 0}
+        self.waiting = asyncio.Event()
+
+    async def status(self):
+        self.calls["status"] += 1
+        return {"last-round": self.round}
+
+    async def status_after_block(self, block_num):
+        self.calls["status_after_block"] += 1
+        self.waiting.set()
+        await asyncio.sleep(0.001)
+        self.round = max(self.round, block_num + 1)
+        return {"last-round": self.round}
+
+    async def pending_transaction_info(self, txid):
+        self.calls["pending_transaction_info"] += 1
+        if txid in self.unknown:
+            raise error.AlgodHTTPError("txn does not exist", 404)
+        if txid in self.rejected:
+            return {"pool-error": "overspend", "confirmed-round": 0}
+        confirmed = self.confirmed_at.get(txid, 0)
+        return {"pool-error": "", "confirmed-round": confirmed if self.round >= confirmed else 0}
+
+
+@pytest.mark.asyncio
+class TestConfirmationTracker:
+    async def test_one_round_loop_for_many_transactions(self):
+        confirmed_at = {f"TX{i}": 11 + i % 5 for i in range(20)}
+        node = FakeNode(confirmed_at)
+        tracker = ConfirmationTracker(node)
+
+        results = await asyncio.gather(*[tracker.wait(txid, 10) for txid in confirmed_at])
+
+        assert [result["confirmed-round"] for result in results] == list(confirmed_at.values())
+        # the rounds are waited for once for all transactions
+        assert node.calls["status"] == 1
+        assert node.calls["status_after_block"] == 4
+        assert tracker.stats["confirmed"] == 20
+        assert tracker.stats["in_flight"] == 0
+
+    async def test_rejected_expired_and_unknown(self):
+        node = FakeNode({"OK": 12}, rejected={"BAD"}, unknown={"LOST"})
+        tracker = ConfirmationTracker(node)
+
+        ok, bad, lost = await asyncio.gather(
+            tracker.wait("OK", 4), tracker.wait("BAD", 4), tracker.wait("LOST", 4), return_exceptions=True
+        )
+
+        assert ok["confirmed-round"] == 12
+        assert isinstance(bad, error.TransactionRejectedError)
+        assert isinstance(lost, error.ConfirmationTimeoutError)
+        # rounds 11 to 14 are checked before the timeout, like algosdk wait_for_confirmation
+        assert node.round == 15
+        assert tracker.stats == {
+            "in_flight": 0,
+            "tracked": 3,
+            "confirmed": 1,
+            "rejected": 1,
+            "expired": 1,
+            "rounds": 4,
+            "checks": 7,
+        }
+
+    async def test_transactions_joining_a_running_loop(self):
+        node = FakeNode({"A": 13, "B": 16})
+        tracker = ConfirmationTracker(node)
+
+        first = asyncio.ensure_future(tracker.wait("A"))
+        await node.waiting.wait()
+        second = tracker.track("B")
+
+        assert tracker.track("B") is second
+        assert (await first)["confirmed-round"] == 13
+        assert (await second)["confirmed-round"] == 16
+        assert node.calls["status"] == 1
+
+    async def test_node_errors_fail_the_waiters(self):
+        node = FakeNode()
+
+        async def broken(block_num):
+            raise error.AlgodHTTPError("node is down", 503)
+
+        node.status_after_block = broken
+        tracker = ConfirmationTracker(node)
+
+        with pytest.raises(error.AlgodHTTPError):
+            await tracker.wait("TX", 4)
+        assert tracker.stats["in_flight"] == 0
@@ -0,0 +1,112 @@
+import base64
+import struct
+
+import eth_abi
+import pytest
+
+from ultrade.utils import encode
+from ultrade.utils.encode import (
+    determine_address_type,
+    get_order_bytes,
+    get_order_template,
+    normalize_address,
+)
+
+EVM_ADDRESS = "0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A"
+ALGORAND_ADDRESS = "AYMTFVGJTEEXK6GZMKP2TLZEWY3R3OV2HNCFETMU5G7FTS3Q6DJM5KRPUU"
+CCTP_ASSET = "0x4343545055534443000000000000000000000000000000000000000000000000"
+
+
+def reference_order_bytes(data: dict, nonce: int) -> bytes:
+    # the encoding before order templates, kept to check the output does not change
+    order = bytearray()
+    order.extend(data["version"].to_bytes(2, "big"))
+    order.extend(data["expiredTime"].to_bytes(4, "big"))
+    order.extend(data["orderSide"].encode())
+    order.extend(eth_abi.encode(["uint256"], [data["price"]]))
+    order.extend(eth_abi.encode(["uint256"], [data["amount"]]))
+    order.extend(data["orderType"].encode())
+    order.extend(normalize_address(data["address"], determine_address_type(data["chainId"], False)))
+    order.extend(data["chainId"].to_bytes(2, "big"))
+    order.extend(
+        normalize_address(
+            data["baseTokenAddress"],
+            determine_address_type(data["baseTokenChainId"], True, data["baseTokenAddress"]),
+        )
+    )
+    order.extend(data["baseTokenChainId"].to_bytes(4, "big"))
+    order.extend(
+        normalize_address(
+            data["priceTokenAddress"],
+            determine_address_type(data["priceTokenChainId"], True, data["priceTokenAddress"]),
+        )
+    )
+    order.extend(data["priceTokenChainId"].to_bytes(4, "big"))
+    order.extend(data["companyId"].to_bytes(2, "big"))
+    order.extend(struct.pack(">Q", nonce))
+    order.extend(struct.pack(">d", data["decimalPrice"]))
+    order.extend(b"\x00" * 50)
+    return base64.b64encode(bytes(order))
+
+
+def make_order(**fields) -> dict:
+    order = {
+        "version": 1,
+        "pairId": 47,
+        "companyId": 1,
+        "address": EVM_ADDRESS,
+        "chainId": 2,
+        "orderSide": "B",
+        "orderType": "L",
+        "price": 10 ** 18,
+        "amount": 1_000_000,
+        "decimalPrice": 1.0,
+        "expiredTime": 1_700_000_000,
+        "baseTokenAddress": "0",
+        "baseTokenChainId": 8,
+        "priceTokenAddress": "157824770",
+        "priceTokenChainId": 8,
+    }
+    order.update(fields)
+    return order
+
+
+ORDERS = [
+    make_order(),
+    make_order(orderSide="S", orderType="M", price=0, amount=(1 << 256) - 1, decimalPrice=0.1),
+    make_order(address=ALGORAND_ADDRESS, chainId=8, companyId=65535, decimalPrice=123456.789),
+    make_order(baseTokenAddress=EVM_ADDRESS, baseTokenChainId=5, priceTokenAddress=CCTP_ASSET, priceTokenChainId=2),
+    make_order(priceTokenAddress="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", priceTokenChainId=1),
+]
+
+
+@pytest.mark.parametrize("data", ORDERS)
+def test_order_bytes_match_reference(data, monkeypatch):
+    nonce = 2 ** 53 - 1
+    monkeypatch.setattr(encode.random, "getrandbits", lambda bits: nonce)
+
+    assert get_order_bytes(data) == reference_order_bytes(data, nonce)
+    # a second order of the same pair goes through the cached template
+    assert get_order_bytes(data) == reference_order_bytes(data, nonce)
+
+
+def test_template_is_shared_per_pair():
+    data = ORDERS[0]
+    get_order_bytes(data)
+    hits = get_order_template.cache_info().hits
+    get_order_bytes(make_order(price=2 * 10 ** 18, orderSide="S"))
+
+    assert get_order_template.cache_info().hits == hits + 1
+
+
+def test_nonce_is_random_and_safe_integer():
+    orders = [base64.b64decode(get_order_bytes(ORDERS[0])) for _ in range(50)]
+    nonces = {struct.unpack_from(">Q", order, len(order) - 66)[0] for order in orders}
+
+    assert len(nonces) == 50
+    assert max(nonces) < 2 ** 53
+
+
+def test_invalid_amount_is_rejected():
+    with pytest.raises(Exception):
+        get_order_bytes(make_order(amount=-1))
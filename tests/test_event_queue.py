@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+
+from ultrade.utils.event_queue import EventQueue
+
+
+@pytest.mark.asyncio
+class TestEventQueue:
+    async def test_drop_oldest(self):
+        queue = EventQueue(2, "drop_oldest")
+        for i in range(4):
+            assert queue.offer("lastTrade", {"id": i})
+
+        assert [await queue.get(), await queue.get()] == [
+            ("lastTrade", {"id": 2}),
+            ("lastTrade", {"id": 3}),
+        ]
+        assert queue.stats["dropped"] == 2
+        assert queue.stats["high_water"] == 2
+
+    async def test_get_batch_wakes_blocked_producers(self):
+        queue = EventQueue(2, "block")
+        queue.offer("lastTrade", {"id": 0})
+        queue.offer("lastTrade", {"id": 1})
+        producer = asyncio.ensure_future(queue.put("lastTrade", {"id": 2}))
+        await asyncio.sleep(0)
+
+        assert await queue.get_batch(5) == [("lastTrade", {"id": 0}), ("lastTrade", {"id": 1})]
+        await producer
+        assert await queue.get_batch(5) == [("lastTrade", {"id": 2})]
+
+    async def test_conflate_keeps_latest_per_pair(self):
+        queue = EventQueue(3, "conflate", conflate_events=["depth"])
+        queue.offer("depth", {"pair": "algo_usdc", "u": 1})
+        queue.offer("lastTrade", {"id": 1})
+        queue.offer("depth", {"pair": "eth_usdc", "u": 1})
+        queue.offer("depth", {"pair": "algo_usdc", "u": 2})
+
+        assert len(queue) == 3
+        assert await queue.get() == ("depth", {"pair": "algo_usdc", "u": 2})
+        assert queue.stats["conflated"] == 1
+        assert queue.stats["dropped"] == 0
+
+    async def test_block_keeps_order(self):
+        queue = EventQueue(1, "block", max_blocked=2)
+        assert queue.offer("order", 0)
+        assert not queue.offer("order", 1)
+
+        putters = [asyncio.ensure_future(queue.put("order", i)) for i in (1, 2)]
+        await asyncio.sleep(0)
+        assert not queue.offer("order", 3)
+
+        received = [await queue.get() for _ in range(3)]
+        await asyncio.gather(*putters)
+
+        assert [args for _, args in received] == [0, 1, 2]
+        assert len(queue) == 0
+
+    async def test_block_caps_waiting_producers(self):
+        queue = EventQueue(2, "block", max_blocked=3)
+        putters = [asyncio.ensure_future(queue.put("order", i)) for i in range(10)]
+        await asyncio.sleep(0)
+
+        assert queue.stats["size"] == 2
+        assert queue.stats["blocked"] == 3
+        assert queue.stats["dropped"] == 5
+        assert sum(not putter.done() for putter in putters) == 3
+
+        received = [await queue.get() for _ in range(5)]
+        await asyncio.gather(*putters)
+        assert [args for _, args in received] == [0, 1, 2, 3, 4]
@@ -0,0 +1,220 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from eth_account import Account
+from eth_hash.auto import keccak
+import rlp
+
+from ultrade.signers.ethereum import EthereumSigner, GAS_LIMIT
+from ultrade.utils.evm import EvmProviders
+
+CHAIN_ID = 1337
+TOKEN = "0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A"
+TMC = "0x000000000000000000000000000000000000c0De"
+ALLOWANCE = keccak(b"allowance(address,address)")[:4]
+APPROVE = keccak(b"approve(address,uint256)")[:4]
+DEPOSIT = keccak(b"depositToCodex(address,uint256,bytes,uint256)")[:4]
+
+
+class FakeEvmNode:
+    """
+    Answers the JSON-RPC calls of a deposit, transactions are mined as soon as they are sent, in nonce order.
+    """
+
+    def __init__(self, allowance=0):
+        self.allowance = allowance
+        self.nonce = 7
+        self.queued = {}
+        self.receipts = {}
+        self.methods = []
+        self.mined = []
+        self.send_error = None
+        self.app = web.Application()
+        self.app.router.add_post("/", self.rpc)
+
+    async def rpc(self, request):
+        body = await request.json()
+        method, params = body["method"], body["params"]
+        self.methods.append(method)
+        if method == "eth_sendRawTransaction" and self.send_error:
+            return web.json_response(
+                {"jsonrpc": "2.0", "id": body["id"], "error": {"code": -32000, "message": self.send_error}}
+            )
+        result = getattr(self, method)(*params)
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+    def eth_chainId(self):
+        return hex(CHAIN_ID)
+
+    def eth_getTransactionCount(self, address, block):
+        return hex(self.nonce)
+
+    def eth_call(self, call, block):
+        assert bytes.fromhex(call["data"][2:10]) == ALLOWANCE
+        return "0x" + self.allowance.to_bytes(32, "big").hex()
+
+    def eth_estimateGas(self, call, block):
+        return hex(60000)
+
+    def eth_getBlockByNumber(self, block, full):
+        return {"number": "0x10", "baseFeePerGas": hex(10**9), "extraData": "0x"}
+
+    def eth_maxPriorityFeePerGas(self):
+        return hex(10**9)
+
+    def eth_sendRawTransaction(self, raw):
+        decoded = decode_transaction(bytes.fromhex(raw[2:]))
+        tx_hash = "0x" + keccak(bytes.fromhex(raw[2:])).hex()
+        self.queued[decoded["nonce"]] = (tx_hash, decoded)
+        while self.nonce in self.queued:
+            self.mine(*self.queued.pop(self.nonce))
+        return tx_hash
+
+    def mine(self, tx_hash, txn):
+        selector, args = txn["data"][:4], txn["data"][4:]
+        status = 1
+        if selector == APPROVE:
+            self.allowance = int.from_bytes(args[32:64], "big")
+        elif selector == DEPOSIT:
+            amount = int.from_bytes(args[32:64], "big")
+            status = int(self.allowance >= amount)
+            self.allowance -= amount * status
+        self.nonce += 1
+        self.mined.append((txn["nonce"], selector, txn["gas"]))
+        self.receipts[tx_hash] = {
+            "transactionHash": tx_hash,
+            "blockNumber": hex(0x10 + len(self.mined)),
+            "status": hex(status),
+            "logs": [],
+        }
+
+    def eth_getTransactionReceipt(self, tx_hash):
+        return self.receipts.get(tx_hash)
+
+
+def decode_transaction(raw: bytes) -> dict:
+    # EIP-1559 transaction: 0x02 || rlp([chain_id, nonce, max_priority_fee, max_fee, gas, to, value, data, ...])
+    assert raw[0] == 2
+    fields = rlp.decode(raw[1:])
+    return {
+        "nonce": int.from_bytes(fields[1], "big"),
+        "gas": int.from_bytes(fields[4], "big"),
+        "data": fields[7],
+    }
+
+
+@pytest_asyncio.fixture
+async def evm_node(unused_tcp_port):
+    node = FakeEvmNode()
+    runner = web.AppRunner(node.app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", unused_tcp_port).start()
+    yield node, f"http://127.0.0.1:{unused_tcp_port}"
+    await runner.cleanup()
+
+
+def make_config(rpc_url, providers):
+    return {
+        "rpc_url": rpc_url,
+        "tmc_configs": [{"chainId": str(CHAIN_ID), "tmc": TMC}],
+        "login_user": EthereumSigner(Account.create().key.hex()[2:]),
+        "evm_providers": providers,
+    }
+
+
+@pytest.mark.asyncio
+class TestEvmDeposit:
+    async def test_approve_and_deposit_are_pipelined(self, evm_node):
+        node, rpc_url = evm_node
+        providers = EvmProviders()
+        signer = EthereumSigner(Account.create().key.hex()[2:])
+
+        tx_hash = await signer._deposit(500, TOKEN, make_config(rpc_url, providers))
+
+        assert node.mined == [(7, APPROVE, 60000), (8, DEPOSIT, GAS_LIMIT)]
+        assert list(node.receipts)[-1] == tx_hash
+        # both transactions are sent before waiting for the first receipt
+        sends = [i for i, method in enumerate(node.methods) if method == "eth_sendRawTransaction"]
+        assert sends[1] < node.methods.index("eth_getTransactionReceipt")
+        await providers.close()
+
+    async def test_nonces_and_chain_id_are_fetched_once(self, evm_node):
+        node, rpc_url = evm_node
+        node.allowance = 10**18
+        providers = EvmProviders()
+        signer = EthereumSigner(Account.create().key.hex()[2:])
+        config = make_config(rpc_url, providers)
+
+        await asyncio.gather(*[signer._deposit(100, TOKEN, config) for _ in range(3)])
+
+        assert sorted(nonce for nonce, _, _ in node.mined) == [7, 8, 9]
+        assert node.methods.count("eth_getTransactionCount") == 1
+        assert node.methods.count("eth_chainId") == 1
+        assert providers.get(rpc_url) is providers.get(rpc_url)
+        assert providers.nonces.stats == {"accounts": 1, "fetches": 1, "reserved": 3}
+        await providers.close()
+
+    async def test_failed_send_resets_the_nonce(self, evm_node):
+        node, rpc_url = evm_node
+        node.allowance = 10**18
+        providers = EvmProviders()
+        signer = EthereumSigner(Account.create().key.hex()[2:])
+        config = make_config(rpc_url, providers)
+
+        async def stale_nonce():
+            return 3
+
+        await providers.nonces.reserve((CHAIN_ID, signer.address), stale_nonce, 0)
+        node.send_error = "nonce too low"
+
+        with pytest.raises(ValueError, match="nonce too low"):
+            await signer._deposit(100, TOKEN, config)
+
+        node.send_error = None
+        await signer._deposit(100, TOKEN, config)
+        assert node.mined == [(7, DEPOSIT, 60000)]
+        await providers.close()
+
+    async def test_gas_limit_of_a_deposit_after_its_approve(self, evm_node):
+        node, rpc_url = evm_node
+        providers = EvmProviders()
+        signer = EthereumSigner(Account.create().key.hex()[2:])
+        config = make_config(rpc_url, providers)
+        config["deposit_gas_limit"] = 250000
+
+        await signer._deposit(500, TOKEN, config)
+
+        assert node.mined == [(7, APPROVE, 60000), (8, DEPOSIT, 250000)]
+        await providers.close()
+
+    async def test_close_only_closes_its_own_sessions(self, evm_node):
+        node, rpc_url = evm_node
+        node.allowance = 10**18
+        providers, others = EvmProviders(), EvmProviders()
+        # the fake node has one nonce for all accounts, the one of `signer` gets stale after the other deposits
+        signer = EthereumSigner(Account.create().key.hex()[2:])
+        other_signer = EthereumSigner(Account.create().key.hex()[2:])
+
+        await signer._deposit(100, TOKEN, make_config(rpc_url, providers))
+        await other_signer._deposit(100, TOKEN, make_config(rpc_url, others))
+        session = providers.get(rpc_url).provider._session
+        other_session = others.get(rpc_url).provider._session
+        await providers.close()
+
+        assert session.closed and not other_session.closed
+        await other_signer._deposit(100, TOKEN, make_config(rpc_url, others))
+        assert len(node.mined) == 3
+        # the provider opens a new session when it is used again
+        assert await providers.get(rpc_url).eth.get_transaction_count(signer.address) == 10
+        await providers.close()
+        await others.close()
+
+    async def test_close_without_requests(self):
+        providers = EvmProviders()
+        providers.get("http://127.0.0.1:1")
+
+        await providers.close()
+
+        assert providers.get("http://127.0.0.1:1").provider._session is None
@@ -0,0 +1,70 @@
+import json
+import pytest
+
+from ultrade.utils.json_codec import (
+    CANONICAL_MAX_VALUES,
+    CODECS,
+    _is_canonical,
+    get_json_codec,
+    set_json_codec,
+)
+from ultrade.utils.utils import toJson
+
+PAYLOADS = [
+    {"orderId": 123456789},
+    {"a": 1, "b": [True, None, "x\n\t\"\\/"], "c": {"d": -(1 << 63)}},
+    {"amount": 1 << 64},
+    {"amount": 1 << 70, "price": 1e16},
+    {"amount": (1 << 70) + 1},
+    {"price": 0.1, "small": 1e-7, "nan": float("nan")},
+    {"text": "é ☃", "del": "\x7f"},
+    {1: "int key"},
+    {"orders": [{"id": i, "side": "B"} for i in range(100)]},
+]
+
+
+@pytest.mark.parametrize("codec", CODECS.values(), ids=list(CODECS))
+class TestJsonCodec:
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_canonical_dumps_matches_stdlib(self, codec, payload):
+        assert codec.canonical_dumps(payload) == json.dumps(payload, separators=(",", ":"))
+
+    def test_round_trip(self, codec):
+        # a float can't hold this amount exactly
+        payload = {"buy": [["1000", "5"]], "ts": 1700000000000, "amount": (1 << 70) + 1}
+        encoded = codec.dumps(payload, separators=(",", ":"))
+
+        assert codec.loads(encoded) == payload
+        assert codec.loads(encoded.encode()) == payload
+
+
+def test_large_payloads_skip_the_fast_path():
+    assert _is_canonical(list(range(CANONICAL_MAX_VALUES - 1)))
+    assert not _is_canonical(list(range(CANONICAL_MAX_VALUES)))
+    assert not _is_canonical({"orders": [{"id": i} for i in range(20)]})
+
+
+class TestDefaultCodec:
+    def test_to_json_uses_default_codec(self):
+        default = get_json_codec()
+        try:
+            for name in CODECS:
+                set_json_codec(name)
+                assert toJson({"orderId": 1, "x": 0.5}) == '{"orderId":1,"x":0.5}'
+        finally:
+            set_json_codec(default.name)
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            get_json_codec("ujson")
+
+
+def test_orjson_decodes_wide_integers_without_msgspec(monkeypatch):
+    from ultrade.utils import json_codec
+
+    if json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(json_codec, "msgspec", None)
+    codec = json_codec._create_codecs()["orjson"]
+
+    assert codec.loads(b'{"amount":1180591620717411303425}') == {"amount": (1 << 70) + 1}
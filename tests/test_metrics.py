@@ -0,0 +1,40 @@
+import unittest
+
+from ultrade.utils.metrics import Histogram, MetricsRegistry, endpoint_name
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles_within_precision(self):
+        histogram = Histogram()
+        for micros in range(1, 10001):
+            histogram.record(micros / 1_000_000)
+
+        self.assertEqual(histogram.count, 10000)
+        for percentile, expected in ((50, 0.005), (99, 0.0099), (99.9, 0.00999)):
+            value = histogram.percentile(percentile)
+            self.assertLessEqual(abs(value - expected) / expected, 0.016)
+        self.assertEqual(histogram.percentile(100), 0.01)
+
+    def test_empty_histogram(self):
+        self.assertIsNone(Histogram().percentile(99))
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_records_per_endpoint(self):
+        received = []
+        registry = MetricsRegistry(listeners=[received.append])
+        for status in (200, 200, 503):
+            trace = registry.start("GET", "https://api.ultrade.org/market/order/123?x=1")
+            trace.status = status
+            trace.response_size = 10
+            registry.finish(trace)
+
+        stats = registry.snapshot()["GET /market/order/{id}"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["statuses"], {200: 2, 503: 1})
+        self.assertEqual(stats["bytes_received"], 30)
+        self.assertEqual(stats["timings"]["total"]["count"], 3)
+        self.assertEqual(len(received), 3)
+
+    def test_endpoint_name(self):
+        self.assertEqual(endpoint_name("DELETE", "http://h/market/orders"), "DELETE /market/orders")
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+
+from ultrade.utils.order_book import LocalOrderBook, OrderBook, OrderBookGapException
+
+
+def make_snapshot(u, buy, sell):
+    return {"buy": buy, "sell": sell, "u": u, "pair": "algo_usdc"}
+
+
+class TestOrderBook:
+    def test_best_levels_and_removal(self):
+        book = OrderBook()
+        book.load(make_snapshot(1, [["100", "5"], ["101", "2"]], [["103", "1"], ["102.5", "4"]]))
+
+        assert book.best_bid == ("101", "2")
+        assert book.best_ask == ("102.5", "4")
+
+        book.apply({"buy": [["101", "0"], ["99", "7"]], "sell": [["102.5", "0"]], "u": 2})
+
+        assert book.best_bid == ("100", "5")
+        assert book.best_ask == ("103", "1")
+        assert book.bids.get("99") == "7"
+        assert book.bids.get("101") is None
+        assert book.depth(2) == {"buy": [["100", "5"], ["99", "7"]], "sell": [["103", "1"]], "u": 2}
+
+    def test_empty_book(self):
+        book = OrderBook()
+        assert book.best_bid is None
+        assert book.best_ask is None
+
+
+@pytest.mark.asyncio
+class TestLocalOrderBook:
+    async def test_bootstrap_replays_buffered_updates(self):
+        async def fetch_snapshot():
+            return make_snapshot(10, [["100", "5"]], [["105", "5"]])
+
+        book = LocalOrderBook("algo_usdc", fetch_snapshot)
+        book.on_depth({"buy": [["100", "1"]], "U": 9, "u": 10})
+        book.on_depth({"buy": [["101", "1"]], "U": 11, "u": 11})
+        await book.resync()
+
+        assert book.synced
+        assert book.best_bid == ("101", "1")
+        assert book.bids.get("100") == "5"
+
+        book.on_depth({"sell": [["104", "2"]], "U": 12, "u": 13})
+        assert book.best_ask == ("104", "2")
+        assert book.last_update_id == 13
+
+    async def test_gap_triggers_resync(self):
+        snapshots = [make_snapshot(10, [["100", "5"]], []), make_snapshot(20, [["98", "1"]], [])]
+
+        async def fetch_snapshot():
+            return snapshots.pop(0)
+
+        book = LocalOrderBook("algo_usdc", fetch_snapshot)
+        await book.resync()
+
+        book.on_depth({"buy": [["99", "1"]], "U": 15, "u": 21})
+        assert not book.synced
+        await asyncio.sleep(0)
+
+        assert book.synced
+        assert book.gaps == 1
+        assert book.resyncs == 2
+        assert book.best_bid == ("99", "1")
+        assert book.bids.get("100") is None
+        assert book.last_update_id == 21
+
+    async def test_resync_gives_up(self):
+        async def fetch_snapshot():
+            return make_snapshot(1, [], [])
+
+        book = LocalOrderBook("algo_usdc", fetch_snapshot, max_resync_attempts=2)
+        book.on_depth({"buy": [["100", "1"]], "U": 5, "u": 5})
+
+        with pytest.raises(OrderBookGapException):
+            await book.resync()
+        assert not book.synced
+        assert book.stats["buffered"] == 1
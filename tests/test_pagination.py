@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from algosdk import account, mnemonic
+
+from ultrade import Client
+
+
+class FakeOrders:
+    """
+    Serves `pages` full pages and a short last page, later pages resolve first.
+    Pages after `stall_after` never resolve.
+    """
+
+    def __init__(self, pages: int, limit: int, stall_after: int = None):
+        self.pages = pages
+        self.limit = limit
+        self.stall_after = pages + 1 if stall_after is None else stall_after
+        self.requested = []
+        self.cancelled = []
+
+    async def __call__(self, startTime=None, endTime=None, page=1, limit=100):
+        self.requested.append(page)
+        try:
+            if page > self.stall_after:
+                await asyncio.Event().wait()
+            await asyncio.sleep(0.001 * (self.pages + 2 - page))
+        except asyncio.CancelledError:
+            self.cancelled.append(page)
+            raise
+        count = self.limit if page <= self.pages else self.limit // 2
+        return [{"id": (page, i)} for i in range(count)]
+
+
+def make_client(fake_orders):
+    private_key, address = account.generate_account()
+    client = Client(network="testnet", verify_network=False)
+    client.set_trading_key("trading key", address, mnemonic.from_private_key(private_key))
+    client.get_orders = fake_orders
+    return client
+
+
+def other_tasks():
+    return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+
+@pytest.mark.asyncio
+class TestIterPages:
+    async def test_pages_in_order_and_prefetch_stops_after_short_page(self):
+        fake = FakeOrders(pages=3, limit=4)
+        client = make_client(fake)
+
+        orders = [order async for order in client.iter_orders(limit=4, prefetch=2)]
+
+        # later pages resolve first, the items still come in page order
+        assert [order["id"] for order in orders] == [(page, i) for page in (1, 2, 3) for i in range(4)] + [
+            (4, 0),
+            (4, 1),
+        ]
+        # pages past the short page 4 are at most the prefetched ones, and they are cancelled
+        assert sorted(fake.requested) == [1, 2, 3, 4, 5, 6]
+        assert sorted(fake.cancelled) == [5, 6]
+        assert other_tasks() == []
+        await client.close()
+
+    async def test_early_break_cancels_prefetched_pages(self):
+        fake = FakeOrders(pages=10, limit=4, stall_after=1)
+        client = make_client(fake)
+
+        async for order in client.iter_orders(limit=4, prefetch=3):
+            break
+        # the abandoned generator is closed by the event loop
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert order["id"] == (1, 0)
+        assert sorted(fake.requested) == [1, 2, 3, 4, 5]
+        assert sorted(fake.cancelled) == [2, 3, 4, 5]
+        assert other_tasks() == []
+        await client.close()
+
+    async def test_wallet_transactions_use_the_same_pager(self):
+        client = make_client(None)
+        pages = []
+
+        async def get_wallet_transactions(startTime=None, endTime=None, page=1, limit=100):
+            pages.append(page)
+            return [{"page": page}] * (limit if page < 2 else 1)
+
+        client.get_wallet_transactions = get_wallet_transactions
+        transactions = [tx async for tx in client.iter_wallet_transactions(limit=2, prefetch=0)]
+
+        assert [tx["page"] for tx in transactions] == [1, 1, 2]
+        assert pages == [1, 2]
+        await client.close()
+
+    async def test_invalid_limit(self):
+        client = make_client(FakeOrders(pages=1, limit=1))
+        with pytest.raises(ValueError):
+            async for _ in client.iter_orders(limit=0):
+                pass
+        await client.close()
@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+
+from ultrade.utils.pair_registry import PairRegistry
+
+PAIRS = [
+    {"id": 47, "pairId": 47, "pair_key": "algo_usdc", "base_id": "0", "price_id": "157824770"},
+    {"id": 48, "pairId": 48, "pair_key": "eth_usdc", "base_id": "0xabc", "price_id": "157824770"},
+]
+
+
+class FakeApi:
+    def __init__(self):
+        self.list_calls = 0
+        self.pair_calls = 0
+
+    async def get_pair_list(self):
+        self.list_calls += 1
+        await asyncio.sleep(0.01)
+        return list(PAIRS)
+
+    async def get_pair_info(self, key):
+        self.pair_calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": 99, "pairId": 99, "pair_key": "moon_usdc", "base_id": "1", "price_id": "2"}
+
+
+@pytest.mark.asyncio
+class TestPairRegistry:
+    async def test_lookup_by_id_symbol_and_tokens(self):
+        api = FakeApi()
+        registry = PairRegistry(api.get_pair_list, api.get_pair_info)
+
+        assert (await registry.get(47))["pair_key"] == "algo_usdc"
+        assert (await registry.get("ETH_USDC"))["id"] == 48
+        assert (await registry.get("47"))["id"] == 47
+        assert registry.find_by_tokens("0xabc", 157824770)["id"] == 48
+        assert api.list_calls == 1
+        assert api.pair_calls == 0
+
+    async def test_concurrent_misses_share_one_fetch(self):
+        api = FakeApi()
+        registry = PairRegistry(api.get_pair_list, api.get_pair_info)
+
+        results = await asyncio.gather(*[registry.get(99) for _ in range(10)])
+
+        assert all(pair["pair_key"] == "moon_usdc" for pair in results)
+        assert api.list_calls == 1
+        assert api.pair_calls == 1
+        assert registry.lookup("moon_usdc")["id"] == 99
+
+    async def test_ttl_and_invalidation(self):
+        api = FakeApi()
+        registry = PairRegistry(api.get_pair_list, api.get_pair_info, ttl=0)
+
+        await registry.get(47)
+        await registry.get(47)
+        assert api.list_calls == 2
+
+        registry.ttl = 300
+        registry.invalidate(47)
+        assert registry.lookup("algo_usdc") is None
+        registry.invalidate()
+        await registry.get(47)
+        assert api.list_calls == 3
@@ -0,0 +1,57 @@
+import asyncio
+import time
+import pytest
+
+from ultrade.utils.rate_limiter import RateLimiter, TokenBucket, parse_retry_after
+
+PRIORITIES = {"cancel": 0, "order": 1, "market_data": 3}
+
+
+@pytest.mark.asyncio
+class TestRateLimiter:
+    async def test_bucket_limits_throughput(self):
+        limiter = RateLimiter({"global": (1000, 1000), "order": (100, 5)}, PRIORITIES)
+        started = time.monotonic()
+        for _ in range(15):
+            await limiter.acquire("order")
+        assert time.monotonic() - started >= 0.09
+
+    async def test_orders_go_before_market_data(self):
+        limiter = RateLimiter({"global": (100, 1)}, PRIORITIES)
+        await limiter.acquire("market_data")
+        served = []
+
+        async def request(endpoint_class):
+            await limiter.acquire(endpoint_class)
+            served.append(endpoint_class)
+
+        await asyncio.gather(
+            request("market_data"), request("market_data"), request("order"), request("cancel")
+        )
+        assert served[:2] == ["cancel", "order"]
+
+    async def test_throttling_response_pauses_and_slows_down(self):
+        limiter = RateLimiter({"global": (1000, 10), "order": (100, 10)}, PRIORITIES)
+        limiter.on_response("order", 429, "0.1")
+        started = time.monotonic()
+        await limiter.acquire("order")
+        assert time.monotonic() - started >= 0.09
+        assert limiter.stats["order_rate"] == 50
+        assert limiter.stats["throttled"] == 1
+
+        limiter.on_response("order", 200)
+        assert limiter.stats["order_rate"] == 55
+
+
+class TestRetryAfter:
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("soon") is None
+
+    def test_bucket_never_throttles_below_floor(self):
+        bucket = TokenBucket(10, 10)
+        for _ in range(20):
+            bucket.throttle()
+        assert bucket.rate == 1
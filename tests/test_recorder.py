@@ -0,0 +1,82 @@
+import time
+import pytest
+
+from ultrade import socket_options
+from ultrade.socket_client import SocketConnection, SocketController
+from ultrade.utils.recorder import EventRecorder, EventReplayer
+
+
+@pytest.mark.asyncio
+class TestRecorder:
+    async def test_record_connection_and_replay_into_controller(self, tmp_path):
+        path = str(tmp_path / "stream.ulog")
+        connection = SocketConnection("http://localhost")
+        connection.recorder = EventRecorder(path)
+        events = [
+            ("depth", {"pair": "algo_usdc", "buy": [["100", "5"]], "u": 1}),
+            ("lastTrade", {"price": "1.5", "amount": "é"}),
+            ("maintenance", 0),
+        ]
+        for event, args in events:
+            await connection.callback_handler(event, args)
+        connection.recorder.close()
+
+        replayed = []
+        target = SocketController()
+        target.handle_subscribe(
+            {"streams": [socket_options.DEPTH, socket_options.TRADES, socket_options.MAINTENANCE]},
+            lambda event, args: replayed.append((event, args)),
+            inline=True,
+        )
+        count = await EventReplayer(path).replay(target.callback_handler)
+
+        assert count == 3
+        assert replayed == events
+
+    async def test_recording_failure_does_not_stop_routing(self, tmp_path):
+        connection = SocketConnection("http://localhost")
+        connection.recorder = EventRecorder(str(tmp_path / "stream.ulog"))
+        connection.controllers["algo_usdc"] = SocketController()
+        received = []
+        connection.controllers["algo_usdc"].handle_subscribe(
+            {"symbol": "algo_usdc", "streams": [socket_options.DEPTH], "options": {}},
+            lambda event, args: received.append(args["u"]),
+            inline=True,
+        )
+
+        # a payload the codec can't serialize
+        await connection.callback_handler("depth", {"pair": "algo_usdc", "u": 1, "at": object()})
+        await connection.callback_handler("depth", {"pair": "algo_usdc", "u": 2})
+        connection.recorder.close()
+
+        assert received == [1, 2]
+        assert (connection.recorder.records, connection.recorder.failures) == (1, 1)
+
+    async def test_recorded_pace_and_truncated_tail(self, tmp_path):
+        path = str(tmp_path / "stream.ulog")
+        with EventRecorder(path) as recorder:
+            recorder.record("depth", {"u": 1}, timestamp=1000.0)
+            recorder.record("depth", {"u": 2}, timestamp=1000.1)
+        with EventRecorder(path) as recorder:
+            recorder.record("depth", {"u": 3}, timestamp=1000.2)
+        with open(path, "r+b") as file:
+            file.truncate(file.seek(0, 2) - 3)
+
+        replayed = []
+
+        async def dispatch(event, args):
+            replayed.append(args["u"])
+
+        started = time.monotonic()
+        assert await EventReplayer(path).replay(dispatch, speed=2.0) == 2
+        assert time.monotonic() - started >= 0.045
+        assert replayed == [1, 2]
+        assert [record[0] for record in EventReplayer(path)] == [1000.0, 1000.1]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.log"
+    path.write_bytes(b"not an event log")
+
+    with pytest.raises(ValueError):
+        list(EventReplayer(str(path)))
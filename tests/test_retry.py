@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+import aiohttp
+
+from ultrade.utils.rate_limiter import RateLimitException
+from ultrade.utils.retry import RetryPolicy
+
+
+def failing_call(errors, result="ok"):
+    errors = list(errors)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return call, calls
+
+
+def server_error(status):
+    return aiohttp.ClientResponseError(None, (), status=status)
+
+
+@pytest.mark.asyncio
+class TestRetryPolicy:
+    async def test_idempotent_calls_are_retried(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        call, calls = failing_call([aiohttp.ServerDisconnectedError(), server_error(503)])
+
+        assert await policy.run(call, idempotent=True) == "ok"
+        assert len(calls) == 3
+        assert policy.stats["retries"] == 2
+        assert policy.stats["attempts_per_call"] == 3
+
+    async def test_non_idempotent_calls_are_not_retried_once_sent(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        call, calls = failing_call([aiohttp.ServerDisconnectedError()])
+
+        with pytest.raises(aiohttp.ServerDisconnectedError) as error:
+            await policy.run(call, idempotent=False)
+        assert len(calls) == 1
+        assert error.value.attempts == 1
+        assert policy.stats["failures"] == 1
+
+    async def test_non_idempotent_calls_are_retried_when_refused(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        call, calls = failing_call([RateLimitException("slow down", 0.01)])
+
+        assert await policy.run(call, idempotent=False) == "ok"
+        assert len(calls) == 2
+
+    async def test_client_errors_are_not_retried(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        call, calls = failing_call([server_error(400)])
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            await policy.run(call, idempotent=True)
+        assert len(calls) == 1
+
+    async def test_deadline(self):
+        policy = RetryPolicy(max_attempts=5, deadline=0.05)
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await policy.run(slow, idempotent=True)
+        assert policy.stats["max_elapsed"] < 0.5
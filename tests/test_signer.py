@@ -1,8 +1,14 @@
+import pickle
 import unittest
+from unittest import mock
 from ultrade.signers.main import Signer
 from ultrade.signers.algorand import AlgorandSigner
-from ultrade.signers.ethereum import EthereumSigner
-from tests.test_credentials import (
+from ultrade.signers import ethereum
+from ultrade.signers.ethereum import EthereumSigner, SIGNING_BACKENDS
+import pytest
+
+pytest.importorskip("tests.test_credentials", reason="tests/test_credentials.py with the test credentials is missing")
+from tests.test_credentials import (  # noqa: E402
     TEST_MNEMONIC_KEY,
     TEST_ETH_PRIVATE_KEY,
     TEST_MESSAGE_TO_SIGN,
@@ -69,6 +75,57 @@ class TestSignMessage(unittest.TestCase):
         self.assertEqual(signature, expected_signature)
         self.assertEqual(public_key, self.algorand_signer.address)
 
+    def test_signers_survive_pickling(self):
+        message = bytes(TEST_MESSAGE_TO_SIGN, "utf-8")
+        for signer in (self.ethereum_signer, self.algorand_signer):
+            restored = pickle.loads(pickle.dumps(signer))
+            self.assertEqual(restored.address, signer.address)
+            self.assertEqual(restored.sign_data(message), signer.sign_data(message))
+
+
+class TestEthereumSigningBackends(unittest.TestCase):
+    def test_backends_produce_identical_signatures(self):
+        messages = [b"", bytes(TEST_MESSAGE_TO_SIGN, "utf-8"), b"\x00" * 9, bytes(range(256)) * 40]
+        signers = [
+            EthereumSigner(TEST_ETH_PRIVATE_KEY, signing_backend=name) for name in SIGNING_BACKENDS
+        ]
+
+        for message in messages:
+            expected_signature = Account.sign_message(
+                encode_defunct(message), private_key=TEST_ETH_PRIVATE_KEY
+            ).signature
+            for signer in signers:
+                signature = signer.sign_data(message)
+                self.assertEqual(signature, expected_signature, signer.signing_backend)
+                self.assertEqual(signature.hex(), expected_signature.hex())
+
+    @unittest.skipUnless("coincurve" in SIGNING_BACKENDS, "coincurve is not installed")
+    def test_default_backend_and_cached_address(self):
+        signer = Signer.create_signer(TEST_ETH_PRIVATE_KEY)
+
+        self.assertEqual(signer.signing_backend, "coincurve")
+        self.assertEqual(signer.address, Account.from_key(TEST_ETH_PRIVATE_KEY).address)
+
+    def test_eth_account_is_the_default_without_coincurve(self):
+        with mock.patch.object(ethereum, "coincurve", None), mock.patch.dict(SIGNING_BACKENDS):
+            SIGNING_BACKENDS.pop("coincurve", None)
+            signer = Signer.create_signer(TEST_ETH_PRIVATE_KEY)
+
+            self.assertEqual(signer.signing_backend, "eth_account")
+            self.assertEqual(signer.address, Account.from_key(TEST_ETH_PRIVATE_KEY).address)
+            with self.assertRaises(ValueError):
+                EthereumSigner(TEST_ETH_PRIVATE_KEY, signing_backend="coincurve")
+
+    def test_backend_survives_pickling(self):
+        signer = EthereumSigner(TEST_ETH_PRIVATE_KEY, signing_backend="eth_account")
+        restored = pickle.loads(pickle.dumps(signer))
+
+        self.assertEqual(restored.signing_backend, "eth_account")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            EthereumSigner(TEST_ETH_PRIVATE_KEY, signing_backend="openssl")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+
+from ultrade.utils.singleflight import RequestCoalescer
+
+
+@pytest.mark.asyncio
+class TestRequestCoalescer:
+    async def test_identical_calls_share_one_request(self):
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"lastPrice": "1"}
+
+        results = await asyncio.gather(*[coalescer.run("price", fetch) for _ in range(5)])
+
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        assert coalescer.stats["coalesced"] == 4
+        assert coalescer.stats["coalesce_ratio"] == 0.8
+
+        await coalescer.run("price", fetch)
+        assert calls == 2
+
+    async def test_micro_ttl(self):
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await coalescer.run("depth", fetch, ttl=0.05) == 1
+        assert await coalescer.run("depth", fetch, ttl=0.05) == 1
+        assert coalescer.stats["cache_hits"] == 1
+        await asyncio.sleep(0.06)
+        assert await coalescer.run("depth", fetch, ttl=0.05) == 2
+
+    async def test_errors_are_not_cached(self):
+        coalescer = RequestCoalescer()
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await coalescer.run("price", fail, ttl=10)
+        with pytest.raises(ValueError):
+            await coalescer.run("price", fail, ttl=10)
+        assert coalescer.stats["cache_hits"] == 0
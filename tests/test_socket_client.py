@@ -0,0 +1,174 @@
+import asyncio
+import pytest
+import pytest_asyncio
+import socketio
+from aiohttp import web
+
+from algosdk import account, mnemonic
+
+from ultrade import Client, socket_options
+from ultrade.socket_client import SocketClient, SocketConnection, SocketController
+
+
+@pytest_asyncio.fixture
+async def socket_server(unused_tcp_port):
+    server = socketio.AsyncServer(async_mode="aiohttp")
+    app = web.Application()
+    server.attach(app)
+    subscriptions = {}
+
+    @server.on("subscribe")
+    async def subscribe(sid, data):
+        subscriptions.setdefault(sid, set()).add(data["symbol"])
+        for symbol in subscriptions[sid]:
+            await server.emit("depth", {"pair": symbol, "u": 1}, to=sid)
+
+    @server.on("unsubscribe")
+    async def unsubscribe(sid, data):
+        subscriptions[sid].discard(data["symbol"])
+
+    server.subscriptions = subscriptions
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", unused_tcp_port).start()
+    yield f"http://127.0.0.1:{unused_tcp_port}", server
+    await runner.cleanup()
+
+
+async def wait_for(condition, timeout=5):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+class TestSocketClient:
+    async def test_pairs_are_sharded_and_routed(self, socket_server):
+        url, server = socket_server
+        subscriptions = server.subscriptions
+        client = SocketClient(url, max_connections=2)
+        received = {"algo_usdc": [], "eth_usdc": [], "btc_usdc": []}
+
+        def on_event(symbol):
+            return lambda event, args: received[symbol].append(args["pair"])
+
+        ids = {}
+        for symbol in received:
+            ids[symbol] = await client.subscribe(
+                {"symbol": symbol, "streams": [socket_options.DEPTH], "options": {}},
+                on_event(symbol),
+                inline=True,
+            )
+        await wait_for(lambda: all(received.values()))
+
+        assert client.stats["connections"] == 2
+        assert sorted(symbol for symbols in subscriptions.values() for symbol in symbols) == sorted(received)
+        for symbol, pairs in received.items():
+            assert set(pairs) == {symbol}
+
+        await client.unsubscribe(ids["algo_usdc"])
+        assert client.stats["pairs"] == 2
+        await client.close()
+        assert client.stats["connections"] == 0
+
+    async def test_stream(self, socket_server):
+        url, _ = socket_server
+        private_key, address = account.generate_account()
+        client = Client(network="testnet", websocket_url=url, verify_network=False)
+        client.set_trading_key("trading key", address, mnemonic.from_private_key(private_key))
+
+        events = []
+        async for event in client.stream("algo_usdc", [socket_options.DEPTH]):
+            events.append(event)
+            break
+        await asyncio.sleep(0.05)
+
+        assert events[0].event == "depth"
+        assert events[0].stream == socket_options.DEPTH
+        assert events[0].data == {"pair": "algo_usdc", "u": 1}
+        assert client.websocket_stats["connections"] == 0
+        await client.close()
+
+    async def test_resync_after_reconnect(self, socket_server):
+        url, server = socket_server
+
+        async def fetch_depth(symbol):
+            await asyncio.sleep(0.05)
+            return {"buy": [], "sell": [], "u": 5, "pair": symbol}
+
+        client = SocketClient(url, snapshot_fetchers={socket_options.DEPTH: fetch_depth})
+        received = []
+        await client.subscribe(
+            {"symbol": "algo_usdc", "streams": [socket_options.DEPTH], "options": {}},
+            lambda event, args: received.append((event, args.get("u"))),
+            inline=True,
+        )
+        await wait_for(lambda: received)
+
+        # drop the transport, as a network failure would
+        await client.connections[0].socket.eio.ws.close()
+        await wait_for(lambda: len(server.subscriptions) == 2, timeout=10)
+        await wait_for(lambda: len(received) == 2)
+        await server.emit("depth", {"pair": "algo_usdc", "u": 6})
+        await wait_for(lambda: len(received) == 3)
+
+        # the depth update sent on resubscribe is older than the snapshot and is skipped
+        assert received == [("depth", 1), ("resync", None), ("depth", 6)]
+        stats = client.stats["per_connection"][0]
+        assert stats["reconnects"] == 1
+        assert stats["last_outage"] > 0
+        assert stats["last_resync_latency"] >= 0.05
+        await client.close()
+
+    async def test_pairless_events_reach_each_callback_once(self):
+        connection = SocketConnection("http://unused")
+        shared, single = [], []
+        iterators = {}
+
+        def on_balances(event, args):
+            shared.append(args)
+
+        for symbol in ("algo_usdc", "eth_usdc", "btc_usdc"):
+            controller = connection.controllers[symbol] = SocketController()
+            options = {"symbol": symbol, "streams": [socket_options.CODEX_BALANCES], "options": {}}
+            controller.handle_subscribe(options, on_balances, inline=True)
+            handler_id = controller.handle_subscribe(options, None)
+            iterators[symbol] = controller.subscriptions[handler_id]
+        connection.controllers["eth_usdc"].handle_subscribe(
+            {"symbol": "eth_usdc", "streams": [socket_options.CODEX_BALANCES], "options": {}},
+            lambda event, args: single.append(args),
+            inline=True,
+        )
+
+        await connection.callback_handler("codexBalances", {"balance": 1})
+        # held back during a resync, the event is still delivered once
+        connection._resync_buffers = {"algo_usdc": []}
+        await connection.callback_handler("codexBalances", {"balance": 2})
+        await connection._finish_resync("algo_usdc", {}, 0.1)
+
+        assert shared == [{"balance": 1}, {"balance": 2}]
+        assert single == [{"balance": 1}, {"balance": 2}]
+        # every iterator is its own consumer
+        assert {symbol: it.queue.stats["size"] for symbol, it in iterators.items()} == dict.fromkeys(iterators, 2)
+        await connection.close()
+
+    async def test_events_of_other_pairs_are_dropped(self):
+        connection = SocketConnection("http://unused")
+        received = {"algo_usdc": [], "eth_usdc": []}
+
+        for symbol in received:
+            connection.controllers[symbol] = SocketController()
+            connection.controllers[symbol].handle_subscribe(
+                {"symbol": symbol, "streams": [socket_options.DEPTH], "options": {}},
+                lambda event, args, symbol=symbol: received[symbol].append(args["pair"]),
+                inline=True,
+            )
+
+        await connection.callback_handler("depth", {"pair": "btc_usdc", "u": 1})
+        await connection.callback_handler("depth", {"pair": "ALGO_USDC", "u": 2})
+
+        assert received == {"algo_usdc": ["ALGO_USDC"], "eth_usdc": []}
+        assert (connection.messages, connection.unrouted) == (2, 1)
+        await connection.close()
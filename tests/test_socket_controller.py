@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import pytest
+
+from ultrade import socket_options
+from ultrade.socket_client import SocketController
+
+
+@pytest.mark.asyncio
+class TestSocketController:
+    async def test_dispatch_modes(self):
+        controller = SocketController()
+        received = []
+
+        async def async_callback(event, args):
+            received.append(("async", event, args, threading.current_thread()))
+
+        def inline_callback(event, args):
+            received.append(("inline", event, args, threading.current_thread()))
+
+        def executor_callback(event, args):
+            received.append(("executor", event, args, threading.current_thread()))
+
+        controller.handle_subscribe({"streams": [socket_options.DEPTH]}, async_callback)
+        controller.handle_subscribe({"streams": [socket_options.DEPTH]}, inline_callback, inline=True)
+        controller.handle_subscribe({"streams": [socket_options.TRADES]}, executor_callback)
+
+        await controller.callback_handler("depth", {"u": 1})
+        await controller.callback_handler("userTrade", {"id": 2})
+        while len(received) < 3:
+            await asyncio.sleep(0.01)
+
+        threads = {mode: (event, thread) for mode, event, _, thread in received}
+        main_thread = threading.current_thread()
+        assert threads["async"] == ("depth", main_thread)
+        assert threads["inline"] == ("depth", main_thread)
+        assert threads["executor"][0] == "userTrade"
+        assert threads["executor"][1] is not main_thread
+
+    async def test_failing_inline_callback_does_not_stop_the_others(self):
+        controller = SocketController()
+        received = []
+
+        def failing(event, args):
+            raise ValueError("bad payload")
+
+        failing_id = controller.handle_subscribe({"streams": [socket_options.DEPTH]}, failing, inline=True)
+        controller.handle_subscribe(
+            {"streams": [socket_options.DEPTH]}, lambda event, args: received.append(args), inline=True
+        )
+
+        await controller.callback_handler("depth", {"u": 1})
+
+        assert received == [{"u": 1}]
+        assert controller.subscriptions[failing_id].stats == {"delivered": 1, "errors": 1}
+
+    async def test_executor_callback_gets_queued_events_in_order(self):
+        controller = SocketController()
+        received = []
+
+        def executor_callback(event, args):
+            if args["u"] == 3:
+                raise ValueError("bad payload")
+            received.append(args["u"])
+
+        handler_id = controller.handle_subscribe({"streams": [socket_options.DEPTH]}, executor_callback)
+        for u in range(10):
+            await controller.callback_handler("depth", {"u": u})
+        subscription = controller.subscriptions[handler_id]
+        while subscription.delivered < 10:
+            await asyncio.sleep(0.01)
+
+        assert received == [u for u in range(10) if u != 3]
+        assert subscription.errors == 1
+        controller.close()
+
+    async def test_unsubscribe_releases_streams(self):
+        controller = SocketController()
+        calls = []
+
+        first = controller.handle_subscribe(
+            {"streams": [socket_options.DEPTH, socket_options.TRADES]},
+            lambda event, args: calls.append(event),
+            inline=True,
+        )
+        second = controller.handle_subscribe(
+            {"streams": [socket_options.DEPTH]}, lambda event, args: calls.append(event), inline=True
+        )
+
+        assert await controller.handle_unsubscribe(first) == [socket_options.TRADES]
+        assert "lastTrade" not in controller.callbacks_pool
+        assert controller.streams_pool == [socket_options.DEPTH]
+
+        assert await controller.handle_unsubscribe(second) == [socket_options.DEPTH]
+        assert controller.streams_pool == []
+        assert controller.callbacks_pool == {}
+
+        await controller.callback_handler("depth", {"u": 1})
+        assert calls == []
+
+    async def test_slow_subscriber_does_not_block_others(self):
+        controller = SocketController()
+        fast = []
+        release = asyncio.Event()
+
+        async def slow_callback(event, args):
+            await release.wait()
+
+        async def fast_callback(event, args):
+            fast.append(args["u"])
+
+        slow_id = controller.handle_subscribe(
+            {"streams": [socket_options.DEPTH]}, slow_callback, queue_size=2, overflow="conflate"
+        )
+        controller.handle_subscribe({"streams": [socket_options.DEPTH]}, fast_callback)
+
+        for u in range(10):
+            await controller.callback_handler("depth", {"pair": "algo_usdc", "u": u})
+        await asyncio.sleep(0.01)
+
+        assert fast == list(range(10))
+        stats = controller.stats[slow_id]
+        assert stats["conflated"] == 9
+        assert stats["high_water"] == 1
+        release.set()
+        controller.close()
+
+    async def test_blocked_deliveries_are_bounded(self):
+        controller = SocketController()
+        release = asyncio.Event()
+
+        async def slow_callback(event, args):
+            await release.wait()
+
+        handler_id = controller.handle_subscribe(
+            {"streams": [socket_options.TRADES]}, slow_callback, queue_size=10
+        )
+        baseline = len(asyncio.all_tasks())
+        # engineio dispatches every message in its own task
+        tasks = [
+            asyncio.ensure_future(controller.callback_handler("lastTrade", {"id": i}))
+            for i in range(500)
+        ]
+        await asyncio.sleep(0.01)
+
+        stats = controller.stats[handler_id]
+        # one event is held by the callback, the queue is full, at most 10 deliveries wait
+        # and the other events are dropped instead of piling up as tasks
+        assert stats["size"] == 10
+        assert 0 < stats["blocked"] <= 10
+        assert 1 + stats["size"] + stats["blocked"] + stats["dropped"] == 500
+        assert sum(not task.done() for task in tasks) == stats["blocked"]
+        assert len(asyncio.all_tasks()) <= baseline + 1 + 10
+        release.set()
+        await asyncio.gather(*tasks)
+        controller.close()
@@ -15,6 +15,47 @@ NETWORK_CONSTANTS = {
 
 OPEN_ORDER_STATUS = "1"
 
+DEFAULT_HTTP_OPTIONS = {
+    "connection_limit": 100,
+    "connection_limit_per_host": 32,
+    "dns_cache_ttl": 300,
+    "keepalive_timeout": 30,
+}
+
+# (requests per second, burst) per endpoint class, "global" is shared by all classes.
+# Conservative starting budgets used when the `rate_limits` option is set, not limits published
+# by the exchange; the limiter adapts them to 429 responses.
+DEFAULT_RATE_LIMITS = {
+    "global": (50, 100),
+    "order": (20, 40),
+    "cancel": (20, 40),
+    "account": (10, 20),
+    "market_data": (20, 40),
+}
+
+# lower value is served first when the global budget is exhausted
+RATE_LIMIT_PRIORITIES = {
+    "cancel": 0,
+    "order": 1,
+    "account": 2,
+    "market_data": 3,
+}
+
+# maximum number of events queued for a websocket subscription
+SUBSCRIPTION_QUEUE_SIZE = 1000
+
+# events whose queued value can be replaced by a newer one with the "conflate" overflow policy
+CONFLATED_EVENTS = ("depth", "quote", "lastPrice")
+
+# suggested params are refreshed when fewer rounds than this are left before their last valid round
+SUGGESTED_PARAMS_MARGIN = 100
+
+# shortest expected Algorand round duration in seconds, the current round is estimated with it
+ALGORAND_MIN_ROUND_TIME = 2.0
+
+# seconds the token manager chains and the codex app id are reused by deposits
+DEPOSIT_CONFIG_TTL = 3600
+
 BALANCE_DECODE_FORMAT = {
     "priceCoin_locked": {
         "type": "uint",
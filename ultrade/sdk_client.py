@@ -1,9 +1,29 @@
 import aiohttp
 from algosdk.v2client.algod import AlgodClient
-from .socket_client import SocketClient
+from .socket_client import SocketClient, EVENT_STREAMS, RESYNC_EVENT
+from .utils.event_queue import EventQueueClosed
 from .utils.algod_service import AlgodService
+from .utils.async_algod import AsyncAlgodClient
+from .utils.evm import EvmProviders
+from .utils.pair_registry import PairRegistry
+from .utils.singleflight import RequestCoalescer
+from .utils.rate_limiter import RateLimiter, RateLimitException, parse_retry_after
+from .utils.retry import RetryPolicy
+from .utils.metrics import MetricsRegistry, create_trace_config
+from .utils.signing import sign_order, sign_orders, create_signing_executor, signing_workers
+from .utils.json_codec import get_json_codec
+from .utils.order_book import LocalOrderBook
+from .utils.recorder import EventRecorder
 from .utils.utils import get_wh_id_by_address, toJson
-from .constants import NETWORK_CONSTANTS, DEFAULT_LOGIN_MESSAGE
+from .constants import (
+    NETWORK_CONSTANTS,
+    DEFAULT_LOGIN_MESSAGE,
+    DEFAULT_HTTP_OPTIONS,
+    SUBSCRIPTION_QUEUE_SIZE,
+    DEFAULT_RATE_LIMITS,
+    RATE_LIMIT_PRIORITIES,
+    DEPOSIT_CONFIG_TTL,
+)
 from . import socket_options
 from .types import (
     ClientOptions,
@@ -20,16 +40,24 @@ from .types import (
     TradingPair,
     PairInfo,
     AuthMethod,
+    StreamEvent,
 )
 from .signers.main import Signer
-from .utils.encode import get_order_bytes, make_withdraw_msg
-from typing import Literal, Optional, List, Dict
+from .signers.algorand import AlgorandSigner, MAX_GROUP_DEPOSITS
+from .utils.encode import make_withdraw_msg
+from concurrent.futures import Executor
+from typing import Literal, Optional, List, Dict, Tuple, AsyncIterator, Awaitable, Callable
+from collections import deque
+import asyncio
 import time
 from urllib.parse import urlparse, urlunparse
 import random
 
 OPTIONS = socket_options
 
+# genesis network name by algod node URL, shared by all clients of the process
+_GENESIS_NETWORKS: Dict[str, str] = {}
+
 
 class CompanyNotEnabledException(Exception):
     pass
@@ -55,6 +83,212 @@ class Client:
         self._trading_key_data: Optional[Dict[str, str]] = None
         self._trading_key_signer: Optional[Signer] = None
         self._company_id = self.__options.get("company_id", 1)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._pairs = PairRegistry(
+            self.get_pair_list,
+            self.get_pair_info,
+            ttl=self.__options.get("pair_cache_ttl", 300),
+        )
+        self._signing_executor: Optional[Executor] = None
+        self._evm = EvmProviders()
+        self._coalescer = RequestCoalescer()
+        # kept apart from the market data coalescer, so they don't show up in `coalescing_stats`
+        self._snapshot_requests = RequestCoalescer()
+        self._deposit_config_cache = RequestCoalescer()
+        # client side limits are opt-in, `{}` enables them with DEFAULT_RATE_LIMITS
+        rate_limits = self.__options.get("rate_limits")
+        self._rate_limiter: Optional[RateLimiter] = (
+            None
+            if rate_limits is None
+            else RateLimiter({**DEFAULT_RATE_LIMITS, **rate_limits}, RATE_LIMIT_PRIORITIES)
+        )
+        retry_policy = self.__options.get("retry_policy", {})
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_attempts=1, deadline=None)
+        elif isinstance(retry_policy, dict):
+            retry_policy = RetryPolicy(**retry_policy)
+        self._retry_policy: RetryPolicy = retry_policy
+        instrumentation = self.__options.get("instrumentation")
+        if instrumentation is True:
+            instrumentation = MetricsRegistry()
+        elif callable(instrumentation) and not isinstance(instrumentation, MetricsRegistry):
+            instrumentation = MetricsRegistry(listeners=[instrumentation])
+        self._metrics: Optional[MetricsRegistry] = instrumentation or None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the HTTP sessions, including those of the EVM RPCs, and the websocket connection owned by the client.
+        The client can still be used afterwards, a new session is opened on the next request.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._signing_executor is not None:
+            if not isinstance(self.__options.get("signing_pool"), Executor):
+                self._signing_executor.shutdown(wait=False)
+            self._signing_executor = None
+        await self._evm.close()
+        self.stop_recording()
+        await self._websocket_client.close()
+
+    def start_recording(self, path: str) -> EventRecorder:
+        """
+        Appends every websocket event received by the subscriptions of the client to a binary log.
+        The log can be replayed with `ultrade.utils.recorder.EventReplayer`.
+
+        Args:
+            path (str): Path of the log file.
+        """
+        self.stop_recording()
+        recorder = EventRecorder(path)
+        self._websocket_client.set_recorder(recorder)
+        return recorder
+
+    def stop_recording(self):
+        recorder = self._websocket_client.recorder
+        if recorder is not None:
+            self._websocket_client.set_recorder(None)
+            recorder.close()
+
+    def __get_signing_executor(self) -> Executor:
+        if self._signing_executor is None:
+            signing_pool = self.__options.get("signing_pool", "thread")
+            if isinstance(signing_pool, Executor):
+                self._signing_executor = signing_pool
+            else:
+                self._signing_executor = create_signing_executor(
+                    signing_pool, self.__options.get("signing_workers")
+                )
+        return self._signing_executor
+
+    def __get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            http_options = {**DEFAULT_HTTP_OPTIONS, **self.__options.get("http_options", {})}
+            connector = aiohttp.TCPConnector(
+                limit=http_options["connection_limit"],
+                limit_per_host=http_options["connection_limit_per_host"],
+                ttl_dns_cache=http_options["dns_cache_ttl"],
+                keepalive_timeout=http_options["keepalive_timeout"],
+            )
+            trace_configs = [create_trace_config()] if self._metrics is not None else None
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=trace_configs,
+                json_serialize=self._json.dumps,
+            )
+        return self._session
+
+    async def __request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        raise_for_status: bool = False,
+        as_text: bool = False,
+        content_type: Optional[str] = "application/json",
+        coalesce: bool = False,
+        endpoint_class: str = "account",
+        idempotent: Optional[bool] = None,
+        **kwargs,
+    ):
+        async def send():
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(endpoint_class)
+            session = self.__get_session()
+            trace = self._metrics.start(method, url) if self._metrics is not None else None
+            try:
+                async with session.request(
+                    method, url, headers=headers, trace_request_ctx=trace, **kwargs
+                ) as resp:
+                    if trace is not None:
+                        trace.status = resp.status
+                    retry_after = resp.headers.get("Retry-After")
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.on_response(endpoint_class, resp.status, retry_after)
+                    if resp.status == 429:
+                        raise RateLimitException(await resp.text(), parse_retry_after(retry_after))
+                    if raise_for_status or (idempotent and resp.status in self._retry_policy.retry_statuses):
+                        resp.raise_for_status()
+                    if as_text:
+                        return await resp.text()
+                    return await resp.json(loads=self._json.loads, content_type=content_type)
+            except BaseException as error:
+                if trace is not None:
+                    trace.error = error
+                raise
+            finally:
+                if trace is not None:
+                    self._metrics.finish(trace)
+
+        if idempotent is None:
+            idempotent = method == "GET"
+
+        async def send_with_retry():
+            return await self._retry_policy.run(send, idempotent)
+
+        if not coalesce:
+            return await send_with_retry()
+
+        params = kwargs.get("params") or {}
+        key = (method, url, tuple(sorted(params.items())), tuple(sorted(headers.items())))
+        ttl = self.__options.get("market_data_ttl", 0)
+        return await self._coalescer.run(key, send_with_retry, ttl)
+
+    @property
+    def coalescing_stats(self) -> Dict[str, float]:
+        """
+        Returns counters of the market data request coalescing: total requests, requests served from the
+        micro-cache, requests that joined an identical in-flight request and the corresponding ratios.
+        """
+        return self._coalescer.stats
+
+    @property
+    def websocket_stats(self) -> Dict[str, any]:
+        """
+        Returns the number of websocket connections, the pairs, streams, message count and
+        message rate of each connection, and the queue counters of every subscription.
+        """
+        return self._websocket_client.stats
+
+    @property
+    def rate_limit_stats(self) -> Dict[str, float]:
+        """
+        Returns counters of the client side rate limiter: throttling responses received, total time spent
+        waiting for a budget, requests queued right now and the current rate of every endpoint class.
+        """
+        if self._rate_limiter is None:
+            return {}
+        return self._rate_limiter.stats
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]:
+        """
+        Returns the registry of per-endpoint request metrics, or None if the `instrumentation` option is not set.
+        Use `client.metrics.snapshot()` to get p50/p99/p999 timings, statuses, errors and payload sizes.
+        """
+        return self._metrics
+
+    @property
+    def retry_stats(self) -> Dict[str, float]:
+        """
+        Returns counters of the retry policy: calls, attempts, retries, calls that failed after the last
+        attempt, average attempts per call and the average and maximum elapsed time of a call in seconds.
+        """
+        return self._retry_policy.stats
+
+    @property
+    def algod_stats(self) -> Dict[str, any]:
+        """
+        Returns counters of the Algorand node usage: requests sent, requests saved by the suggested params
+        and application state caches, and the transactions tracked, confirmed, rejected and expired.
+        """
+        return self._client.stats
 
     def __configure(self):
         network_constants = NETWORK_CONSTANTS.get(self.network)
@@ -92,12 +326,68 @@ class Client:
         self.__algod_client = self.__options.get(
             "algo_sdk_client", AlgodClient("", self.__algod_node)
         )
-        if self.__algod_client.genesis().get("network") != self.network:
+        self._network_verified = not self.__options.get("verify_network", True)
+        self._json = get_json_codec(self.__options.get("json_codec"))
+        # algod requests of deposits share the pooled HTTP session of the client
+        self._algod = AsyncAlgodClient.from_algod_client(
+            self.__algod_client, self.__get_session, self._json
+        )
+        self._client = AlgodService(self.__algod_client, async_client=self._algod)
+        snapshot_fetchers = None
+        if self.__options.get("resync_on_reconnect", True):
+            snapshot_fetchers = {
+                OPTIONS.DEPTH: self.__fetch_depth_snapshot,
+                OPTIONS.ORDERS: self.get_orders_with_trades,
+                OPTIONS.CODEX_BALANCES: self.__fetch_balances_snapshot,
+            }
+        self._websocket_client = SocketClient(
+            self.__websocket_url,
+            json=self._json,
+            max_connections=self.__options.get("socket_connections", 1),
+            snapshot_fetchers=snapshot_fetchers,
+        )
+
+    async def __fetch_depth_snapshot(self, symbol: str, depth: int = 100) -> Depth:
+        # bypasses the market data micro-cache, resyncs need the latest snapshot
+        url = f"{self.__api_url}/market/depth?symbol={symbol}&depth={depth}"
+        return await self.__request(
+            "GET", url, self.__no_auth_headers, endpoint_class="market_data"
+        )
+
+    async def __fetch_balances_snapshot(self, symbol: str) -> List[Balance]:
+        # balances are not per pair, the resyncs of all pairs share one request
+        return await self._snapshot_requests.run(("balances",), self.get_balances)
+
+    async def verify_network(self):
+        """
+        Checks that the Algod client is connected to the network the client was created for.
+        The check runs once per client, the genesis of every node URL is requested only once per process.
+        It is done automatically before Algorand operations, unless the `verify_network` option is False.
+
+        Raises:
+            ValueError: If the network of the AlgodClient differs from the network of the client.
+        """
+        if self._network_verified:
+            return
+
+        node_url = getattr(self.__algod_client, "algod_address", None)
+        network = _GENESIS_NETWORKS.get(node_url) if node_url else None
+        if network is None:
+            if self._algod is not None:
+                genesis = await self._algod.genesis()
+            else:
+                # an AlgodClient without a node URL can only be called in the executor
+                loop = asyncio.get_running_loop()
+                genesis = await loop.run_in_executor(None, self.__algod_client.genesis)
+            network = genesis.get("network")
+            if node_url:
+                _GENESIS_NETWORKS[node_url] = network
+
+        if network != self.network:
             raise ValueError(
                 "Network of the AlgodClient should be the same as the network specified in the options"
             )
-        self._client = AlgodService(self.__algod_client)
-        self._websocket_client = SocketClient(self.__websocket_url)
+        self._network_verified = True
 
     def __validate_signer(self, signer: Signer):
         if not isinstance(signer, Signer):
@@ -105,17 +395,37 @@ class Client:
 
     async def __fetch_tmc_configuration(self):
         url = f"{self.__api_url}/market/chains"
-        async with aiohttp.ClientSession(headers=self.__no_auth_headers) as session:
-            async with session.get(url) as resp:
-                data = await resp.json()
-                return data
+        return await self.__request(
+            "GET", url, self.__no_auth_headers, endpoint_class="market_data"
+        )
 
     async def __get_codex_app_id(self):
         url = f"{self.__api_url}/market/codex-app-id"
-        async with aiohttp.ClientSession(headers=self.__no_auth_headers) as session:
-            async with session.get(url) as resp:
-                app_id = await resp.text()
-                return int(app_id)
+        app_id = await self.__request(
+            "GET", url, self.__no_auth_headers, as_text=True, endpoint_class="market_data"
+        )
+        return int(app_id)
+
+    async def __get_deposit_config(self, rpc_url=None) -> dict:
+        async def fetch():
+            return await asyncio.gather(
+                self.__fetch_tmc_configuration(), self.__get_codex_app_id()
+            )
+
+        # the chains and the codex app rarely change, they are shared by the deposits of DEPOSIT_CONFIG_TTL seconds
+        tmc_configs, codex_app_id = await self._deposit_config_cache.run(
+            self.__api_url, fetch, DEPOSIT_CONFIG_TTL
+        )
+        return {
+            "rpc_url": rpc_url,
+            "algod_client": self.__algod_client,
+            "algod_service": self._client,
+            "evm_providers": self._evm,
+            "deposit_gas_limit": self.__options.get("deposit_gas_limit"),
+            "tmc_configs": tmc_configs,
+            "login_user": self._login_user,
+            "codex_app_id": codex_app_id,
+        }
 
     @property
     def __auth_headers(self):
@@ -205,19 +515,29 @@ class Client:
         }
         if self.__private_api_key:
             headers["X-API-Key"] = self.__private_api_key
-        async with aiohttp.ClientSession(headers=headers) as session:
-            url = f"{self.__api_url}/wallet/signin"
-            async with session.put(
-                url,
-                json={"data": data, "message": message_hex, "signature": signature_hex},
-            ) as resp:
-                response = await resp.text()
-                if "error" in response:
-                    raise Exception(response["error"])
-                if response:
-                    self._token = response
-                    self._login_user = signer
-                    self.__disconnect_trading_key()
+        url = f"{self.__api_url}/wallet/signin"
+        response = await self.__request(
+            "PUT",
+            url,
+            headers,
+            as_text=True,
+            json={"data": data, "message": message_hex, "signature": signature_hex},
+        )
+        if "error" in response:
+            raise Exception(response["error"])
+        if response:
+            self._token = response
+            self._login_user = signer
+            self.__disconnect_trading_key()
+
+    def invalidate_pair_cache(self, pair: Optional[int | str] = None):
+        """
+        Drops cached pair metadata used for building orders.
+
+        Args:
+            pair (int | str, optional): The id or symbol of the pair to drop. Drops all pairs if omitted.
+        """
+        self._pairs.invalidate(pair)
 
     def is_logged_in(self):
         """
@@ -230,7 +550,7 @@ class Client:
         if not self.is_logged_in():
             raise Exception("You need to login or specify trading key first")
 
-    async def _build_order_payload(
+    async def _prepare_order_data(
         self,
         pair_id: int,
         order_side: str,
@@ -238,7 +558,7 @@ class Client:
         amount: int,
         price: int,
         seconds_until_expiration: int
-    ):
+    ) -> Tuple[dict, Signer]:
         self.__check_is_logged_in()
 
         if order_side not in ["B", "S"]:
@@ -257,7 +577,7 @@ class Client:
             login_chain_id = self._login_user.wormhole_chain_id
             signer = self._login_user
 
-        pair = await self.get_pair_info(pair_id)
+        pair = await self._pairs.get(pair_id)
         if not pair:
             raise Exception(f"Pair with id {pair_id} not found")
 
@@ -283,19 +603,55 @@ class Client:
             expiration_date_in_seconds=expiration_date_in_seconds
         )
 
-        data = order.data
-        encoding = "hex"
-        message_bytes = get_order_bytes(data)
-        message = message_bytes.hex()
-        signature = signer.sign_data(message_bytes)
-        signature_hex = signature.hex() if isinstance(signature, bytes) else signature
+        return order.data, signer
 
-        return {
-            "data": data,
-            "encoding": encoding,
-            "message": message,
-            "signature": signature_hex,
-        }
+    async def _build_order_payload(
+        self,
+        pair_id: int,
+        order_side: str,
+        order_type: str,
+        amount: int,
+        price: int,
+        seconds_until_expiration: int
+    ):
+        data, signer = await self._prepare_order_data(
+            pair_id, order_side, order_type, amount, price, seconds_until_expiration
+        )
+        return sign_order(signer, data)
+
+    async def _build_bulk_order_payloads(self, orders: List[dict]) -> List[dict]:
+        prepared = await asyncio.gather(
+            *[
+                self._prepare_order_data(
+                    order["pair_id"],
+                    order["order_side"],
+                    order["order_type"],
+                    order["amount"],
+                    order["price"],
+                    order.get("seconds_until_expiration", 3660),
+                )
+                for order in orders
+            ]
+        )
+        if not prepared:
+            return []
+
+        signer = prepared[0][1]
+        order_data = [data for data, _ in prepared]
+        executor = self.__get_signing_executor()
+        # one chunk per worker, a custom executor is assumed to have `signing_workers` workers
+        workers = signing_workers(self.__options.get("signing_workers"))
+        chunk_size = -(-len(order_data) // workers)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor, sign_orders, signer, order_data[i: i + chunk_size]
+                )
+                for i in range(0, len(order_data), chunk_size)
+            ]
+        )
+        return [payload for chunk in chunks for payload in chunk]
 
     async def create_order(
         self,
@@ -328,16 +684,18 @@ class Client:
             pair_id, order_side, order_type, amount, price, seconds_until_expiration
         )
         url = f"{self.__api_url}/market/order"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.post(url, json=payload) as resp:
-                response = await resp.json()
-                if "error" in response:
-                    raise Exception(response)
-                return response
+        response = await self.__request(
+            "POST", url, self.__auth_headers, endpoint_class="order", json=payload
+        )
+        if "error" in response:
+            raise Exception(response)
+        return response
 
     async def create_bulk_orders(self, orders: list[dict]) -> list[dict]:
         """
         Creates multiple orders in a single batch.
+        Orders are signed on the pool configured by the `signing_pool` option, so the event loop stays responsive.
+        The signed orders keep the order of the input list.
 
         Args:
             orders (list[dict]): List of order dicts with keys:
@@ -347,24 +705,17 @@ class Client:
             list[dict]: List of responses from the server.
         """
         url = f"{self.__api_url}/market/orders"
-        signed_order_list = []
-        for order in orders:
-            signed_order = await self._build_order_payload(
-                order["pair_id"],
-                order["order_side"],
-                order["order_type"],
-                order["amount"],
-                order["price"],
-                order.get("seconds_until_expiration", 3660),
-                )
-            signed_order_list.append(signed_order)
-
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.post(url, json={ "arrayData": signed_order_list }) as resp:
-                response = await resp.json()
-                if "error" in response:
-                    raise Exception(response)
-            return response
+        signed_order_list = await self._build_bulk_order_payloads(orders)
+        response = await self.__request(
+            "POST",
+            url,
+            self.__auth_headers,
+            endpoint_class="order",
+            json={"arrayData": signed_order_list},
+        )
+        if "error" in response:
+            raise Exception(response)
+        return response
 
     def _build_cancel_order_payload(self, data):
         auth_method = self._check_auth_method()
@@ -402,14 +753,19 @@ class Client:
         body = self._build_cancel_order_payload({ "orderId": order_id })
         url = f"{self.__api_url}/market/order"
 
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.delete(url, json=body) as resp:
-                response = await resp.json(content_type=None)
-                if response is None:
-                    return
-                if "error" in response:
-                    raise Exception(response)
-                return response
+        response = await self.__request(
+            "DELETE",
+            url,
+            self.__auth_headers,
+            content_type=None,
+            endpoint_class="cancel",
+            json=body,
+        )
+        if response is None:
+            return
+        if "error" in response:
+            raise Exception(response)
+        return response
 
     async def cancel_bulk_orders(self, order_ids: list[int], pair_id: str) -> list:
         """
@@ -425,14 +781,19 @@ class Client:
         body = self._build_cancel_order_payload({ "orderIds": order_ids, "pairId": pair_id })
         url = f"{self.__api_url}/market/orders"
 
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.delete(url, json=body) as resp:
-                response = await resp.json(content_type=None)
-                if response is None:
-                    return
-                if "error" in response:
-                    raise Exception(response)
-                return response
+        response = await self.__request(
+            "DELETE",
+            url,
+            self.__auth_headers,
+            content_type=None,
+            endpoint_class="cancel",
+            json=body,
+        )
+        if response is None:
+            return
+        if "error" in response:
+            raise Exception(response)
+        return response
 
     async def get_balances(self) -> List[Balance]:
         """
@@ -451,10 +812,7 @@ class Client:
         """
         self.__check_is_logged_in()
         url = f"{self.__api_url}/market/balances"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.get(url) as resp:
-                data = await resp.json()
-                return data
+        return await self.__request("GET", url, self.__auth_headers)
 
     async def get_orders_with_trades(
         self, symbol=None, status=OrderStatus.OPEN_ORDER.value
@@ -482,10 +840,7 @@ class Client:
         url = f"{self.__api_url}/market/orders-with-trades?address={login_address}&status={status_value}"
         if symbol:
             url += f"&symbol={symbol}"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.get(url) as resp:
-                data = await resp.json()
-                return data
+        return await self.__request("GET", url, self.__auth_headers)
 
     async def get_wallet_transactions(
         self,
@@ -521,16 +876,80 @@ class Client:
         }
         query_params = {k: v for k, v in query_params.items() if v is not None}
         url = f"{self.__api_url}/wallet/transactions"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.get(url, params=query_params) as resp:
-                data = await resp.json()
-                await session.close()
+        data = await self.__request(
+            "GET", url, self.__auth_headers, params=query_params
+        )
 
         for transaction in data:
             transaction.pop("vaa_message", None)
 
         return data
 
+    def iter_wallet_transactions(
+        self,
+        startTime: Optional[int] = None,
+        endTime: Optional[int] = None,
+        limit: int = 100,
+        prefetch: int = 2,
+    ) -> AsyncIterator[WalletTransactions]:
+        """
+        Iterates over all transactions (deposit/witdraw) of the logged user, page by page.
+        The next `prefetch` pages are requested concurrently while the current page is consumed.
+
+        Args:
+            startTime (int, optional): The start time for filtering transactions.
+            endTime (int, optional): The end time for filtering transactions.
+            limit (int, optional): The number of transactions per page. Defaults to 100.
+            prefetch (int, optional): The number of pages requested ahead. Defaults to 2.
+
+        Example:
+            async for transaction in client.iter_wallet_transactions(limit=50):
+                print(transaction)
+        """
+        self.__check_is_logged_in()
+
+        async def fetch_page(page: int):
+            return await self.get_wallet_transactions(startTime, endTime, page, limit)
+
+        return self.__iter_pages(fetch_page, limit, prefetch)
+
+    async def __iter_pages(
+        self,
+        fetch_page: Callable[[int], Awaitable[list]],
+        limit: int,
+        prefetch: int,
+    ) -> AsyncIterator[dict]:
+        if limit < 1:
+            raise ValueError("limit should be a positive integer")
+
+        next_page = 1
+        pending = deque()
+
+        def schedule():
+            nonlocal next_page
+            pending.append(asyncio.ensure_future(fetch_page(next_page)))
+            next_page += 1
+
+        try:
+            for _ in range(max(prefetch, 0) + 1):
+                schedule()
+
+            while pending:
+                items = await pending.popleft()
+                if not isinstance(items, list):
+                    raise Exception(items)
+                if len(items) < limit:
+                    for item in items:
+                        yield item
+                    return
+                schedule()
+                for item in items:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def withdraw(
         self,
         amount: int,
@@ -591,18 +1010,17 @@ class Client:
         signature = signer.sign_data(message_bytes)
         signature_hex = signature.hex() if isinstance(signature, bytes) else signature
         url = f"{self.__api_url}/wallet/withdraw"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.post(
-                url,
-                json={
-                    "encoding": "hex",
-                    "message": message,
-                    "signature": signature_hex,
-                    "destinationAddress": recipient,
-                },
-            ) as resp:
-                response = await resp.json()
-                return response
+        return await self.__request(
+            "POST",
+            url,
+            self.__auth_headers,
+            json={
+                "encoding": "hex",
+                "message": message,
+                "signature": signature_hex,
+                "destinationAddress": recipient,
+            },
+        )
 
     async def deposit(
         self, signer: Signer, amount: int, token_address: str | int, rpc_url=None
@@ -639,20 +1057,53 @@ class Client:
         if auth_method == AuthMethod.TRADING_KEY:
             raise Exception("Trading key can't deposit, use set_login_user method")
         self.__validate_signer(signer)
+        await self.verify_network()
+
+        config = await self.__get_deposit_config(rpc_url)
+        return await signer._deposit(amount, token_address, config)
 
-        tmc_configs = await self.__fetch_tmc_configuration()
-        codex_app_id = await self.__get_codex_app_id()
+    async def deposit_batch(
+        self, signer: AlgorandSigner, deposits: List[Tuple[str | int, int]]
+    ) -> str:
+        """
+        Deposit several Algorand assets into the Token Manager Contract with one atomic group.
 
-        config = {}
-        config["rpc_url"] = rpc_url
-        config["algod_client"] = self.__algod_client
-        config["tmc_configs"] = tmc_configs
-        config["login_user"] = self._login_user
-        config["codex_app_id"] = codex_app_id
+        Every deposit adds an asset transfer and a `depositToCodex` app call to the group, so up to 8
+        deposits fit in one group. The group is built with one set of suggested params, signed in one pass
+        and confirmed once: either all deposits succeed or none does.
 
-        return await signer._deposit(amount, token_address, config)
+        Args:
+            signer (AlgorandSigner): The signer of the Algorand wallet the assets are deposited from.
+            deposits (List[Tuple[str | int, int]]): (asset id, amount) pairs, asset id 0 is ALGO, one per asset.
+
+        Returns:
+            str: The transaction ID of the first transaction of the group.
 
-    async def subscribe(self, subscribe_options, callback):
+        Raises:
+            ValueError: If the signer is not an Algorand signer, there are no or more than 8 deposits,
+                or an asset is deposited more than once.
+        """
+        self.__check_is_logged_in()
+        auth_method = self._check_auth_method()
+        if auth_method == AuthMethod.TRADING_KEY:
+            raise Exception("Trading key can't deposit, use set_login_user method")
+        if not isinstance(signer, AlgorandSigner):
+            raise ValueError("parameter signer should be instance of AlgorandSigner")
+        if not deposits or len(deposits) > MAX_GROUP_DEPOSITS:
+            raise ValueError(f"deposits should hold 1 to {MAX_GROUP_DEPOSITS} (asset id, amount) pairs")
+        await self.verify_network()
+
+        config = await self.__get_deposit_config()
+        return await signer._deposit_group(deposits, config)
+
+    async def subscribe(
+        self,
+        subscribe_options,
+        callback,
+        inline: bool = False,
+        queue_size: int = SUBSCRIPTION_QUEUE_SIZE,
+        overflow: Literal["block", "drop_oldest", "conflate"] = "block",
+    ):
         """
         Subscribe the client to websocket streams for the specified options.
 
@@ -663,16 +1114,65 @@ class Client:
                     'streams': [OPTIONS.ORDERS, OPTIONS.TRADES],
                     'options': {"address": "your wallet address here"}
                 }
-            callback (function): A synchronous function that will be called on any occurred websocket event and should
-            accept 'event' and 'args' parameters.
+            callback (function): A function or coroutine function that will be called on any occurred websocket event
+            and should accept 'event' and 'args' parameters. Synchronous functions run in a thread pool, prefer a coroutine
+            function or inline=True for high event rates.
+            inline (bool, optional): Call a synchronous callback directly on the event loop instead of the thread pool.
+            Use it only for callbacks that never block. Defaults to False.
+            queue_size (int, optional): Maximum number of events waiting for the callback. Defaults to 1000.
+            overflow (str, optional): What happens when the queue is full: "block" keeps up to `queue_size`
+            more events waiting for the callback and drops the next ones, "drop_oldest" discards the oldest
+            event and "conflate" keeps only the latest depth, quote and last price per pair. Defaults to "block".
 
         Returns:
             str: The ID of the established connection.
         """
-        self.__check_is_logged_in()
+        return await self.__subscribe(subscribe_options, callback, inline, queue_size, overflow)
 
-        def socket_callback(event, args):
-            return callback(event, args)
+    async def stream(
+        self,
+        symbol: str,
+        streams: List[int],
+        options: Optional[Dict[str, any]] = None,
+        queue_size: int = SUBSCRIPTION_QUEUE_SIZE,
+        overflow: Literal["block", "drop_oldest", "conflate"] = "block",
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Subscribes to websocket streams and yields their events on the event loop.
+
+        Events wait in a queue of `queue_size` events until they are consumed. The connection keeps
+        receiving meanwhile: with the "block" policy up to `queue_size` more events wait for room in the
+        full queue and the next ones are dropped, the other policies drop or conflate queued events instead.
+        Leaving the loop unsubscribes the streams, and the iteration ends when the client is closed.
+
+        Args:
+            symbol (str): The symbol representing the trading pair, e.g., 'algo_usdt'.
+            streams (List[int]): The streams to subscribe to, e.g. [OPTIONS.DEPTH, OPTIONS.TRADES].
+            options (dict, optional): Additional subscribe options, e.g. {"companyId": 1}.
+            queue_size (int, optional): Maximum number of events waiting to be consumed. Defaults to 1000.
+            overflow (str, optional): "block", "drop_oldest" or "conflate". Defaults to "block".
+
+        Example:
+            async for event in client.stream("algo_usdc", [OPTIONS.DEPTH]):
+                print(event.event, event.data)
+        """
+        subscribe_options = {"symbol": symbol, "streams": list(streams), "options": dict(options or {})}
+        sub_id = await self.__subscribe(subscribe_options, None, False, queue_size, overflow)
+        subscription = self._websocket_client.get_subscription(sub_id)
+        try:
+            while True:
+                try:
+                    event, data = await subscription.get()
+                except EventQueueClosed:
+                    return
+                stream = data["stream"] if event == RESYNC_EVENT else EVENT_STREAMS.get(event)
+                yield StreamEvent(event, stream, data)
+        finally:
+            if not subscription.closed:
+                await self._websocket_client.unsubscribe(sub_id)
+
+    async def __subscribe(self, subscribe_options, callback, inline, queue_size, overflow):
+        self.__check_is_logged_in()
 
         if subscribe_options.get("address") is None:
             subscribe_options["address"] = (
@@ -701,7 +1201,9 @@ class Client:
         if OPTIONS.ERROR not in subscribe_options["streams"]:
             subscribe_options["streams"].append(OPTIONS.ERROR)
 
-        return await self._websocket_client.subscribe(subscribe_options, socket_callback)
+        return await self._websocket_client.subscribe(
+            subscribe_options, callback, inline, queue_size, overflow
+        )
 
     async def unsubscribe(self, connection_id):
         """
@@ -730,14 +1232,11 @@ class Client:
         Raises:
             aiohttp.ClientError: If an error occurs during the HTTP request.
         """
-        session = aiohttp.ClientSession(headers=self.__auth_headers)
         query = "" if self._company_id is None else f"?companyId={self._company_id}"
         url = f"{self.__api_url}/market/markets{query}"
-        async with session.get(url) as resp:
-            data = await resp.json()
-            await session.close()
-
-            return data
+        return await self.__request(
+            "GET", url, self.__auth_headers, endpoint_class="market_data"
+        )
 
     async def get_pair_info(self, symbol: str) -> PairInfo:
         """
@@ -749,15 +1248,14 @@ class Client:
         Returns:
             dict: PairInfo.
         """
-
-        session = aiohttp.ClientSession(headers=self.__no_auth_headers)
         url = f"{self.__api_url}/market/market?symbol={symbol}"
-        async with session.get(url) as resp:
-            resp.raise_for_status()
-            data = await resp.json()
-
-            await session.close()
-        return data
+        return await self.__request(
+            "GET",
+            url,
+            self.__no_auth_headers,
+            raise_for_status=True,
+            endpoint_class="market_data",
+        )
 
     async def ping(self):
         """
@@ -766,14 +1264,15 @@ class Client:
         Returns:
             int: The round-trip latency in milliseconds.
         """
-        session = aiohttp.ClientSession(headers=self.__no_auth_headers)
         url = f"{self.__api_url}/system/time"
-        async with session.get(url) as resp:
-            resp.raise_for_status()
-            data = await resp.json()
-
-            await session.close()
-            return round(time.time() * 1000) - data["currentTime"]
+        data = await self.__request(
+            "GET",
+            url,
+            self.__no_auth_headers,
+            raise_for_status=True,
+            endpoint_class="market_data",
+        )
+        return round(time.time() * 1000) - data["currentTime"]
 
     async def get_price(self, symbol: str) -> Price:
         """
@@ -785,12 +1284,14 @@ class Client:
         Returns:
             dict: A dictionary containing price information like the current ask, bid, and last trade price.
         """
-        session = aiohttp.ClientSession(headers=self.__no_auth_headers)
         url = f"{self.__api_url}/market/price?symbol={symbol}"
-        async with session.get(url) as resp:
-            data = await resp.json()
-            await session.close()
-            return data
+        return await self.__request(
+            "GET",
+            url,
+            self.__no_auth_headers,
+            coalesce=True,
+            endpoint_class="market_data",
+        )
 
     async def get_depth(self, symbol: str, depth: int = 100) -> Depth:
         """
@@ -803,12 +1304,51 @@ class Client:
         Returns:
             dict: A dictionary representing the order book with lists of bids and asks.
         """
-        session = aiohttp.ClientSession(headers=self.__no_auth_headers)
         url = f"{self.__api_url}/market/depth?symbol={symbol}&depth={depth}"
-        async with session.get(url) as resp:
-            data = await resp.json()
-            await session.close()
-            return data
+        return await self.__request(
+            "GET",
+            url,
+            self.__no_auth_headers,
+            coalesce=True,
+            endpoint_class="market_data",
+        )
+
+    async def create_order_book(self, symbol: str, depth: int = 100) -> LocalOrderBook:
+        """
+        Creates a local order book of a trading pair, bootstrapped from a depth snapshot and kept
+        up to date by the DEPTH stream. Gaps in the stream are detected and trigger a resync.
+
+        Args:
+            symbol (str): The symbol representing the trading pair, e.g., 'algo_usdt'.
+            depth (int, optional): The depth of the snapshots. Defaults to 100.
+
+        Returns:
+            LocalOrderBook: The synced order book, call `await book.close()` to stop following the stream.
+        """
+        async def fetch_snapshot():
+            return await self.__fetch_depth_snapshot(symbol, depth)
+
+        def socket_callback(event, args):
+            if event == "depth":
+                book.on_depth(args)
+            elif event == RESYNC_EVENT and "snapshot" in args:
+                book.on_snapshot(args["snapshot"])
+
+        async def unsubscribe():
+            await self._websocket_client.unsubscribe(subscription_id)
+
+        book = LocalOrderBook(symbol, fetch_snapshot, on_close=unsubscribe)
+        subscription_id = await self._websocket_client.subscribe(
+            {"symbol": symbol, "streams": [OPTIONS.DEPTH], "options": {}},
+            socket_callback,
+            inline=True,
+        )
+        try:
+            await book.resync()
+        except BaseException:
+            await book.close()
+            raise
+        return book
 
     async def get_symbols(self, mask) -> List[Symbol]:
         """
@@ -820,12 +1360,10 @@ class Client:
         Returns:
             list: A list of dictionaries, each containing a 'pairKey' that matches the provided mask.
         """
-        session = aiohttp.ClientSession(headers=self.__no_auth_headers)
         url = f"{self.__api_url}/market/symbols?mask={mask}"
-        async with session.get(url) as resp:
-            data = await resp.json()
-            await session.close()
-            return data
+        return await self.__request(
+            "GET", url, self.__no_auth_headers, endpoint_class="market_data"
+        )
 
     async def get_last_trades(self, symbol: str) -> List[LastTrade]:
         """
@@ -838,12 +1376,14 @@ class Client:
             LastTrade
             list: A list of the most recent trades for the specified trading pair.
         """
-        session = aiohttp.ClientSession(headers=self.__no_auth_headers)
         url = f"{self.__api_url}/market/last-trades?symbol={symbol}"
-        async with session.get(url) as resp:
-            data = await resp.json()
-            await session.close()
-            return data
+        return await self.__request(
+            "GET",
+            url,
+            self.__no_auth_headers,
+            coalesce=True,
+            endpoint_class="market_data",
+        )
 
     async def get_order_by_id(self, order_id: int) -> OrderWithTrade:
         """
@@ -856,12 +1396,8 @@ class Client:
             dict: A dictionary containing detailed information about the specified order.
         """
         self.__check_is_logged_in()
-        session = aiohttp.ClientSession(headers=self.__auth_headers)
         url = f"{self.__api_url}/market/order/{order_id}"
-        async with session.get(url) as resp:
-            data = await resp.json()
-            await session.close()
-            return data
+        return await self.__request("GET", url, self.__auth_headers)
 
     @staticmethod
     async def get_company_by_domain(self, domain: str) -> int:
@@ -886,16 +1422,13 @@ class Client:
             headers["X-API-Key"] = self.__private_api_key
 
         url = f"{self.__api_url}/market/settings"
-        session = aiohttp.ClientSession()
-        async with session.get(url, headers=headers) as resp:
-            data = await resp.json()
-            await session.close()
-            is_enabled = bool(int(data["company.enabled"]))
-            if not is_enabled:
-                raise CompanyNotEnabledException(
-                    f"Company with {domain} domain is not enabled"
-                )
-            return data["companyId"]
+        data = await self.__request("GET", url, headers, endpoint_class="market_data")
+        is_enabled = bool(int(data["company.enabled"]))
+        if not is_enabled:
+            raise CompanyNotEnabledException(
+                f"Company with {domain} domain is not enabled"
+            )
+        return data["companyId"]
 
     async def get_avaible_chains(self) -> List[str]:
         """
@@ -915,10 +1448,9 @@ class Client:
             dict: A dictionary containing the CCTP assets.
         """
         url = f"{self.__api_url}/market/cctp-assets"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.get(url) as resp:
-                data = await resp.json()
-                return data
+        return await self.__request(
+            "GET", url, self.__auth_headers, endpoint_class="market_data"
+        )
 
     async def get_cctp_unified_assets(self) -> dict:
         """
@@ -928,10 +1460,9 @@ class Client:
             dict: A dictionary containing the unified CCTP assets.
         """
         url = f"{self.__api_url}/market/cctp-unified-assets"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.get(url) as resp:
-                data = await resp.json()
-                return data
+        return await self.__request(
+            "GET", url, self.__auth_headers, endpoint_class="market_data"
+        )
 
     async def get_assets(self) -> List[Dict]:
         """
@@ -945,10 +1476,9 @@ class Client:
         - isGas (bool): Whether the asset is gas.
         """
         url = f"{self.__api_url}/market/assets"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.get(url) as resp:
-                data = await resp.json()
-                return data
+        return await self.__request(
+            "GET", url, self.__auth_headers, endpoint_class="market_data"
+        )
 
     async def get_orders(
         self,
@@ -980,8 +1510,34 @@ class Client:
         }
         query_params = {k: v for k, v in query_params.items() if v is not None}
         url = f"{self.__api_url}/market/orders"
-        async with aiohttp.ClientSession(headers=self.__auth_headers) as session:
-            async with session.get(url, params=query_params) as resp:
-                data = await resp.json()
-                await session.close()
-                return data
+        return await self.__request(
+            "GET", url, self.__auth_headers, params=query_params
+        )
+
+    def iter_orders(
+        self,
+        startTime: Optional[int] = None,
+        endTime: Optional[int] = None,
+        limit: int = 100,
+        prefetch: int = 2,
+    ) -> AsyncIterator[dict]:
+        """
+        Iterates over all orders of the logged user, page by page.
+        The next `prefetch` pages are requested concurrently while the current page is consumed.
+
+        Args:
+            startTime (int, optional): The start time for filtering orders.
+            endTime (int, optional): The end time for filtering orders.
+            limit (int, optional): The number of orders per page. Defaults to 100.
+            prefetch (int, optional): The number of pages requested ahead. Defaults to 2.
+
+        Example:
+            async for order in client.iter_orders(startTime=start, endTime=end):
+                print(order["id"])
+        """
+        self.__check_is_logged_in()
+
+        async def fetch_page(page: int):
+            return await self.get_orders(startTime, endTime, page, limit)
+
+        return self.__iter_pages(fetch_page, limit, prefetch)
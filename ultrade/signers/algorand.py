@@ -1,6 +1,7 @@
 from ultrade.utils.encode import normalize_address, determine_address_type
+from ultrade.utils.algod_service import AlgodService
 from .main import Signer
-from algosdk import mnemonic, account, abi
+from algosdk import mnemonic, account, abi, constants
 from algosdk.logic import get_application_address
 from algosdk.transaction import (
     PaymentTxn,
@@ -8,11 +9,19 @@ from algosdk.transaction import (
     ApplicationCallTxn,
     OnComplete,
     assign_group_id,
-    wait_for_confirmation,
+    SuggestedParams,
+    Transaction,
 )
 from algosdk.util import sign_bytes
 from eth_utils import keccak
 from ..types import WormholeChains, Technology
+from random import random
+from typing import List, Tuple
+
+DEPOSIT_METHOD = abi.Method.from_signature("depositToCodex(byte[])uint64")
+
+# every deposit takes an asset transfer and an app call
+MAX_GROUP_DEPOSITS = constants.tx_group_limit // 2
 
 
 class AlgorandSigner(Signer):
@@ -42,27 +51,74 @@ class AlgorandSigner(Signer):
             amount (int): The amount of tokens to deposit.
             token_address (str | int): The id of the token to deposit.
         """
+        return await self._deposit_group([(token_address, amount)], config)
+
+    async def _deposit_group(
+        self, deposits: List[Tuple[str | int, int]], config: dict
+    ) -> str:
+        """
+        Deposit several tokens to the Token Manager Contract in one atomic group,
+        an asset transfer and a `depositToCodex` app call per deposit.
+
+        Args:
+            deposits (List[Tuple[str | int, int]]): (asset id, amount) pairs, at most MAX_GROUP_DEPOSITS
+                and one per asset.
+
+        Returns:
+            str: The id of the first transaction of the group.
+        """
+        if not deposits:
+            raise ValueError("At least one deposit is required.")
+        if len(deposits) > MAX_GROUP_DEPOSITS:
+            raise ValueError(
+                f"At most {MAX_GROUP_DEPOSITS} deposits fit in one atomic group, got {len(deposits)}."
+            )
         try:
-            token_address = int(token_address)
+            deposits = [(int(token_address), amount) for token_address, amount in deposits]
         except ValueError:
             raise Exception("You must provide a valid Algorand asset id.")
+        asset_ids = [token_address for token_address, _ in deposits]
+        if len(set(asset_ids)) != len(asset_ids):
+            raise ValueError("Each asset can be deposited once per group, sum its amounts instead.")
 
+        algod_service = config.get("algod_service", None)
         algod_client = config.get("algod_client", None)
         login_user = config.get("login_user", None)
         codex_app_id = config.get("codex_app_id", None)
 
-        if algod_client is None:
-            raise Exception("Algod client is not set.")
+        if algod_service is None:
+            if algod_client is None:
+                raise Exception("Algod client is not set.")
+            algod_service = AlgodService(algod_client)
         if login_user is None:
             raise Exception("Login user is not set.")
         if codex_app_id is None:
             raise Exception("Codex app id is not set.")
 
-        codex_address = get_application_address(codex_app_id)
+        params = await algod_service.get_transaction_params_async()
+        txns = self._build_deposit_txns(deposits, params, login_user, codex_app_id)
 
-        params = algod_client.suggested_params()
-        method = abi.Method.from_signature("depositToCodex(byte[])uint64")
-        selector = method.get_selector()
+        tx_id = await algod_service.send_transaction_grp_async(
+            [txn.sign(self.__algo_private_key) for txn in txns]
+        )
+        result = await algod_service.wait_for_confirmation_async(tx_id, 4)
+        if not result:
+            raise Exception("Deposit failed.")
+        return tx_id
+
+    def _build_deposit_txns(
+        self,
+        deposits: List[Tuple[int, int]],
+        params: SuggestedParams,
+        login_user: Signer,
+        codex_app_id: int,
+    ) -> List[Transaction]:
+        """
+        Returns the grouped, unsigned transactions of the deposits, all built with the same params.
+        Every transaction carries a random note, so repeated deposits do not get the ids of earlier ones.
+        """
+        codex_address = get_application_address(codex_app_id)
+        sender = self.address
 
         login_address_hex = normalize_address(
             login_user.address,
@@ -70,53 +126,43 @@ class AlgorandSigner(Signer):
         ).hex()
         login_chain_id_hex = login_user.wormhole_chain_id.to_bytes(8, "big").hex()
 
-        message = login_address_hex + login_chain_id_hex
-        message_bytes = bytes.fromhex(message)
-        box_name = (
-            login_address_hex
-            + login_chain_id_hex
-            + token_address.to_bytes(32, "big").hex()
-            + self.wormhole_chain_id.to_bytes(8, "big").hex()
-        )
-        box_name_bytes = bytes.fromhex(box_name)
-        msg_args = method.args[0].type.encode(bytes(message_bytes))
-
-        if token_address == 0:
-            asset_transfer_txn = PaymentTxn(
-                sender=self.address,
-                sp=params,
-                receiver=codex_address,
-                amt=amount,
-            )
-        else:
-            asset_transfer_txn = AssetTransferTxn(
-                sender=self.address,
+        message_bytes = bytes.fromhex(login_address_hex + login_chain_id_hex)
+        app_args = [DEPOSIT_METHOD.get_selector(), DEPOSIT_METHOD.args[0].type.encode(message_bytes)]
+        chain_id_bytes = self.wormhole_chain_id.to_bytes(8, "big")
+
+        txns = []
+        for token_address, amount in deposits:
+            if token_address == 0:
+                asset_transfer_txn = PaymentTxn(
+                    sender=sender,
+                    sp=params,
+                    receiver=codex_address,
+                    amt=amount,
+                    note=str(random()),
+                )
+            else:
+                asset_transfer_txn = AssetTransferTxn(
+                    sender=sender,
+                    sp=params,
+                    receiver=codex_address,
+                    amt=amount,
+                    index=token_address,
+                    note=str(random()),
+                )
+            box_name_bytes = message_bytes + token_address.to_bytes(32, "big") + chain_id_bytes
+            app_call_txn = ApplicationCallTxn(
+                sender=sender,
+                app_args=app_args,
                 sp=params,
-                receiver=codex_address,
-                amt=amount,
-                index=token_address,
+                index=codex_app_id,
+                on_complete=OnComplete.NoOpOC,
+                boxes=[[codex_app_id, keccak(box_name_bytes)]],
+                note=str(random()),
             )
+            txns.extend([asset_transfer_txn, app_call_txn])
 
-        app_call_txn = ApplicationCallTxn(
-            sender=self.address,
-            app_args=[selector, msg_args],
-            sp=params,
-            index=codex_app_id,
-            on_complete=OnComplete.NoOpOC,
-            boxes=[[codex_app_id, keccak(box_name_bytes)]],
-        )
-
-        assign_group_id([asset_transfer_txn, app_call_txn])
-
-        tx_id = algod_client.send_transactions(
-            [
-                asset_transfer_txn.sign(self.__algo_private_key),
-                app_call_txn.sign(self.__algo_private_key),
-            ]
-        )
-        result = wait_for_confirmation(algod_client, tx_id, 4)
-        if not result:
-            raise Exception("Deposit failed.")
+        assign_group_id(txns)
+        return txns
 
     @property
     def address(self) -> str:
@@ -2,35 +2,120 @@ from ultrade.utils.encode import determine_address_type, normalize_address
 from ultrade.types import Technology, WormholeChains
 from ultrade.constants import TMC_ABI as abi, ERC20_ABI
 from ultrade import Signer
-from web3 import Web3, HTTPProvider
-from web3.middleware import geth_poa_middleware
+from ultrade.utils.evm import EvmProviders
+from web3 import Web3
 from eth_account import Account
 from eth_keys import keys
 from eth_account.messages import encode_defunct
-
+from eth_hash.auto import keccak
+from hexbytes import HexBytes
+from typing import Dict, Optional
+import asyncio
+
+try:
+    import coincurve
+except ImportError:  # pragma: no cover - optional dependency
+    coincurve = None
+
+# gas of a deposit sent right after its approve, when it can't be estimated yet,
+# overridden by the `deposit_gas_limit` option of the client
 GAS_LIMIT = 1000000
 
+EIP191_PREFIX = b"\x19Ethereum Signed Message:\n"
+
+
+class EthAccountBackend:
+    """
+    Signs EIP-191 messages with `eth_account`.
+    """
+
+    name = "eth_account"
+
+    def __init__(self, private_key: bytes):
+        self._private_key = keys.PrivateKey(private_key)
+
+    def sign_message(self, message: bytes) -> bytes:
+        return Account.sign_message(encode_defunct(message), self._private_key).signature
+
+
+class CoincurveBackend:
+    """
+    Signs EIP-191 messages with libsecp256k1 through coincurve.
+
+    The message is hashed with its EIP-191 prefix, the prefixes of the message lengths are cached,
+    and the recoverable signature is converted to the `r || s || v` layout of `eth_account`
+    with v = 27 + recovery id. Both use RFC 6979 nonces and low s values, so the signatures are identical.
+    """
+
+    name = "coincurve"
+
+    def __init__(self, private_key: bytes):
+        self._private_key = coincurve.PrivateKey(private_key)
+        self._prefixes: Dict[int, bytes] = {}
+
+    def sign_message(self, message: bytes) -> bytes:
+        length = len(message)
+        prefix = self._prefixes.get(length)
+        if prefix is None:
+            prefix = self._prefixes[length] = EIP191_PREFIX + str(length).encode()
+        signature = self._private_key.sign_recoverable(keccak(prefix + message), hasher=None)
+        return signature[:64] + bytes((signature[64] + 27,))
+
+
+SIGNING_BACKENDS = {EthAccountBackend.name: EthAccountBackend}
+if coincurve is not None:
+    SIGNING_BACKENDS[CoincurveBackend.name] = CoincurveBackend
+
+
+def create_signing_backend(private_key: bytes, name: Optional[str] = None):
+    """
+    Returns the backend with the given name, "coincurve" or "eth_account".
+    None picks coincurve when it is installed.
+    """
+    if name is None:
+        name = CoincurveBackend.name if coincurve is not None else EthAccountBackend.name
+    if name not in SIGNING_BACKENDS:
+        raise ValueError(
+            f"Signing backend {name!r} is not available, installed backends: {', '.join(SIGNING_BACKENDS)}"
+        )
+    return SIGNING_BACKENDS[name](private_key)
+
 
 class EthereumSigner(Signer):
     """
     Signer implementation for EVM chains.
     """
 
-    def __init__(self, private_key):
+    def __init__(self, private_key, signing_backend: Optional[str] = None):
         # TODO: add login from ETHEREUM instead of Polygon
         super().__init__(wormhole_chain_id=WormholeChains.POLYGON)
-        self.__eth_private_key = keys.PrivateKey(bytes.fromhex(private_key))
         self.__private_key = private_key
+        self.__signing_backend_name = signing_backend
+        self.__signing_backend = create_signing_backend(bytes.fromhex(private_key), signing_backend)
+        self.__address = Account.from_key(private_key).address
         self._provider_name = Technology.EVM.value
 
+    def __getstate__(self):
+        # signing backends keep references to native keys, so only the raw key is pickled
+        state = self.__dict__.copy()
+        del state["_EthereumSigner__signing_backend"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__signing_backend = create_signing_backend(
+            bytes.fromhex(self.__private_key), self.__signing_backend_name
+        )
+
+    @property
+    def signing_backend(self) -> str:
+        return self.__signing_backend.name
+
     def sign_data(self, message: bytes) -> str:
         """
         Sign the message using Ethereum.
         """
-        signed_data = Account.sign_message(
-            encode_defunct(message), self.__eth_private_key
-        )
-        return signed_data.signature
+        return HexBytes(self.__signing_backend.sign_message(message))
 
     async def _deposit(
         self, amount: int, token_address: str | int, config: dict
@@ -38,6 +123,10 @@ class EthereumSigner(Signer):
         """
         Deposit the amount of tokens to the Token Manager Contract
 
+        When the allowance is too low, an approve is sent first and the deposit right after it.
+        The gas of that deposit can't be estimated before the approve is mined, it is set to
+        `config["deposit_gas_limit"]`, `GAS_LIMIT` by default. Otherwise the gas is estimated.
+
         Args:
             amount (int): The amount of tokens to deposit.
             token_address (str | int): The id of the token to deposit.
@@ -50,6 +139,7 @@ class EthereumSigner(Signer):
         rpc_url = config.get("rpc_url", None)
         tmc_configs = config.get("tmc_configs", None)
         login_user = config.get("login_user", None)
+        evm_providers = config.get("evm_providers", None) or EvmProviders()
 
         login_address = normalize_address(
             login_user.address,
@@ -61,15 +151,14 @@ class EthereumSigner(Signer):
         if rpc_url is None:
             raise Exception("RPC URL is not set. Please provide a valid RPC URL.")
 
-        web3 = Web3(HTTPProvider(rpc_url))
-        web3.middleware_onion.inject(geth_poa_middleware, layer=0)
-
-        if not web3.is_connected():
+        web3 = evm_providers.get(rpc_url)
+        try:
+            chain_id = await evm_providers.chain_id(rpc_url)
+        except Exception as e:
             raise Exception(
                 "Failed to connect to the Ethereum RPC URL. Please check your connection."
-            )
+            ) from e
 
-        chain_id = web3.eth.chain_id
         tmc_config = next(
             (obj for obj in tmc_configs if obj["chainId"] == str(chain_id)), None
         )
@@ -81,51 +170,68 @@ class EthereumSigner(Signer):
         tmc_address = tmc_config["tmc"]
         if not Web3.is_address(tmc_address):
             raise Exception("Invalid Token Manager Contract address.")
+        tmc_address = Web3.to_checksum_address(tmc_address)
 
-        tmc_contract = web3.eth.contract(
-            address=Web3.to_checksum_address(tmc_address), abi=abi
-        )
+        tmc_contract = web3.eth.contract(address=tmc_address, abi=abi)
         token_contract = web3.eth.contract(address=token_address, abi=ERC20_ABI)
 
-        allowance = token_contract.functions.allowance(self.address, tmc_address).call()
-        if allowance < amount:
-            approve_txn = token_contract.functions.approve(
-                tmc_address, amount
-            ).build_transaction(
-                {
-                    "from": self.address,
-                    "nonce": web3.eth.get_transaction_count(self.address),
-                }
-            )
-            signed_approve_txn = web3.eth.account.sign_transaction(
-                approve_txn, private_key=self.__private_key
-            )
-            web3.eth.send_raw_transaction(signed_approve_txn.rawTransaction)
-            web3.eth.wait_for_transaction_receipt(signed_approve_txn.hash)
-
-        transaction = tmc_contract.functions.depositToCodex(
-            token_address,
-            amount,
-            login_address,
-            login_user.wormhole_chain_id,
-        ).build_transaction(
-            {
-                "from": self.address,
-                "nonce": web3.eth.get_transaction_count(self.address),
-            }
+        allowance = await token_contract.functions.allowance(self.address, tmc_address).call()
+        needs_approve = allowance < amount
+
+        # the approve and the deposit get consecutive nonces and are sent back to back
+        nonce_key = (chain_id, self.address)
+        nonce = await evm_providers.nonces.reserve(
+            nonce_key,
+            lambda: web3.eth.get_transaction_count(self.address, "pending"),
+            2 if needs_approve else 1,
         )
+        try:
+            transactions = []
+            if needs_approve:
+                transactions.append(
+                    await token_contract.functions.approve(tmc_address, amount).build_transaction(
+                        {"from": self.address, "nonce": nonce, "chainId": chain_id}
+                    )
+                )
+                nonce += 1
+
+            deposit_params = {"from": self.address, "nonce": nonce, "chainId": chain_id}
+            if needs_approve:
+                deposit_params["gas"] = config.get("deposit_gas_limit") or GAS_LIMIT
+            transactions.append(
+                await tmc_contract.functions.depositToCodex(
+                    token_address,
+                    amount,
+                    login_address,
+                    login_user.wormhole_chain_id,
+                ).build_transaction(deposit_params)
+            )
 
-        signed_txn = web3.eth.account.sign_transaction(
-            transaction, private_key=self.__private_key
+            tx_hashes = []
+            for transaction in transactions:
+                signed_txn = web3.eth.account.sign_transaction(
+                    transaction, private_key=self.__private_key
+                )
+                tx_hashes.append(await web3.eth.send_raw_transaction(signed_txn.rawTransaction))
+        except Exception:
+            # the node decides again which nonce comes next
+            evm_providers.nonces.reset(nonce_key)
+            raise
+
+        receipts = await asyncio.gather(
+            *[web3.eth.wait_for_transaction_receipt(tx_hash) for tx_hash in tx_hashes]
         )
-        tx_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        for receipt in receipts:
+            if receipt.status != 1:
+                raise Exception(
+                    f"Deposit transaction {receipt.transactionHash.hex()} failed."
+                )
 
-        return tx_receipt.transactionHash.hex()
+        return receipts[-1].transactionHash.hex()
 
     @property
     def address(self) -> str:
         """
         Get the Ethereum address corresponding to the private key.
         """
-        return Account.from_key(self.__private_key).address
+        return self.__address
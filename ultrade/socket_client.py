@@ -1,110 +1,556 @@
 import socketio
 import time
-from typing import Callable, Optional, TypedDict, Dict, List
-from .constants import EVENT_LIST
+from typing import Awaitable, Callable, Iterable, Optional, TypedDict, Dict, List, Tuple
+from .constants import EVENT_LIST, CONFLATED_EVENTS, SUBSCRIPTION_QUEUE_SIZE
+from . import socket_options
+from .utils.event_queue import EventQueue
+from .utils.recorder import EventRecorder
 import asyncio
 
 
+# loads the REST snapshot of a stream for a symbol
+SnapshotFetcher = Callable[[str], Awaitable[any]]
+
+# event delivered to the subscribers of a stream once it was resynced after a reconnect
+RESYNC_EVENT = "resync"
+
+
 class SubscribeOptions(TypedDict):
     symbol: str
     streams: List[int]
     options: Dict[str, any]
 
 
-class SocketClient:
-    def __init__(self, url):
-        self.socket: Optional[socketio.AsyncClient] = None
-        self.url = url
-        self.isConnectionExist = False
-        self.socket_controller = SocketController()
-        self.subscribe_options = {}
+class SocketConnection:
+    """
+    A socket.io connection carrying the subscriptions of one or more pairs.
+
+    Every pair has its own SocketController. Events are routed by the `pair` field of their
+    payload. Events without one, e.g. balances and account updates, are offered to every pair
+    of the connection, but reach each callback only once. Events of a pair the connection
+    does not follow, e.g. right after an unsubscribe, are dropped and counted in `unrouted`.
+
+    After a reconnect the events of every pair are held back while `snapshot_fetchers`
+    load a REST snapshot of each subscribed stream they support. Subscribers of the stream
+    then receive a "resync" event with the snapshot, followed by the held back events,
+    depth updates already included in the depth snapshot excepted.
+    """
 
-    def get_sub_options(self):
+    def __init__(self, url, json=None, snapshot_fetchers: Optional[Dict[int, SnapshotFetcher]] = None):
+        self.url = url
+        self.json = json
+        self.snapshot_fetchers = snapshot_fetchers or {}
+        self.recorder: Optional[EventRecorder] = None
+        self.socket: Optional[socketio.AsyncClient] = None
+        self.controllers: Dict[str, SocketController] = {}
+        self.subscribe_options: Dict[str, SubscribeOptions] = {}
+        self.messages = 0
+        self.unrouted = 0
+        self.created = time.monotonic()
+        self.disconnected_at: Optional[float] = None
+        self._resync_buffers: Dict[str, List[Tuple[str, any, any, Optional[set]]]] = {}
+        self._resync_task: Optional[asyncio.Task] = None
+        self.reconnects = 0
+        self.outage_total = 0.0
+        self.last_outage: Optional[float] = None
+        self.last_resync_latency: Optional[float] = None
+
+    @property
+    def streams(self) -> int:
+        return sum(len(controller.streams_pool) for controller in self.controllers.values())
+
+    @property
+    def message_rate(self) -> float:
+        return self.messages / max(time.monotonic() - self.created, 1e-9)
+
+    def get_sub_options(self, symbol: str):
         options = {
-            "options": self.subscribe_options["options"],
-            "symbol": self.subscribe_options["symbol"],
-            "streams": self.socket_controller.streams_pool,
+            "options": self.subscribe_options[symbol]["options"],
+            "symbol": symbol,
+            "streams": self.controllers[symbol].streams_pool,
         }
         return options
 
     async def subscribe(
-        self, options: SubscribeOptions, callback: Callable[[str, List[any]], any]
+        self,
+        options: SubscribeOptions,
+        callback: Callable[[str, List[any]], any],
+        inline: bool = False,
+        queue_size: int = SUBSCRIPTION_QUEUE_SIZE,
+        overflow: str = "block",
     ):
-        if (
-            self.subscribe_options.get("symbol")
-            and options["symbol"] != self.subscribe_options["symbol"]
-        ):
-            raise Exception("Socket client support only one pair per instance")
-
-        if not self.isConnectionExist:
-            self.subscribe_options = options
-            self.isConnectionExist = True
-            self.socket = socketio.AsyncClient(reconnection_delay_max=1000, logger=True)
-
-            sub_id = self.socket_controller.handle_subscribe(options, callback)
+        symbol = options["symbol"]
+        controller = self.controllers.get(symbol)
+        if controller is None:
+            controller = self.controllers[symbol] = SocketController()
+            self.subscribe_options[symbol] = options
+        sub_id = controller.handle_subscribe(options, callback, inline, queue_size, overflow)
+
+        if self.socket is None:
+            self.socket = socketio.AsyncClient(
+                reconnection_delay_max=1000, logger=True, json=self.json
+            )
+            self.created = time.monotonic()
             self.add_event_listeners()
-            await self.socket.connect(self.url, transports=["websocket"])
-
-            return sub_id
-
-        sub_id = self.socket_controller.handle_subscribe(options, callback)
+            try:
+                await self.socket.connect(self.url, transports=["websocket"])
+            except BaseException:
+                self.socket = None
+                await controller.handle_unsubscribe(sub_id)
+                if not controller.streams_pool:
+                    del self.controllers[symbol], self.subscribe_options[symbol]
+                raise
+        elif self.socket.connected:
+            await self.socket.emit("subscribe", self.get_sub_options(symbol))
 
         return sub_id
 
-    async def unsubscribe(self, handler_id: str):
-        streams_to_unsubscribe = await self.socket_controller.handle_unsubscribe(
-            handler_id
-        )
-        if len(streams_to_unsubscribe) > 0:
-            options = self.get_sub_options()
+    async def unsubscribe(self, symbol: str, handler_id: str):
+        controller = self.controllers[symbol]
+        streams_to_unsubscribe = await controller.handle_unsubscribe(handler_id)
+        if len(streams_to_unsubscribe) > 0 and self.socket is not None:
+            options = self.get_sub_options(symbol)
             options["streams"] = streams_to_unsubscribe
             await self.socket.emit("unsubscribe", options)
 
-        if len(self.get_sub_options()["streams"]) == 0:
-            self.isConnectionExist = False
-            await self.socket.disconnect()
-            self.socket = None
+        if len(controller.streams_pool) == 0:
+            del self.controllers[symbol], self.subscribe_options[symbol]
+            controller.close()
 
-    def add_event_listeners(self):
-        self.socket.on("*", self.socket_controller.callback_handler)
+        if not self.controllers:
+            await self.close()
 
-        async def reconnect_handler():
-            await self.socket.emit("subscribe", self.get_sub_options())
+    async def close(self):
+        if self._resync_task is not None:
+            self._resync_task.cancel()
+            self._resync_task = None
+        self._resync_buffers.clear()
+        for controller in self.controllers.values():
+            controller.close()
+        if self.socket is not None:
+            socket, self.socket = self.socket, None
+            await socket.disconnect()
 
-        self.socket.on("reconnect", reconnect_handler)
+    def add_event_listeners(self):
+        self.socket.on("*", self.callback_handler)
 
         async def connect_handler():
-            await self.socket.emit("subscribe", self.get_sub_options())
-
+            outage = None
+            if self.disconnected_at is not None:
+                outage = time.monotonic() - self.disconnected_at
+                self.disconnected_at = None
+                self.reconnects += 1
+                self.outage_total += outage
+                self.last_outage = outage
+                if self.snapshot_fetchers:
+                    if self._resync_task is not None:
+                        self._resync_task.cancel()
+                    # hold back the events from now on, they are delivered after the snapshots
+                    self._resync_buffers = {symbol: [] for symbol in self.controllers}
+
+            for symbol in list(self.controllers):
+                await self.socket.emit("subscribe", self.get_sub_options(symbol))
+
+            if outage is not None and self._resync_buffers:
+                self._resync_task = asyncio.ensure_future(self.resync(outage))
+
+        async def disconnect_handler(*args):
+            if self.socket is not None:
+                self.disconnected_at = time.monotonic()
+
+        self.socket.on("reconnect", connect_handler)
         self.socket.on("connect", connect_handler)
+        self.socket.on("disconnect", disconnect_handler)
+
+    async def resync(self, outage: float):
+        started = time.monotonic()
+        jobs = [
+            (symbol, stream)
+            for symbol in self._resync_buffers
+            if symbol in self.controllers
+            for stream in self.controllers[symbol].streams_pool
+            if stream in self.snapshot_fetchers
+        ]
+        results = await asyncio.gather(
+            *[self.snapshot_fetchers[stream](symbol) for symbol, stream in jobs],
+            return_exceptions=True,
+        )
+        snapshots: Dict[str, Dict[int, any]] = {}
+        for (symbol, stream), result in zip(jobs, results):
+            snapshots.setdefault(symbol, {})[stream] = result
+
+        for symbol in list(self._resync_buffers):
+            await self._finish_resync(symbol, snapshots.get(symbol, {}), outage)
+        self.last_resync_latency = time.monotonic() - started
+        self._resync_task = None
+
+    async def _finish_resync(self, symbol: str, snapshots: Dict[int, any], outage: float):
+        buffer = self._resync_buffers.get(symbol, [])
+        controller = self.controllers.get(symbol)
+        if controller is not None:
+            for stream, snapshot in snapshots.items():
+                marker = {"stream": stream, "symbol": symbol, "outage": outage}
+                if isinstance(snapshot, Exception):
+                    marker["error"] = snapshot
+                else:
+                    marker["snapshot"] = snapshot
+                await controller.dispatch_to_stream(RESYNC_EVENT, marker, stream)
+
+            depth = snapshots.get(socket_options.DEPTH)
+            last_update_id = depth.get("u") if isinstance(depth, dict) else None
+            # events received while delivering the buffer are appended to it
+            while buffer:
+                event, args, id, seen = buffer.pop(0)
+                if (
+                    last_update_id is not None
+                    and event == "depth"
+                    and isinstance(args, dict)
+                    and args.get("u") is not None
+                    and args["u"] <= last_update_id
+                ):
+                    continue
+                await controller.callback_handler(event, args, id, seen)
+        self._resync_buffers.pop(symbol, None)
+
+    async def _deliver(self, symbol: str, event, args, id, seen: Optional[set] = None):
+        buffer = self._resync_buffers.get(symbol)
+        if buffer is not None:
+            buffer.append((event, args, id, seen))
+            return
+        await self.controllers[symbol].callback_handler(event, args, id, seen)
+
+    def _find_symbol(self, pair) -> Optional[str]:
+        if not isinstance(pair, str):
+            return None
+        if pair in self.controllers:
+            return pair
+        pair = pair.lower()
+        return next((symbol for symbol in self.controllers if symbol.lower() == pair), None)
+
+    async def callback_handler(self, event, args, id=None):
+        self.messages += 1
+        if self.recorder is not None:
+            try:
+                self.recorder.record(event, args)
+            except Exception as error:
+                # the live event is still routed
+                self.recorder.failures += 1
+                print(f"Warning: Failed to record {event}: {error!r}")
+        if isinstance(args, dict) and "pair" in args:
+            symbol = self._find_symbol(args["pair"])
+            if symbol is None:
+                self.unrouted += 1
+                return
+            await self._deliver(symbol, event, args, id)
+        elif len(self.controllers) == 1:
+            await self._deliver(next(iter(self.controllers)), event, args, id)
+        else:
+            # the pairs share the callbacks already served, so a callback subscribed to
+            # several pairs gets a pair-less event once
+            seen = set()
+            await asyncio.gather(
+                *[self._deliver(symbol, event, args, id, seen) for symbol in list(self.controllers)]
+            )
+
+
+class SocketClient:
+    """
+    Websocket client multiplexing the subscriptions of many pairs over up to `max_connections`
+    socket.io connections. A new pair goes to a new connection until the limit is reached,
+    then to the connection with the lowest message rate.
+    """
+
+    def __init__(
+        self,
+        url,
+        json=None,
+        max_connections: int = 1,
+        snapshot_fetchers: Optional[Dict[int, SnapshotFetcher]] = None,
+    ):
+        if max_connections < 1:
+            raise ValueError("max_connections should be at least 1")
+        self.url = url
+        self.json = json
+        self.snapshot_fetchers = snapshot_fetchers
+        self.recorder: Optional[EventRecorder] = None
+        self.max_connections = max_connections
+        self.connections: List[SocketConnection] = []
+        self._symbols: Dict[str, SocketConnection] = {}
+        self._handlers: Dict[str, str] = {}
+
+    def _pick_connection(self) -> SocketConnection:
+        if len(self.connections) < self.max_connections:
+            connection = SocketConnection(self.url, self.json, self.snapshot_fetchers)
+            connection.recorder = self.recorder
+            self.connections.append(connection)
+            return connection
+        return min(
+            self.connections,
+            key=lambda connection: (connection.message_rate, connection.streams),
+        )
+
+    async def subscribe(
+        self,
+        options: SubscribeOptions,
+        callback: Callable[[str, List[any]], any],
+        inline: bool = False,
+        queue_size: int = SUBSCRIPTION_QUEUE_SIZE,
+        overflow: str = "block",
+    ):
+        symbol = options["symbol"]
+        connection = self._symbols.get(symbol)
+        if connection is None:
+            connection = self._symbols[symbol] = self._pick_connection()
+        try:
+            sub_id = await connection.subscribe(options, callback, inline, queue_size, overflow)
+        except BaseException:
+            self._release(symbol, connection)
+            raise
+        self._handlers[sub_id] = symbol
+        return sub_id
+
+    async def unsubscribe(self, handler_id: str):
+        symbol = self._handlers.pop(handler_id, None)
+        if symbol is None:
+            print(f"Warning: No subscription found for handler ID {handler_id}")
+            return
+        connection = self._symbols[symbol]
+        await connection.unsubscribe(symbol, handler_id)
+        self._release(symbol, connection)
+
+    def set_recorder(self, recorder: Optional[EventRecorder]):
+        """
+        Records the events received by every subscription, None stops recording.
+        """
+        self.recorder = recorder
+        for connection in self.connections:
+            connection.recorder = recorder
+
+    def get_subscription(self, handler_id: str) -> "Subscription":
+        symbol = self._handlers[handler_id]
+        return self._symbols[symbol].controllers[symbol].subscriptions[handler_id]
+
+    def _release(self, symbol: str, connection: SocketConnection):
+        if symbol not in connection.controllers:
+            self._symbols.pop(symbol, None)
+        if not connection.controllers and connection in self.connections:
+            self.connections.remove(connection)
+
+    async def close(self):
+        connections, self.connections = self.connections, []
+        self._symbols.clear()
+        self._handlers.clear()
+        for connection in connections:
+            await connection.close()
+
+    @property
+    def stats(self) -> Dict[str, any]:
+        return {
+            "connections": len(self.connections),
+            "pairs": len(self._symbols),
+            "per_connection": [
+                {
+                    "pairs": list(connection.controllers),
+                    "streams": connection.streams,
+                    "messages": connection.messages,
+                    "unrouted": connection.unrouted,
+                    "message_rate": connection.message_rate,
+                    "reconnects": connection.reconnects,
+                    "outage_total": connection.outage_total,
+                    "last_outage": connection.last_outage,
+                    "last_resync_latency": connection.last_resync_latency,
+                }
+                for connection in self.connections
+            ],
+            "subscriptions": {
+                handler_id: stats
+                for connection in self.connections
+                for controller in connection.controllers.values()
+                for handler_id, stats in controller.stats.items()
+            },
+        }
+
+
+# events emitted for every stream id
+STREAM_EVENTS: Dict[int, Tuple[str, ...]] = {}
+for _event, _stream in EVENT_LIST:
+    STREAM_EVENTS[_stream] = STREAM_EVENTS.get(_stream, ()) + (_event,)
+
+KNOWN_EVENTS = frozenset(event for event, _ in EVENT_LIST)
+
+EVENT_STREAMS: Dict[str, int] = {event: stream for event, stream in EVENT_LIST}
+
+# how a callback is invoked by the controller
+ASYNC_CALLBACK = 0
+INLINE_CALLBACK = 1
+EXECUTOR_CALLBACK = 2
+# no callback, the events are read with Subscription.get
+ITERATOR = 3
+
+# most events a synchronous callback handles per handoff to the executor
+EXECUTOR_BATCH_SIZE = 64
+
+
+class Subscription:
+    """
+    A callback subscribed to socket streams.
+
+    Inline callbacks are called directly by the controller. Other callbacks receive the
+    events through a bounded `EventQueue` drained by a task of the subscription, so a slow
+    callback only delays its own events. Synchronous callbacks run in the default executor,
+    on up to EXECUTOR_BATCH_SIZE queued events per handoff. Subscriptions without a callback keep the events
+    in the queue until they are read with `get`.
+    """
+
+    def __init__(
+        self,
+        handler_id: str,
+        callback: Callable,
+        mode: int,
+        queue_size: int = SUBSCRIPTION_QUEUE_SIZE,
+        overflow: str = "block",
+        streams: Iterable[int] = (),
+    ):
+        self.handler_id = handler_id
+        self.streams = frozenset(streams)
+        self.callback = callback
+        self.mode = mode
+        self.queue = (
+            None
+            if mode == INLINE_CALLBACK
+            else EventQueue(queue_size, overflow, CONFLATED_EVENTS)
+        )
+        self._worker: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.errors = 0
+
+    def offer(self, event, args) -> Optional[Awaitable]:
+        """
+        Delivers an event, returns an awaitable when the queue is full and the policy is "block".
+        """
+        if self.mode == INLINE_CALLBACK:
+            self.delivered += 1
+            try:
+                self.callback(event, args)
+            except Exception as error:
+                self._callback_failed(event, error)
+            return None
+        if self._worker is None and self.mode != ITERATOR:
+            self._worker = asyncio.ensure_future(self._run())
+        if self.queue.offer(event, args):
+            return None
+        return self.queue.put(event, args)
+
+    async def get(self):
+        item = await self.queue.get()
+        self.delivered += 1
+        return item
+
+    async def _run(self):
+        if self.mode != ASYNC_CALLBACK:
+            return await self._run_in_executor()
+        while True:
+            event, args = await self.queue.get()
+            try:
+                await self.callback(event, args)
+            except Exception as error:
+                self._callback_failed(event, error)
+            self.delivered += 1
+
+    async def _run_in_executor(self):
+        # the events queued meanwhile go to the worker thread together, one handoff per batch
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.queue.get_batch(EXECUTOR_BATCH_SIZE)
+            errors = await loop.run_in_executor(None, self._call_batch, batch)
+            for event, error in errors:
+                self._callback_failed(event, error)
+            self.delivered += len(batch)
+
+    def _call_batch(self, batch: List[Tuple[str, any]]) -> List[Tuple[str, Exception]]:
+        errors = []
+        for event, args in batch:
+            try:
+                self.callback(event, args)
+            except Exception as error:
+                errors.append((event, error))
+        return errors
+
+    def _callback_failed(self, event, error: Exception):
+        self.errors += 1
+        print(f"Warning: Callback of subscription {self.handler_id} failed on {event}: {error!r}")
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self.queue is not None:
+            self.queue.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.queue is not None and self.queue.closed
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        stats = {"delivered": self.delivered, "errors": self.errors}
+        if self.queue is not None:
+            stats.update(self.queue.stats)
+        return stats
+
+
+async def _wait_all(waiters: List[Awaitable]):
+    # a single waiter is awaited directly, gather would wrap it in one more task
+    if len(waiters) == 1:
+        await waiters[0]
+    else:
+        await asyncio.gather(*waiters)
 
 
 class SocketController:
+    """
+    Routes socket events to the callbacks subscribed to their stream.
+
+    `async def` callbacks are awaited on the event loop. Synchronous callbacks run in the
+    default executor, or directly on the event loop when subscribed with `inline=True`,
+    which is the fastest option for callbacks that never block.
+    """
+
     def __init__(self):
         self.options_pool: Optional[Dict[str, "SubscribeOptions"]] = {}
-        self.callbacks_pool = {
-            event: [(lambda *args: stream_value, stream_value)]
-            for event, stream_value in EVENT_LIST
-        }
+        self.callbacks_pool: Dict[str, List[Subscription]] = {}
+        self.subscriptions: Dict[str, Subscription] = {}
         self.streams_pool = []
 
     def event_from_stream(self, stream):
-        matching_events = []
-        for event in self.callbacks_pool:
-            if self.callbacks_pool[event][0][1] == stream:
-                matching_events.append(event)
-        return matching_events
-
-    def handle_subscribe(self, sub_options, callback):
+        return list(STREAM_EVENTS.get(stream, ()))
+
+    def handle_subscribe(
+        self,
+        sub_options,
+        callback,
+        inline: bool = False,
+        queue_size: int = SUBSCRIPTION_QUEUE_SIZE,
+        overflow: str = "block",
+    ):
         handler_id = str(time.time_ns())
+        if callback is None:
+            mode = ITERATOR
+        elif asyncio.iscoroutinefunction(callback):
+            mode = ASYNC_CALLBACK
+        else:
+            mode = INLINE_CALLBACK if inline else EXECUTOR_CALLBACK
+        subscription = Subscription(
+            handler_id, callback, mode, queue_size, overflow, sub_options["streams"]
+        )
         for opt in sub_options["streams"]:
             if opt not in self.streams_pool:
                 self.streams_pool.append(opt)
-            events = self.event_from_stream(opt)
-            for event in events:
-                self.callbacks_pool[event].append((callback, handler_id))
+            for event in STREAM_EVENTS.get(opt, ()):
+                self.callbacks_pool.setdefault(event, []).append(subscription)
 
         self.options_pool[handler_id] = sub_options
+        self.subscriptions[handler_id] = subscription
 
         return handler_id
 
@@ -112,35 +558,76 @@ class SocketController:
         if handler_id not in self.options_pool:
             print(f"Warning: No subscription found for handler ID {handler_id}")
             return []
-        sub_options = self.options_pool[handler_id]
+        sub_options = self.options_pool.pop(handler_id)
+        self.subscriptions.pop(handler_id).close()
         streams_to_delete = []
         for opt in sub_options["streams"]:
-            events = self.event_from_stream(opt)
-            for event in events:
-                self.callbacks_pool[event] = [
-                    elem for elem in self.callbacks_pool[event] if elem[1] != handler_id
+            for event in STREAM_EVENTS.get(opt, ()):
+                callbacks = [
+                    elem
+                    for elem in self.callbacks_pool.get(event, [])
+                    if elem.handler_id != handler_id
                 ]
+                if callbacks:
+                    self.callbacks_pool[event] = callbacks
+                else:
+                    self.callbacks_pool.pop(event, None)
 
-                if len(self.callbacks_pool[event]) < 2:
-                    self.streams_pool.remove(opt)
-                    streams_to_delete.append(opt)
-
-        del self.options_pool[handler_id], sub_options
+            if opt in self.streams_pool and not any(
+                event in self.callbacks_pool for event in STREAM_EVENTS.get(opt, ())
+            ):
+                self.streams_pool.remove(opt)
+                streams_to_delete.append(opt)
 
         return streams_to_delete
 
-    async def callback_handler(self, event, args, id=None):
-        if event not in self.callbacks_pool:
-            print(f"Warning: No callbacks found for event {event}")
-            print(f"Event: {event}. Args: {args}")
+    async def callback_handler(self, event, args, id=None, seen: Optional[set] = None):
+        """
+        Offers an event to the subscribers of its stream. Callbacks in `seen` are skipped
+        and the served ones added to it, subscriptions without a callback count on their own.
+        """
+        callbacks = self.callbacks_pool.get(event)
+        if callbacks is None:
+            if event not in KNOWN_EVENTS:
+                print(f"Warning: No callbacks found for event {event}")
+                print(f"Event: {event}. Args: {args}")
             return
 
-        coros = [
-            self.make_async(callback_tuple[0], event, args)
-            for callback_tuple in self.callbacks_pool[event]
-        ]
-
-        await asyncio.gather(*coros)
-
-    async def make_async(self, func, *args):
-        await asyncio.get_event_loop().run_in_executor(None, func, *args)
+        blocked = None
+        for subscription in callbacks:
+            if seen is not None:
+                key = subscription if subscription.callback is None else subscription.callback
+                if key in seen:
+                    continue
+                seen.add(key)
+            waiter = subscription.offer(event, args)
+            if waiter is not None:
+                blocked = blocked or []
+                blocked.append(waiter)
+
+        if blocked:
+            await _wait_all(blocked)
+
+    async def dispatch_to_stream(self, event, args, stream: int):
+        """
+        Delivers an event to the subscribers of `stream`, whatever the event name.
+        """
+        blocked = []
+        for subscription in list(self.subscriptions.values()):
+            if stream in subscription.streams:
+                waiter = subscription.offer(event, args)
+                if waiter is not None:
+                    blocked.append(waiter)
+        if blocked:
+            await _wait_all(blocked)
+
+    def close(self):
+        for subscription in self.subscriptions.values():
+            subscription.close()
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            handler_id: subscription.stats
+            for handler_id, subscription in self.subscriptions.items()
+        }
@@ -1,6 +1,9 @@
 from enum import Enum
-from typing import TypedDict, Optional, List
+from typing import TypedDict, Optional, List, Literal, Union, Dict, Tuple, Callable, NamedTuple, Any
+from concurrent.futures import Executor
 from algosdk.v2client.algod import AlgodClient
+from .utils.retry import RetryPolicy
+from .utils.metrics import MetricsRegistry, RequestTrace
 from datetime import datetime
 import time
 
@@ -26,10 +29,30 @@ class KeyType(BaseEnum):
     SOLANA = "solana"
 
 
+class HttpOptions(TypedDict, total=False):
+    connection_limit: int
+    connection_limit_per_host: int
+    dns_cache_ttl: int
+    keepalive_timeout: float
+
+
 class ClientOptions(TypedDict, total=False):
     algo_sdk_client: AlgodClient
     api_url: str
     websocket_url: str
+    http_options: HttpOptions
+    pair_cache_ttl: float
+    signing_pool: Union[Literal["thread", "process"], Executor]
+    signing_workers: int
+    market_data_ttl: float
+    rate_limits: Optional[Dict[str, Tuple[float, float]]]
+    retry_policy: Optional[Union[Dict[str, float], RetryPolicy]]
+    instrumentation: Union[bool, MetricsRegistry, Callable[[RequestTrace], None]]
+    verify_network: bool
+    json_codec: Literal["auto", "orjson", "msgspec", "json"]
+    socket_connections: int
+    resync_on_reconnect: bool
+    deposit_gas_limit: int
 
 
 class WormholeChains(BaseEnum):
@@ -341,6 +364,12 @@ class Depth(TypedDict, total=False):
     pair: str
 
 
+class StreamEvent(NamedTuple):
+    event: str  # event name, e.g. "depth"
+    stream: Optional[int]  # stream id from socket_options
+    data: Any
+
+
 class Symbol(TypedDict):
     pairKey: str
 
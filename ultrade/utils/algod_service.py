@@ -1,19 +1,56 @@
+import copy
+import time
 from random import random
-from typing import List
+from typing import Dict, List, Optional
 
 from algosdk import account, mnemonic
 from algosdk import transaction
 from algosdk.logic import get_application_address
 from algosdk.v2client.algod import AlgodClient
 
+from .async_algod import AsyncAlgodClient, ExecutorAlgodClient
+from .confirmations import ConfirmationTracker
+from ..constants import ALGORAND_MIN_ROUND_TIME, SUGGESTED_PARAMS_MARGIN
+
 # from .api import _get_encoded_balance
 from .decode import decode_state
 
 
 class AlgodService:
-    def __init__(self, client, mnemonic=None):
+    """
+    Builds, signs and sends Algorand transactions.
+
+    Suggested params are fetched once and reused until the current round, estimated from the
+    rounds seen by the service, gets within `params_margin` rounds of their last valid round.
+    As transactions built from the same params share their validity window, the transfers and
+    app calls carry a random note, so identical transactions still get distinct ids.
+    Application global states are cached until `invalidate_app_state` is called.
+
+    The `_async` methods use `async_client` when it is set, otherwise they run the calls
+    of `client` in the default executor, so they never block the event loop. Their confirmation
+    waits share the round loop of `confirmations`.
+    """
+
+    def __init__(
+        self,
+        client,
+        mnemonic=None,
+        params_margin: int = SUGGESTED_PARAMS_MARGIN,
+        async_client: Optional[AsyncAlgodClient] = None,
+    ):
         self.client: AlgodClient = client
+        self.async_client = async_client
+        self._algod_async = async_client if async_client is not None else ExecutorAlgodClient(client)
+        self.confirmations = ConfirmationTracker(self._algod_async)
         self.mnemonic: str = mnemonic
+        self.params_margin = params_margin
+        self._params: Optional[transaction.SuggestedParams] = None
+        # last round known to the service and when it was seen
+        self._round: Optional[int] = None
+        self._round_seen_at: float = 0.0
+        self._app_states: Dict[int, dict] = {}
+        self.algod_calls = 0
+        self.algod_calls_saved = 0
 
     def make_app_call_txn(self, asset_index, app_args, app_id, fee=None):
         sender_address = self.get_account_address()
@@ -50,6 +87,7 @@ class AlgodService:
             get_application_address(int(app_id)),
             transfer_amount,
             asset_index,
+            note=str(random()),
         )
 
         return txn
@@ -89,8 +127,46 @@ class AlgodService:
     def get_account_info(self, address):
         return self.client.account_info(address)
 
-    def get_transaction_params(self):
-        return self.client.suggested_params()
+    def _observe_round(self, last_round: int):
+        # the estimate runs ahead of the node on slow rounds, which only refreshes the params earlier
+        if self._round is None or last_round >= self._estimate_round():
+            self._round = last_round
+            self._round_seen_at = time.monotonic()
+
+    def _estimate_round(self) -> int:
+        elapsed = time.monotonic() - self._round_seen_at
+        return self._round + int(elapsed / ALGORAND_MIN_ROUND_TIME)
+
+    def _cached_params(self) -> Optional[transaction.SuggestedParams]:
+        params = self._params
+        if params is None or self._estimate_round() + self.params_margin >= params.last:
+            self.algod_calls += 1
+            return None
+        self.algod_calls_saved += 1
+        return copy.copy(params)
+
+    def _store_params(self, params: transaction.SuggestedParams) -> transaction.SuggestedParams:
+        self._params = params
+        self._observe_round(params.first)
+        return copy.copy(params)
+
+    def get_transaction_params(self) -> transaction.SuggestedParams:
+        """
+        Returns a copy of the cached suggested params, fetched again when their validity window is about to end.
+        """
+        params = self._cached_params()
+        if params is None:
+            params = self._store_params(self.client.suggested_params())
+        return params
+
+    async def get_transaction_params_async(self) -> transaction.SuggestedParams:
+        params = self._cached_params()
+        if params is None:
+            params = self._store_params(await self._algod_async.suggested_params())
+        return params
+
+    def invalidate_transaction_params(self):
+        self._params = None
 
     def get_private_key(self):
         try:
@@ -104,6 +180,7 @@ class AlgodService:
     def wait_for_transaction(self, tx_id: str, timeout: int = 10):
         last_status = self.client.status()
         last_round = last_status["last-round"]
+        self._observe_round(last_round)
         start_round = last_round
 
         while last_round < start_round + timeout:
@@ -116,6 +193,7 @@ class AlgodService:
                 raise Exception("Pool error: {}".format(pending_txn["pool-error"]))
 
             last_status = self.client.status_after_block(last_round + 1)
+            self._observe_round(last_status["last-round"])
 
             last_round += 1
 
@@ -123,6 +201,16 @@ class AlgodService:
             "Transaction {} not confirmed after {} rounds".format(tx_id, timeout)
         )
 
+    async def wait_for_transaction_async(self, tx_id: str, timeout: int = 10):
+        return await self.wait_for_confirmation_async(tx_id, timeout)
+
+    async def wait_for_confirmation_async(self, tx_id: str, wait_rounds: int = 0) -> dict:
+        """
+        Waits for the transaction like `algosdk.transaction.wait_for_confirmation`, without blocking the event loop.
+        Concurrent waits share a single round loop, see `ConfirmationTracker`.
+        """
+        return await self.confirmations.wait(tx_id, wait_rounds)
+
     def sign_transaction_grp(self, txn_group) -> List:
         txn_group = txn_group if isinstance(txn_group, list) else [txn_group]
         txn_group = transaction.assign_group_id(txn_group)
@@ -136,6 +224,9 @@ class AlgodService:
         txid = self.client.send_transactions(signed_group)
         return txid
 
+    async def send_transaction_grp_async(self, signed_group) -> str:
+        return await self._algod_async.send_transactions(signed_group)
+
     def get_account_address(self):
         key = self.get_private_key()
         address = account.address_from_private_key(key)
@@ -178,12 +269,39 @@ class AlgodService:
         return transfer_amount
 
     def get_app_state(self, app_id):
+        state = self._app_states.get(app_id)
+        if state is not None:
+            self.algod_calls_saved += 1
+            return state
         try:
+            self.algod_calls += 1
             app_info = self.client.application_info(app_id)
             global_state = decode_state(app_info)
-            return global_state
         except Exception:
             return {}
+        self._app_states[app_id] = global_state
+        return global_state
+
+    def invalidate_app_state(self, app_id: Optional[int] = None):
+        """
+        Drops the cached global state of an application, or of all applications if no id is given.
+        """
+        if app_id is None:
+            self._app_states.clear()
+        else:
+            self._app_states.pop(app_id, None)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the number of algod requests sent for suggested params and application states,
+        and the number of requests saved by the caches.
+        """
+        return {
+            "algod_calls": self.algod_calls,
+            "algod_calls_saved": self.algod_calls_saved,
+            "confirmations": self.confirmations.stats,
+        }
 
     def get_super_app_id(self, app_id):
         state = self.get_app_state(app_id)
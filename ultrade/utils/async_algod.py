@@ -0,0 +1,191 @@
+import asyncio
+import base64
+import functools
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+from algosdk import constants, encoding, error, transaction
+from algosdk.v2client.algod import AlgodClient, api_version_path_prefix
+
+from .json_codec import JsonCodec, get_json_codec
+
+REQUEST_TIMEOUT = 30
+
+
+class AsyncAlgodClient:
+    """
+    asyncio client for the algod endpoints used by the SDK, with the method names and
+    results of `algosdk.v2client.algod.AlgodClient`.
+
+    Requests go through the aiohttp session returned by `get_session`, e.g. the pooled
+    session of `Client`, or through a session owned by the client. HTTP errors are raised
+    as `algosdk.error.AlgodHTTPError`. Confirmations are waited for with `ConfirmationTracker`.
+
+    Args:
+        algod_address (str): URL of the algod node.
+        algod_token (str): API token of the node.
+        headers (dict, optional): Headers sent with every request.
+        get_session (Callable, optional): Returns the session to use for a request.
+        json (JsonCodec, optional): Codec decoding the responses, defaults to the process default.
+    """
+
+    def __init__(
+        self,
+        algod_address: str,
+        algod_token: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        get_session: Optional[Callable[[], aiohttp.ClientSession]] = None,
+        json: Optional[JsonCodec] = None,
+    ):
+        self.algod_address = algod_address.rstrip("/")
+        self.algod_token = algod_token
+        self.headers = {"User-Agent": "py-algorand-sdk", **(headers or {})}
+        self._get_session = get_session
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._json = json or get_json_codec()
+
+    @classmethod
+    def from_algod_client(
+        cls,
+        client: AlgodClient,
+        get_session: Optional[Callable[[], aiohttp.ClientSession]] = None,
+        json: Optional[JsonCodec] = None,
+    ) -> Optional["AsyncAlgodClient"]:
+        """
+        Returns an async client for the node of `client`, or None if it does not expose its address.
+        """
+        address = getattr(client, "algod_address", None)
+        if not isinstance(address, str):
+            return None
+        return cls(
+            address,
+            getattr(client, "algod_token", "") or "",
+            getattr(client, "headers", None),
+            get_session,
+            json,
+        )
+
+    def session(self) -> aiohttp.ClientSession:
+        if self._get_session is not None:
+            return self._get_session()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def algod_request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        request_headers = {**self.headers, **(headers or {})}
+        if path not in constants.no_auth:
+            request_headers[constants.algod_auth_header] = self.algod_token
+        if path not in constants.unversioned_paths:
+            path = api_version_path_prefix + path
+        if params:
+            path += "?" + urlencode(params)
+
+        async with self.session().request(
+            method,
+            self.algod_address + path,
+            headers=request_headers,
+            data=data,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        ) as resp:
+            body = await resp.read()
+            if resp.status >= 400:
+                message = body.decode("utf-8", "replace")
+                payload = {}
+                try:
+                    payload = self._json.loads(body)
+                    message = payload["message"]
+                except Exception:
+                    pass
+                raise error.AlgodHTTPError(message, resp.status, payload.get("data"))
+        if not body:
+            return {}
+        try:
+            return self._json.loads(body)
+        except Exception as e:
+            raise error.AlgodResponseError("Failed to parse JSON response from algod") from e
+
+    async def status(self) -> dict:
+        return await self.algod_request("GET", "/status")
+
+    async def status_after_block(self, block_num: int) -> dict:
+        return await self.algod_request("GET", f"/status/wait-for-block-after/{block_num}")
+
+    async def genesis(self) -> dict:
+        return await self.algod_request("GET", "/genesis")
+
+    async def suggested_params(self) -> transaction.SuggestedParams:
+        res = await self.algod_request("GET", "/transactions/params")
+        return transaction.SuggestedParams(
+            res["fee"],
+            res["last-round"],
+            res["last-round"] + 1000,
+            res["genesis-hash"],
+            res["genesis-id"],
+            False,
+            res["consensus-version"],
+            res["min-fee"],
+        )
+
+    async def account_info(self, address: str) -> dict:
+        return await self.algod_request("GET", f"/accounts/{address}")
+
+    async def application_info(self, application_id: int) -> dict:
+        return await self.algod_request("GET", f"/applications/{application_id}")
+
+    async def pending_transaction_info(self, transaction_id: str) -> dict:
+        return await self.algod_request(
+            "GET", f"/transactions/pending/{transaction_id}", params={"format": "json"}
+        )
+
+    async def send_raw_transaction(self, txn: bytes) -> str:
+        """
+        Broadcasts base64 encoded signed transactions, returns the id of the first one.
+        """
+        resp = await self.algod_request(
+            "POST",
+            "/transactions",
+            data=base64.b64decode(txn),
+            headers={"Content-Type": "application/x-binary"},
+        )
+        return resp["txId"]
+
+    async def send_transactions(self, txns: Iterable[transaction.GenericSignedTransaction]) -> str:
+        serialized = []
+        for txn in txns:
+            assert not isinstance(
+                txn, transaction.Transaction
+            ), "Attempt to send UNSIGNED transaction {}".format(txn)
+            serialized.append(base64.b64decode(encoding.msgpack_encode(txn)))
+        return await self.send_raw_transaction(base64.b64encode(b"".join(serialized)))
+
+
+class ExecutorAlgodClient:
+    """
+    Runs the calls of a blocking `AlgodClient` in the default executor, with the interface of `AsyncAlgodClient`.
+    """
+
+    def __init__(self, client: AlgodClient):
+        self.client = client
+
+    def __getattr__(self, name: str):
+        method = getattr(self.client, name)
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(method, *args, **kwargs))
+
+        return call
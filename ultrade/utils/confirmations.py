@@ -0,0 +1,136 @@
+import asyncio
+from typing import Dict, Optional
+
+from algosdk import error
+
+DEFAULT_WAIT_ROUNDS = 1000
+
+
+class _Pending:
+    __slots__ = ("future", "wait_rounds", "deadline")
+
+    def __init__(self, future: asyncio.Future, wait_rounds: int):
+        self.future = future
+        self.wait_rounds = wait_rounds
+        self.deadline: Optional[int] = None
+
+
+class ConfirmationTracker:
+    """
+    Waits for the confirmation of many Algorand transactions with a single round loop.
+
+    Every round, the pending info of all tracked transactions is requested concurrently, then
+    the loop waits for the next block once for all of them. A transaction fails with
+    `TransactionRejectedError` on a pool error and with `ConfirmationTimeoutError` when it
+    is not confirmed after `wait_rounds` rounds, like `algosdk.transaction.wait_for_confirmation`.
+    The loop stops when nothing is tracked.
+
+    Args:
+        client (AsyncAlgodClient): Client with async `status`, `status_after_block` and `pending_transaction_info`.
+        max_concurrency (int): Maximum number of pending info requests in flight.
+    """
+
+    def __init__(self, client, max_concurrency: int = 16):
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: Dict[str, _Pending] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.tracked = 0
+        self.confirmed = 0
+        self.rejected = 0
+        self.expired = 0
+        self.rounds = 0
+        self.checks = 0
+
+    def track(self, txid: str, wait_rounds: int = DEFAULT_WAIT_ROUNDS) -> asyncio.Future:
+        """
+        Returns a future resolved with the pending transaction info once the transaction is confirmed.
+        Tracking a transaction twice returns the same future.
+        """
+        entry = self._pending.get(txid)
+        if entry is not None and not entry.future.done():
+            return entry.future
+        future = asyncio.get_running_loop().create_future()
+        self._pending[txid] = _Pending(future, wait_rounds or DEFAULT_WAIT_ROUNDS)
+        self.tracked += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return future
+
+    async def wait(self, txid: str, wait_rounds: int = DEFAULT_WAIT_ROUNDS) -> dict:
+        # shielded, so a cancelled waiter does not cancel the future other waiters share
+        return await asyncio.shield(self.track(txid, wait_rounds))
+
+    async def _check(self, txid: str, entry: _Pending):
+        async with self._semaphore:
+            self.checks += 1
+            try:
+                info = await self.client.pending_transaction_info(txid)
+            except error.AlgodHTTPError:
+                # a node behind a load balancer may not know the transaction yet
+                return
+        if entry.future.done():
+            return
+        if info.get("pool-error"):
+            self.rejected += 1
+            entry.future.set_exception(
+                error.TransactionRejectedError("Transaction rejected: " + info["pool-error"])
+            )
+        elif info.get("confirmed-round", 0) != 0:
+            self.confirmed += 1
+            entry.future.set_result(info)
+
+    def _prune(self, current_round: int):
+        for txid, entry in list(self._pending.items()):
+            if entry.future.done():
+                del self._pending[txid]
+                continue
+            if entry.deadline is None:
+                entry.deadline = current_round - 1 + entry.wait_rounds
+            elif current_round > entry.deadline:
+                self.expired += 1
+                entry.future.set_exception(
+                    error.ConfirmationTimeoutError(f"Wait for transaction id {txid} timed out")
+                )
+                del self._pending[txid]
+
+    async def _run(self):
+        try:
+            current_round = (await self.client.status())["last-round"] + 1
+            while True:
+                self._prune(current_round)
+                if not self._pending:
+                    return
+                await asyncio.gather(
+                    *[self._check(txid, entry) for txid, entry in list(self._pending.items())]
+                )
+                self._prune(current_round)
+                if not self._pending:
+                    return
+                self.rounds += 1
+                status = await self.client.status_after_block(current_round)
+                current_round = max(current_round + 1, status["last-round"])
+        except Exception as e:
+            for entry in self._pending.values():
+                if not entry.future.done():
+                    entry.future.set_exception(e)
+            self._pending.clear()
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        for entry in self._pending.values():
+            entry.future.cancel()
+        self._pending.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._pending),
+            "tracked": self.tracked,
+            "confirmed": self.confirmed,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "rounds": self.rounds,
+            "checks": self.checks,
+        }
@@ -2,6 +2,7 @@ import eth_abi
 import codecs
 from algosdk.encoding import decode_address
 from base58 import b58decode
+from functools import lru_cache
 from typing import Union
 from os import urandom
 from enum import Enum
@@ -55,11 +56,12 @@ def determine_address_type(
         return AddressType.EVM
 
 
+# order nonces stay below Number.MAX_SAFE_INTEGER (2 ** 53 - 1) for the JS backend
+NONCE_BITS = 53
+
+
 def generate_random_8bytes() -> bytes:
-    max_safe_integer = 9007199254740991
-    random_number = random.randint(0, max_safe_integer)
-    byte_data = struct.pack('>Q', random_number)
-    return byte_data
+    return struct.pack('>Q', random.getrandbits(NONCE_BITS))
 
 
 def decode32_bytes(value: str) -> bytes:
@@ -88,50 +90,126 @@ def make_signing_message(json_data, data):
     return get_utf8_encoded_data(json_data) + base64.b64encode(data)
 
 
-def get_order_bytes(
-    data: dict,
-) -> bytes:
-    order = bytearray()
-    order.extend(data["version"].to_bytes(2, "big"))
-    order.extend(data["expiredTime"].to_bytes(4, "big"))
-    order.extend(data["orderSide"].encode())
-    order.extend(eth_abi.encode(["uint256"], [data["price"]]))
-    order.extend(eth_abi.encode(["uint256"], [data["amount"]]))
-    order.extend(data["orderType"].encode())
-    order.extend(
-        normalize_address(
-            data["address"], determine_address_type(data["chainId"], False)
-        )
-    )
-    order.extend(data["chainId"].to_bytes(2, "big"))
-    order.extend(
-        normalize_address(
-            data["baseTokenAddress"],
-            determine_address_type(
-                data["baseTokenChainId"], True, data["baseTokenAddress"]
-            ),
+_UINT256_LIMIT = 1 << 256
+
+# version, expiration, side, price, amount, type
+ORDER_HEAD = struct.Struct(">HIc32s32sc")
+# random nonce, decimal price, padding
+ORDER_TAIL = struct.Struct(">Qd50x")
+
+
+def encode_uint256(value: int) -> bytes:
+    if type(value) is int and 0 <= value < _UINT256_LIMIT:
+        return value.to_bytes(32, "big")
+    # eth_abi reports invalid values
+    return eth_abi.encode(["uint256"], [value])
+
+
+class OrderTemplate:
+    """
+    Precompiled order encoding for an account and a pair.
+
+    The login address, base and price tokens, their chains and the company id are encoded once,
+    only the per order fields are packed by `encode`.
+    """
+
+    __slots__ = ("body",)
+
+    def __init__(
+        self,
+        address: str,
+        chain_id: int,
+        base_token_address: Union[str, int],
+        base_token_chain_id: int,
+        price_token_address: Union[str, int],
+        price_token_chain_id: int,
+        company_id: int,
+    ):
+        self.body = b"".join(
+            (
+                normalize_address(address, determine_address_type(chain_id, False)),
+                chain_id.to_bytes(2, "big"),
+                normalize_address(
+                    base_token_address,
+                    determine_address_type(base_token_chain_id, True, base_token_address),
+                ),
+                base_token_chain_id.to_bytes(4, "big"),
+                normalize_address(
+                    price_token_address,
+                    determine_address_type(price_token_chain_id, True, price_token_address),
+                ),
+                price_token_chain_id.to_bytes(4, "big"),
+                company_id.to_bytes(2, "big"),
+            )
         )
-    )
-    order.extend(data["baseTokenChainId"].to_bytes(4, "big"))
-    order.extend(
-        normalize_address(
-            data["priceTokenAddress"],
-            determine_address_type(
-                data["priceTokenChainId"], True, data["priceTokenAddress"]
-            ),
+
+    def encode(
+        self,
+        version: int,
+        expired_time: int,
+        order_side: str,
+        price: int,
+        amount: int,
+        order_type: str,
+        decimal_price: float,
+    ) -> bytes:
+        order = (
+            ORDER_HEAD.pack(
+                version,
+                expired_time,
+                order_side.encode(),
+                encode_uint256(price),
+                encode_uint256(amount),
+                order_type.encode(),
+            )
+            + self.body
+            + ORDER_TAIL.pack(random.getrandbits(NONCE_BITS), decimal_price)
         )
+        return base64.b64encode(order)
+
+
+@lru_cache(maxsize=1024)
+def get_order_template(
+    address: str,
+    chain_id: int,
+    base_token_address: Union[str, int],
+    base_token_chain_id: int,
+    price_token_address: Union[str, int],
+    price_token_chain_id: int,
+    company_id: int,
+) -> OrderTemplate:
+    return OrderTemplate(
+        address,
+        chain_id,
+        base_token_address,
+        base_token_chain_id,
+        price_token_address,
+        price_token_chain_id,
+        company_id,
     )
-    order.extend(data["priceTokenChainId"].to_bytes(4, "big"))
-    order.extend(data["companyId"].to_bytes(2, "big"))
-    random_8bytes = generate_random_8bytes()
-    order.extend(random_8bytes)
-    order.extend(struct.pack('>d', data["decimalPrice"]))
-    order.extend(b'\x00' * 50)
 
-    base64_order = base64.b64encode(bytes(order))
-    message_bytes = bytearray(base64_order)
 
-    return bytes(message_bytes)
+def get_order_bytes(
+    data: dict,
+) -> bytes:
+    template = get_order_template(
+        data["address"],
+        data["chainId"],
+        data["baseTokenAddress"],
+        data["baseTokenChainId"],
+        data["priceTokenAddress"],
+        data["priceTokenChainId"],
+        data["companyId"],
+    )
+    return template.encode(
+        data["version"],
+        data["expiredTime"],
+        data["orderSide"],
+        data["price"],
+        data["amount"],
+        data["orderType"],
+        data["decimalPrice"],
+    )
 
 
 def make_withdraw_msg(
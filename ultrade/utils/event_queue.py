@@ -0,0 +1,172 @@
+import asyncio
+import itertools
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "conflate")
+
+
+class EventQueueClosed(Exception):
+    pass
+
+
+class EventQueue:
+    """
+    Bounded FIFO queue of socket events.
+
+    When the queue is full, `overflow` decides what happens to a new event:
+    "block" makes `put` wait for free space and "drop_oldest" discards the oldest queued event.
+    Under "block", at most `max_blocked` producers wait at once, new events beyond them are
+    dropped, so a slow consumer can hold at most `maxsize + max_blocked` events in memory.
+
+    With "conflate", an event of `conflate_events` replaces the queued event of the same
+    event name and pair whenever there is one, whatever the fill level, so a slow consumer
+    only sees the latest value. Other events, and conflatable events without a queued
+    counterpart, are handled like "drop_oldest" when the queue is full.
+
+    Args:
+        maxsize (int): Maximum number of queued events.
+        overflow (str): "block", "drop_oldest" or "conflate".
+        conflate_events (Iterable[str]): Events that can be conflated.
+        max_blocked (int, optional): Maximum number of waiting producers under "block", defaults to `maxsize`.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        overflow: str = "block",
+        conflate_events: Iterable[str] = (),
+        max_blocked: Optional[int] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize should be at least 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow should be one of {', '.join(OVERFLOW_POLICIES)}")
+        self.maxsize = maxsize
+        self.max_blocked = maxsize if max_blocked is None else max_blocked
+        self.overflow = overflow
+        self._conflate_events = frozenset(conflate_events) if overflow == "conflate" else frozenset()
+        self._keys: Deque[Hashable] = deque()
+        self._items: Dict[Hashable, Tuple[str, Any]] = {}
+        self._unique = itertools.count()
+        self._not_empty = asyncio.Event()
+        # blocked producers in arrival order, a freed slot is handed to the first one
+        self._putters: Deque[asyncio.Future] = deque()
+        self._reserved = 0
+        self.closed = False
+        self.enqueued = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.high_water = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def full(self) -> bool:
+        return len(self._keys) + self._reserved >= self.maxsize or bool(self._putters)
+
+    def _key(self, event: str, args: Any) -> Hashable:
+        if event in self._conflate_events:
+            return event, args.get("pair") if isinstance(args, dict) else None
+        return next(self._unique)
+
+    def offer(self, event: str, args: Any) -> bool:
+        """
+        Queues an event without waiting. Returns False when the queue is full and the policy is "block".
+        """
+        key = self._key(event, args)
+        if key in self._items:
+            self._items[key] = (event, args)
+            self.conflated += 1
+            return True
+        if self.full():
+            if self.overflow == "block":
+                return False
+            del self._items[self._keys.popleft()]
+            self.dropped += 1
+
+        self._append(key, event, args)
+        return True
+
+    def _append(self, key: Hashable, event: str, args: Any):
+        self._keys.append(key)
+        self._items[key] = (event, args)
+        self.enqueued += 1
+        self.high_water = max(self.high_water, len(self._keys))
+        self._not_empty.set()
+
+    async def put(self, event: str, args: Any):
+        """
+        Queues an event, waiting for free space under "block". The event is dropped when
+        `max_blocked` producers are already waiting.
+        """
+        if self.offer(event, args):
+            return
+        if len(self._putters) >= self.max_blocked:
+            self.dropped += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._putters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release_slot()
+            elif future in self._putters:
+                self._putters.remove(future)
+            raise
+        self._reserved -= 1
+        self._append(self._key(event, args), event, args)
+
+    def _release_slot(self):
+        self._reserved -= 1
+        self._wake_putter()
+
+    def _wake_putter(self):
+        while self._putters and len(self._keys) + self._reserved < self.maxsize:
+            future = self._putters.popleft()
+            if not future.done():
+                self._reserved += 1
+                future.set_result(None)
+
+    async def _wait_not_empty(self):
+        while not self._keys:
+            if self.closed:
+                raise EventQueueClosed()
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+    async def get(self) -> Tuple[str, Any]:
+        await self._wait_not_empty()
+        item = self._items.pop(self._keys.popleft())
+        self._wake_putter()
+        return item
+
+    async def get_batch(self, max_items: int) -> List[Tuple[str, Any]]:
+        """
+        Waits for an event, then returns up to `max_items` queued events in order.
+        """
+        await self._wait_not_empty()
+        batch = []
+        while self._keys and len(batch) < max_items:
+            batch.append(self._items.pop(self._keys.popleft()))
+        self._wake_putter()
+        return batch
+
+    def close(self):
+        """
+        Wakes up the consumers, `get` raises EventQueueClosed once the queued events are consumed.
+        """
+        self.closed = True
+        self._not_empty.set()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._keys),
+            "blocked": len(self._putters),
+            "high_water": self.high_water,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+        }
@@ -0,0 +1,128 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import aiohttp
+from web3 import AsyncHTTPProvider, AsyncWeb3
+from web3.middleware import async_geth_poa_middleware, async_simple_cache_middleware
+from web3.types import RPCEndpoint, RPCResponse
+
+# the request timeout of web3
+RPC_TIMEOUT = 10
+
+
+class NonceManager:
+    """
+    Hands out consecutive nonces per account, the transaction count of the node is only
+    requested for the first transaction of an account or after `reset`.
+
+    Reserving several nonces at once lets dependent transactions, e.g. an approve and
+    the deposit spending the allowance, be sent without waiting for each other.
+    """
+
+    def __init__(self):
+        self._next: Dict[Hashable, int] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self.fetches = 0
+        self.reserved = 0
+
+    async def reserve(
+        self, key: Hashable, fetch: Callable[[], Awaitable[int]], count: int = 1
+    ) -> int:
+        """
+        Returns the first of `count` consecutive nonces of the account identified by `key`.
+
+        Args:
+            key (Hashable): Identifies the account, e.g. (chain id, address).
+            fetch (Callable): Returns the pending transaction count of the account.
+            count (int): Number of nonces to reserve.
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            nonce = self._next.get(key)
+            if nonce is None:
+                self.fetches += 1
+                nonce = await fetch()
+            self._next[key] = nonce + count
+            self.reserved += count
+            return nonce
+
+    def reset(self, key: Hashable):
+        """
+        Forgets the local nonce of an account, e.g. after a transaction could not be sent.
+        """
+        self._next.pop(key, None)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"accounts": len(self._next), "fetches": self.fetches, "reserved": self.reserved}
+
+
+class SessionHTTPProvider(AsyncHTTPProvider):
+    """
+    `AsyncHTTPProvider` sending its requests through a session of its own.
+
+    web3 shares one session per thread and RPC URL between all its providers, so closing it
+    would break every other provider of the URL. This session is opened on the first request
+    and only closed by `close`.
+    """
+
+    def __init__(self, endpoint_uri: str, request_kwargs: Optional[Any] = None):
+        super().__init__(endpoint_uri, request_kwargs)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(raise_for_status=True)
+        kwargs = self.get_request_kwargs()
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(RPC_TIMEOUT))
+        async with self._session.post(
+            self.endpoint_uri, data=self.encode_rpc_request(method, params), **kwargs
+        ) as response:
+            return self.decode_rpc_response(await response.read())
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class EvmProviders:
+    """
+    `AsyncWeb3` instances cached per RPC URL, with the chain id of every RPC and a shared `NonceManager`.
+
+    Every RPC URL gets one `SessionHTTPProvider`, so the connections to a node are reused by
+    all deposits going through it. The chain id, which web3 checks before every call and
+    gas estimate, is only requested once per RPC. `close` closes the sessions of these
+    providers only, they open new ones if they are used again.
+    """
+
+    def __init__(self):
+        self._web3: Dict[str, AsyncWeb3] = {}
+        self._chain_ids: Dict[str, int] = {}
+        self._chain_id_lock = asyncio.Lock()
+        self.nonces = NonceManager()
+
+    def get(self, rpc_url: str) -> AsyncWeb3:
+        web3 = self._web3.get(rpc_url)
+        if web3 is None:
+            web3 = AsyncWeb3(SessionHTTPProvider(rpc_url))
+            web3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+            web3.middleware_onion.add(async_simple_cache_middleware)
+            self._web3[rpc_url] = web3
+        return web3
+
+    async def chain_id(self, rpc_url: str) -> int:
+        async with self._chain_id_lock:
+            chain_id = self._chain_ids.get(rpc_url)
+            if chain_id is None:
+                chain_id = await self.get(rpc_url).eth.chain_id
+                self._chain_ids[rpc_url] = chain_id
+            return chain_id
+
+    async def close(self):
+        for web3 in self._web3.values():
+            await web3.provider.close()
+
+    @property
+    def stats(self) -> dict:
+        return {"providers": len(self._web3), "nonces": self.nonces.stats}
@@ -0,0 +1,159 @@
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+_INT64_MIN = -(1 << 63)
+_UINT64_MAX = (1 << 64) - 1
+
+# the fast backends only beat the standard library on small payloads once the check below
+# is paid for, see benchmarks/bench_json.py
+CANONICAL_MAX_VALUES = 32
+
+_ENCODE_ERRORS = (TypeError, ValueError, OverflowError)
+if msgspec is not None:
+    _ENCODE_ERRORS += (msgspec.EncodeError,)
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+class JsonCodec:
+    """
+    Compact JSON encoder and decoder backed by one of the supported libraries.
+
+    `dumps` and `loads` accept and ignore the keyword arguments of the `json` module
+    functions, so a codec can be passed wherever a json module is expected. Values the
+    backend cannot encode, such as integers wider than 64 bits for orjson, are encoded
+    with the standard library instead. orjson decodes such integers as floats, so the
+    orjson codec decodes with msgspec, or the standard library if msgspec is missing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        encode: Callable[[Any], Union[str, bytes]],
+        decode: Callable[[Union[str, bytes]], Any],
+    ):
+        self.name = name
+        self._encode = encode
+        self._decode = decode
+        self._native = name == "json"
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        if self._native:
+            return _stdlib_dumps(obj)
+        try:
+            return self._encode(obj).decode("utf-8")
+        except _ENCODE_ERRORS:
+            return _stdlib_dumps(obj)
+
+    def loads(self, data: Union[str, bytes], **kwargs) -> Any:
+        return self._decode(data)
+
+    def canonical_dumps(self, obj: Any) -> str:
+        """
+        Returns exactly the output of `json.dumps(obj, separators=(",", ":"))`.
+
+        Signatures are computed over this string, so the backend is only used for small
+        payloads of at most CANONICAL_MAX_VALUES values it provably encodes identically:
+        ASCII strings, 64-bit integers, booleans and None nested in lists and string keyed
+        dicts. Anything else, floats and large payloads in particular, goes through the
+        standard library.
+        """
+        if self._native or not _is_canonical(obj):
+            return _stdlib_dumps(obj)
+        return self._encode(obj).decode("utf-8")
+
+    def __repr__(self):
+        return f"JsonCodec({self.name!r})"
+
+
+def _is_canonical_str(value: str) -> bool:
+    # json.dumps escapes DEL while the fast encoders keep it as is
+    return value.isascii() and "\x7f" not in value
+
+
+def _is_canonical(obj: Any) -> bool:
+    # walks at most CANONICAL_MAX_VALUES values, larger payloads are not worth the check
+    stack = [obj]
+    budget = CANONICAL_MAX_VALUES
+    while stack:
+        budget -= 1
+        if budget < 0:
+            return False
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is str:
+            if not _is_canonical_str(value):
+                return False
+        elif value_type is int:
+            if not _INT64_MIN <= value <= _UINT64_MAX:
+                return False
+        elif value is None or value_type is bool:
+            continue
+        elif value_type is dict:
+            for key in value:
+                if type(key) is not str or not _is_canonical_str(key):
+                    return False
+            stack.extend(value.values())
+        elif value_type is list or value_type is tuple:
+            stack.extend(value)
+        else:
+            return False
+    return True
+
+
+def _create_codecs() -> Dict[str, JsonCodec]:
+    codecs = {"json": JsonCodec("json", _stdlib_dumps, json.loads)}
+    if msgspec is not None:
+        codecs["msgspec"] = JsonCodec("msgspec", msgspec.json.encode, msgspec.json.decode)
+    if orjson is not None:
+        # orjson turns integers wider than 64 bits into floats, losing precision on raw token amounts
+        decode = msgspec.json.decode if msgspec is not None else json.loads
+        codecs["orjson"] = JsonCodec("orjson", orjson.dumps, decode)
+    return codecs
+
+
+CODECS = _create_codecs()
+
+_AUTO_ORDER = ("msgspec", "orjson", "json")
+
+_default_codec: Optional[JsonCodec] = None
+
+
+def get_json_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Returns the codec with the given name: "orjson", "msgspec" or "json" for the standard library.
+    "auto" picks the fastest installed backend, None returns the process default.
+    """
+    if name is None:
+        return _default_codec
+    if name == "auto":
+        return next(CODECS[backend] for backend in _AUTO_ORDER if backend in CODECS)
+    if name not in CODECS:
+        raise ValueError(
+            f"JSON codec {name!r} is not available, installed codecs: {', '.join(CODECS)}"
+        )
+    return CODECS[name]
+
+
+def set_json_codec(name: str) -> JsonCodec:
+    """
+    Sets the process default codec, used for signed messages and by clients without a `json_codec` option.
+    """
+    global _default_codec
+    _default_codec = get_json_codec(name)
+    return _default_codec
+
+
+set_json_codec("auto")
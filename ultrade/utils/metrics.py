@@ -0,0 +1,242 @@
+import re
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class Histogram:
+    """
+    HDR-style histogram of durations.
+
+    Values are recorded in microseconds into log-linear buckets: every power of two range is
+    split into 64 linear sub-buckets, which keeps the relative error under 1.6% for any value
+    while memory stays proportional to the number of distinct magnitudes.
+    """
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @staticmethod
+    def _index(value: int) -> int:
+        magnitude = max(0, value.bit_length() - SUB_BUCKET_BITS)
+        return magnitude * SUB_BUCKET_HALF + (value >> magnitude)
+
+    @staticmethod
+    def _upper_bound(index: int) -> int:
+        if index < SUB_BUCKET_COUNT:
+            return index
+        magnitude = (index - SUB_BUCKET_HALF) // SUB_BUCKET_HALF
+        sub_bucket = index - magnitude * SUB_BUCKET_HALF
+        return ((sub_bucket + 1) << magnitude) - 1
+
+    def record(self, seconds: float):
+        index = self._index(max(0, int(seconds * 1_000_000)))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Returns the value in seconds below which `percentile` percent of the recorded values fall.
+        """
+        if not self.count:
+            return None
+        threshold = max(1, percentile / 100 * self.count)
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= threshold:
+                return min(self._upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max,
+        }
+
+
+class RequestTrace:
+    """
+    Timings and sizes of a single HTTP request, filled by the aiohttp trace hooks.
+
+    Timings are in seconds from the start of the request: `dns` and `connect` are only set
+    when a new connection was opened (`connect` includes the TLS handshake), `first_byte`
+    is the time until the response headers arrived and `total` includes reading the body.
+    """
+
+    def __init__(self, endpoint: str, method: str, url: str):
+        self.endpoint = endpoint
+        self.method = method
+        self.url = url
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.request_size = 0
+        self.response_size = 0
+        self._marks: Dict[str, float] = {}
+
+    def mark(self, name: str):
+        self._marks[name] = time.perf_counter()
+
+    def measure(self, name: str, since: str):
+        if since in self._marks:
+            self.timings[name] = time.perf_counter() - self._marks[since]
+
+    def finish(self):
+        self.timings["total"] = time.perf_counter() - self.started
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """
+    Returns the endpoint label of a request, e.g. "GET /market/order/{id}".
+    """
+    return f"{method} {_ID_SEGMENT.sub('/{id}', urlparse(url).path)}"
+
+
+class MetricsRegistry:
+    """
+    In-memory per-endpoint request metrics.
+
+    Keeps latency histograms for every timing phase plus status, error and payload size
+    counters. Listeners are called with every finished `RequestTrace`.
+    """
+
+    def __init__(self, listeners: Optional[List[Callable[[RequestTrace], None]]] = None):
+        self.listeners = list(listeners or [])
+        self._endpoints: Dict[str, Dict] = {}
+
+    def start(self, method: str, url: str) -> RequestTrace:
+        return RequestTrace(endpoint_name(method, url), method, url)
+
+    def finish(self, trace: RequestTrace):
+        trace.finish()
+        stats = self._endpoints.get(trace.endpoint)
+        if stats is None:
+            stats = self._endpoints[trace.endpoint] = {
+                "timings": {},
+                "statuses": {},
+                "errors": {},
+                "requests": 0,
+                "bytes_sent": 0,
+                "bytes_received": 0,
+            }
+        stats["requests"] += 1
+        stats["bytes_sent"] += trace.request_size
+        stats["bytes_received"] += trace.response_size
+        if trace.status is not None:
+            stats["statuses"][trace.status] = stats["statuses"].get(trace.status, 0) + 1
+        if trace.error is not None:
+            error_name = type(trace.error).__name__
+            stats["errors"][error_name] = stats["errors"].get(error_name, 0) + 1
+        for name, value in trace.timings.items():
+            histogram = stats["timings"].get(name)
+            if histogram is None:
+                histogram = stats["timings"][name] = Histogram()
+            histogram.record(value)
+
+        for listener in self.listeners:
+            listener(trace)
+
+    def histogram(self, endpoint: str, timing: str = "total") -> Optional[Histogram]:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            return None
+        return stats["timings"].get(timing)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Returns the metrics of every endpoint with p50/p99/p999 summaries of each timing phase.
+        """
+        return {
+            endpoint: {
+                "requests": stats["requests"],
+                "statuses": dict(stats["statuses"]),
+                "errors": dict(stats["errors"]),
+                "bytes_sent": stats["bytes_sent"],
+                "bytes_received": stats["bytes_received"],
+                "timings": {
+                    name: histogram.summary() for name, histogram in stats["timings"].items()
+                },
+            }
+            for endpoint, stats in self._endpoints.items()
+        }
+
+    def reset(self):
+        self._endpoints.clear()
+
+
+def _trace_of(trace_config_ctx) -> Optional[RequestTrace]:
+    trace = trace_config_ctx.trace_request_ctx
+    return trace if isinstance(trace, RequestTrace) else None
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """
+    Creates the aiohttp TraceConfig that fills the `RequestTrace` passed as `trace_request_ctx`.
+    """
+
+    async def on_dns_resolvehost_start(session, ctx, params):
+        trace = _trace_of(ctx)
+        if trace:
+            trace.mark("dns")
+
+    async def on_dns_resolvehost_end(session, ctx, params):
+        trace = _trace_of(ctx)
+        if trace:
+            trace.measure("dns", "dns")
+
+    async def on_connection_create_start(session, ctx, params):
+        trace = _trace_of(ctx)
+        if trace:
+            trace.mark("connect")
+
+    async def on_connection_create_end(session, ctx, params):
+        trace = _trace_of(ctx)
+        if trace:
+            trace.measure("connect", "connect")
+
+    async def on_request_chunk_sent(session, ctx, params):
+        trace = _trace_of(ctx)
+        if trace:
+            trace.request_size += len(params.chunk)
+
+    async def on_request_end(session, ctx, params):
+        trace = _trace_of(ctx)
+        if trace:
+            trace.timings["first_byte"] = time.perf_counter() - trace.started
+
+    async def on_response_chunk_received(session, ctx, params):
+        trace = _trace_of(ctx)
+        if trace:
+            trace.response_size += len(params.chunk)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_chunk_sent.append(on_request_chunk_sent)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_response_chunk_received.append(on_response_chunk_received)
+    return trace_config
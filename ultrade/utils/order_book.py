@@ -0,0 +1,247 @@
+import asyncio
+import heapq
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from ..types import Depth
+
+Price = Union[int, Decimal]
+
+
+def parse_price(price: str) -> Price:
+    """
+    Converts a price string into an exact sortable number, integers stay integers.
+    """
+    return int(price) if price.isdigit() else Decimal(price)
+
+
+class BookSide:
+    """
+    Price levels of one side of an order book.
+
+    Levels live in a dict for O(1) lookups, the best price is kept on a heap with lazy
+    deletion: removed levels are only dropped from the heap when they reach the top.
+    """
+
+    def __init__(self, descending: bool):
+        self._sign = -1 if descending else 1
+        self._levels: Dict[Price, Tuple[str, str]] = {}
+        self._heap: List[Price] = []
+
+    def __len__(self):
+        return len(self._levels)
+
+    def clear(self):
+        self._levels.clear()
+        self._heap.clear()
+
+    def update(self, price: str, quantity: str):
+        key = parse_price(price)
+        if parse_price(quantity) == 0:
+            self._levels.pop(key, None)
+            return
+        if key not in self._levels:
+            heapq.heappush(self._heap, self._sign * key)
+        self._levels[key] = (price, quantity)
+        if len(self._heap) > 2 * len(self._levels) + 64:
+            self._heap = [self._sign * key for key in self._levels]
+            heapq.heapify(self._heap)
+
+    def best(self) -> Optional[Tuple[str, str]]:
+        heap = self._heap
+        while heap:
+            level = self._levels.get(self._sign * heap[0])
+            if level is not None:
+                return level
+            heapq.heappop(heap)
+        return None
+
+    def get(self, price: str) -> Optional[str]:
+        level = self._levels.get(parse_price(price))
+        return level[1] if level else None
+
+    def top(self, count: int) -> List[Tuple[str, str]]:
+        keys = heapq.nsmallest(count, self._levels, key=lambda key: self._sign * key)
+        return [self._levels[key] for key in keys]
+
+
+class OrderBook:
+    """
+    Order book of a pair, built from a depth snapshot and kept current with depth updates.
+
+    Levels are `[price, quantity]` string pairs as returned by the API, a zero quantity
+    removes the level.
+    """
+
+    def __init__(self):
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id: Optional[int] = None
+
+    def load(self, snapshot: Depth):
+        self.bids.clear()
+        self.asks.clear()
+        self.apply(snapshot)
+
+    def apply(self, update: Depth):
+        for price, quantity in update.get("buy") or []:
+            self.bids.update(price, quantity)
+        for price, quantity in update.get("sell") or []:
+            self.asks.update(price, quantity)
+        if update.get("u") is not None:
+            self.last_update_id = update["u"]
+
+    @property
+    def best_bid(self) -> Optional[Tuple[str, str]]:
+        return self.bids.best()
+
+    @property
+    def best_ask(self) -> Optional[Tuple[str, str]]:
+        return self.asks.best()
+
+    def depth(self, levels: int = 10) -> Depth:
+        return {
+            "buy": [list(level) for level in self.bids.top(levels)],
+            "sell": [list(level) for level in self.asks.top(levels)],
+            "u": self.last_update_id,
+        }
+
+
+class OrderBookGapException(Exception):
+    pass
+
+
+class LocalOrderBook(OrderBook):
+    """
+    Order book of a pair maintained from the DEPTH stream.
+
+    Updates received before the book is synced are buffered. The book is bootstrapped
+    from a REST snapshot: buffered updates with `u` up to the snapshot `u` are dropped and
+    the rest is replayed. Afterwards every update must start right after the previous one
+    (`U == last u + 1`), otherwise the book is resynced from a new snapshot. Updates
+    without `U` are applied when their `u` is newer than the book.
+
+    Args:
+        symbol (str): The pair of the book.
+        fetch_snapshot (Callable): Coroutine function returning a fresh `Depth` snapshot.
+        on_close (Callable, optional): Coroutine function called by `close`, e.g. to unsubscribe the stream.
+        max_resync_attempts (int): Attempts of a resync before it fails.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        fetch_snapshot: Callable[[], Awaitable[Depth]],
+        on_close: Optional[Callable[[], Awaitable]] = None,
+        max_resync_attempts: int = 5,
+    ):
+        super().__init__()
+        self.symbol = symbol
+        self._fetch_snapshot = fetch_snapshot
+        self._on_close = on_close
+        self._max_resync_attempts = max_resync_attempts
+        self._buffer: List[Depth] = []
+        self._resync_task: Optional[asyncio.Task] = None
+        self.synced = False
+        self.updates = 0
+        self.gaps = 0
+        self.resyncs = 0
+        self.error: Optional[BaseException] = None
+
+    def on_depth(self, update: Depth):
+        """
+        Feeds a DEPTH stream update into the book.
+        """
+        if not self.synced:
+            self._buffer.append(update)
+            if self.error is not None:
+                self._schedule_resync()
+            return
+        try:
+            self._apply_in_sequence(update)
+        except OrderBookGapException:
+            self.gaps += 1
+            self._buffer.append(update)
+            self._schedule_resync()
+
+    def _apply_in_sequence(self, update: Depth):
+        last = self.last_update_id
+        final = update.get("u")
+        if last is not None and final is not None:
+            if final <= last:
+                return
+            first = update.get("U")
+            if first is not None and first > last + 1:
+                raise OrderBookGapException(
+                    f"Depth update {first}-{final} does not follow {last} for {self.symbol}"
+                )
+        self.apply(update)
+        self.updates += 1
+
+    def _schedule_resync(self):
+        self.synced = False
+        if self._resync_task is None or self._resync_task.done():
+            self._resync_task = asyncio.ensure_future(self.resync())
+            self._resync_task.add_done_callback(self._on_resync_done)
+
+    def _on_resync_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            self.error = task.exception()
+
+    def _sync(self, snapshot: Depth) -> bool:
+        self.load(snapshot)
+        buffered, self._buffer = self._buffer, []
+        for index, update in enumerate(buffered):
+            try:
+                self._apply_in_sequence(update)
+            except OrderBookGapException:
+                # keep the updates the next snapshot may not cover yet
+                self._buffer = buffered[index:] + self._buffer
+                return False
+        self.synced = True
+        self.resyncs += 1
+        self.error = None
+        return True
+
+    def on_snapshot(self, snapshot: Depth):
+        """
+        Loads a snapshot delivered with the stream, e.g. after a reconnect, and replays the buffered updates.
+        """
+        if self._resync_task is not None and not self._resync_task.done():
+            self._resync_task.cancel()
+        self._resync_task = None
+        if not self._sync(snapshot):
+            self.gaps += 1
+            self._schedule_resync()
+
+    async def resync(self):
+        """
+        Loads a snapshot and replays the buffered updates on top of it.
+        Updates arriving meanwhile are buffered, the book is synced when the method returns.
+        """
+        self.synced = False
+        for attempt in range(1, self._max_resync_attempts + 1):
+            snapshot = await self._fetch_snapshot()
+            if self._sync(snapshot):
+                return
+            if attempt == self._max_resync_attempts:
+                break
+            await asyncio.sleep(0.05 * attempt)
+        raise OrderBookGapException(f"Could not sync the order book of {self.symbol}")
+
+    async def close(self):
+        if self._resync_task is not None and not self._resync_task.done():
+            self._resync_task.cancel()
+        if self._on_close is not None:
+            await self._on_close()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "updates": self.updates,
+            "gaps": self.gaps,
+            "resyncs": self.resyncs,
+            "buffered": len(self._buffer),
+            "bid_levels": len(self.bids),
+            "ask_levels": len(self.asks),
+        }
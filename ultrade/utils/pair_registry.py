@@ -0,0 +1,119 @@
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from ..types import PairInfo, TradingPair
+from .singleflight import RequestCoalescer
+
+PairKey = Union[int, str]
+
+
+class PairRegistry:
+    """
+    In-memory cache of trading pairs indexed by id, by pair_key and by (base_id, price_id).
+
+    The index is built from the pair list and expires after `ttl` seconds. Pairs that are
+    not part of the list are fetched one by one, concurrent misses for the same pair share
+    a single request.
+    """
+
+    def __init__(
+        self,
+        fetch_pair_list: Callable[[], Awaitable[List[TradingPair]]],
+        fetch_pair: Callable[[PairKey], Awaitable[PairInfo]],
+        ttl: float = 300,
+    ):
+        self._fetch_pair_list = fetch_pair_list
+        self._fetch_pair = fetch_pair
+        self.ttl = ttl
+        self._by_id: Dict[int, PairInfo] = {}
+        self._by_symbol: Dict[str, PairInfo] = {}
+        self._by_tokens: Dict[Tuple[str, str], PairInfo] = {}
+        self._loaded_at: Optional[float] = None
+        self._coalescer = RequestCoalescer()
+
+    @staticmethod
+    def _normalize_key(key: PairKey) -> PairKey:
+        if isinstance(key, int):
+            return key
+        key = str(key).strip()
+        if key.isdigit():
+            return int(key)
+        return key.lower()
+
+    def is_expired(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at > self.ttl
+
+    def invalidate(self, key: Optional[PairKey] = None):
+        """
+        Drops a single pair from the index, or the whole index if no key is given.
+        """
+        if key is None:
+            self._by_id.clear()
+            self._by_symbol.clear()
+            self._by_tokens.clear()
+            self._loaded_at = None
+            return
+
+        pair = self.lookup(key)
+        if pair is None:
+            return
+        self._by_id.pop(pair.get("id"), None)
+        self._by_id.pop(pair.get("pairId"), None)
+        self._by_symbol.pop(str(pair.get("pair_key", "")).lower(), None)
+        self._by_tokens.pop((str(pair.get("base_id")), str(pair.get("price_id"))), None)
+
+    def add(self, pair: PairInfo):
+        for pair_id in (pair.get("id"), pair.get("pairId")):
+            if pair_id is not None:
+                self._by_id[int(pair_id)] = pair
+        if pair.get("pair_key"):
+            self._by_symbol[pair["pair_key"].lower()] = pair
+        if pair.get("base_id") is not None and pair.get("price_id") is not None:
+            self._by_tokens[(str(pair["base_id"]), str(pair["price_id"]))] = pair
+
+    def lookup(self, key: PairKey) -> Optional[PairInfo]:
+        """
+        Returns the cached pair for an id or a pair_key without any network access.
+        """
+        key = self._normalize_key(key)
+        if isinstance(key, int):
+            return self._by_id.get(key)
+        return self._by_symbol.get(key)
+
+    def find_by_tokens(self, base_id: Union[str, int], price_id: Union[str, int]) -> Optional[PairInfo]:
+        return self._by_tokens.get((str(base_id), str(price_id)))
+
+    async def refresh(self):
+        """
+        Rebuilds the index from the pair list.
+        """
+        await self._coalescer.run("__pair_list__", self._load_pair_list)
+
+    async def get(self, key: PairKey) -> Optional[PairInfo]:
+        """
+        Returns the pair for an id or a pair_key, loading the pair list or the single pair if needed.
+        """
+        if self.is_expired():
+            await self.refresh()
+
+        pair = self.lookup(key)
+        if pair is not None:
+            return pair
+
+        key = self._normalize_key(key)
+        return await self._coalescer.run(key, lambda: self._load_pair(key))
+
+    async def _load_pair_list(self):
+        pairs = await self._fetch_pair_list()
+        self.invalidate()
+        for pair in pairs or []:
+            self.add(pair)
+        self._loaded_at = time.monotonic()
+
+    async def _load_pair(self, key: PairKey) -> Optional[PairInfo]:
+        pair = await self._fetch_pair(key)
+        if pair:
+            self.add(pair)
+        return pair
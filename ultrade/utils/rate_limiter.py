@@ -0,0 +1,169 @@
+import asyncio
+import heapq
+import itertools
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate` tokens per second up to `capacity`.
+
+    The rate is adaptive: it is halved on every throttling response and recovers
+    additively on successful responses up to the configured rate.
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate_ratio: float = 0.1):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.min_rate = rate * min_rate_ratio
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, cost: float = 1) -> float:
+        """
+        Returns how long to wait until `cost` tokens are available.
+        """
+        self._refill()
+        if self.tokens >= cost:
+            return 0
+        return (cost - self.tokens) / self.rate
+
+    def take(self, cost: float = 1):
+        self._refill()
+        self.tokens -= cost
+
+    def throttle(self):
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = min(self.tokens, 0)
+
+    def recover(self):
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class RateLimitException(Exception):
+    def __init__(self, message, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Converts a Retry-After header, either delay seconds or an HTTP date, into seconds.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Client side rate limiter for REST endpoints.
+
+    Every endpoint class has its own token bucket, and all classes share a global bucket.
+    When the global budget is exhausted, waiting requests are released by priority
+    (lower value first), so order placement and cancels go ahead of market data polling.
+
+    Args:
+        limits (dict): Maps an endpoint class, and "global", to a (rate per second, burst) tuple.
+        priorities (dict): Maps an endpoint class to its priority.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]], priorities: Dict[str, int]):
+        limits = dict(limits)
+        global_rate, global_burst = limits.pop("global")
+        self._global = TokenBucket(global_rate, global_burst)
+        self._buckets = {
+            endpoint_class: TokenBucket(rate, burst)
+            for endpoint_class, (rate, burst) in limits.items()
+        }
+        self._priorities = priorities
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+        self.throttled = 0
+        self.waited = 0.0
+
+    async def acquire(self, endpoint_class: str):
+        started = time.monotonic()
+        bucket = self._buckets.get(endpoint_class)
+        if bucket is not None:
+            delay = bucket.delay()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = bucket.delay()
+            bucket.take()
+
+        if not self._waiters and self._ready_delay() == 0:
+            self._global.take()
+        else:
+            future = asyncio.get_running_loop().create_future()
+            priority = self._priorities.get(endpoint_class, max(self._priorities.values(), default=0))
+            heapq.heappush(self._waiters, (priority, next(self._counter), future))
+            if self._dispatcher is None or self._dispatcher.done():
+                self._dispatcher = asyncio.ensure_future(self._dispatch())
+            await future
+        self.waited += time.monotonic() - started
+
+    def _ready_delay(self) -> float:
+        return max(self._paused_until - time.monotonic(), self._global.delay())
+
+    async def _dispatch(self):
+        while self._waiters:
+            delay = self._ready_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._global.take()
+            future.set_result(None)
+
+    def on_response(self, endpoint_class: str, status: int, retry_after: Optional[str] = None):
+        """
+        Feeds a response back into the limiter: 429 and 503 responses shrink the rate of the
+        endpoint class and pause all requests for Retry-After seconds, other responses let it recover.
+        """
+        bucket = self._buckets.get(endpoint_class)
+        if status in (429, 503):
+            self.throttled += 1
+            self._global.throttle()
+            if bucket is not None:
+                bucket.throttle()
+            delay = parse_retry_after(retry_after)
+            if delay:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            return
+
+        self._global.recover()
+        if bucket is not None:
+            bucket.recover()
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        stats = {
+            "throttled": self.throttled,
+            "waited": self.waited,
+            "queued": len(self._waiters),
+            "global_rate": self._global.rate,
+        }
+        for endpoint_class, bucket in self._buckets.items():
+            stats[f"{endpoint_class}_rate"] = bucket.rate
+        return stats
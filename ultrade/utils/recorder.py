@@ -0,0 +1,132 @@
+import asyncio
+import mmap
+import os
+import struct
+import time
+from typing import Any, Awaitable, Callable, Iterator, Optional, Tuple
+
+from .json_codec import get_json_codec
+
+MAGIC = b"ULOG"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+# body length, then receive time and event name length at the start of the body
+RECORD_LENGTH = struct.Struct("<I")
+RECORD_HEADER = struct.Struct("<dB")
+
+
+class EventRecorder:
+    """
+    Appends socket events to a binary log.
+
+    The file starts with a "ULOG" magic and a format version. Every record is the length
+    of its body followed by the body: receive time (unix seconds, float64), length of the
+    event name, the event name and the JSON payload. Records are appended, so a recording
+    can be resumed, and a truncated last record is ignored on replay.
+
+    Args:
+        path (str): Path of the log file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self._json = get_json_codec()
+        self.records = 0
+        # events that could not be recorded, counted by the connection
+        self.failures = 0
+
+    def record(self, event: str, args: Any, timestamp: Optional[float] = None):
+        event_bytes = event.encode("utf-8")
+        payload = self._json.dumps(args).encode("utf-8")
+        self._file.write(
+            RECORD_LENGTH.pack(RECORD_HEADER.size + len(event_bytes) + len(payload))
+            + RECORD_HEADER.pack(time.time() if timestamp is None else timestamp, len(event_bytes))
+            + event_bytes
+            + payload
+        )
+        self.records += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class EventReplayer:
+    """
+    Reads a log written by `EventRecorder` through a memory map.
+
+    Args:
+        path (str): Path of the log file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._json = get_json_codec()
+
+    def __iter__(self) -> Iterator[Tuple[float, str, Any]]:
+        """
+        Yields the (receive time, event, payload) records of the log.
+        """
+        if os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version = FILE_HEADER.unpack_from(data, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{self.path} is not an event log of version {VERSION}")
+            offset = FILE_HEADER.size
+            size = len(data)
+            while offset + RECORD_LENGTH.size <= size:
+                (length,) = RECORD_LENGTH.unpack_from(data, offset)
+                start = offset + RECORD_LENGTH.size
+                end = start + length
+                if end > size:
+                    break
+                timestamp, event_length = RECORD_HEADER.unpack_from(data, start)
+                event_start = start + RECORD_HEADER.size
+                event = data[event_start: event_start + event_length].decode("utf-8")
+                payload = self._json.loads(data[event_start + event_length: end])
+                yield timestamp, event, payload
+                offset = end
+
+    async def replay(
+        self,
+        dispatch: Callable[[str, Any], Awaitable],
+        speed: Optional[float] = None,
+    ) -> int:
+        """
+        Feeds the recorded events to `dispatch`, e.g. `SocketController.callback_handler`.
+
+        Args:
+            dispatch (Callable): Coroutine function called with the event name and payload.
+            speed (float, optional): Replay pace relative to the recording, 1.0 keeps the recorded
+                timing. None replays as fast as possible.
+
+        Returns:
+            int: The number of replayed events.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first_timestamp = None
+        count = 0
+        for timestamp, event, payload in self:
+            if speed is not None:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                delay = started + (timestamp - first_timestamp) / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await dispatch(event, payload)
+            count += 1
+        return count
@@ -0,0 +1,117 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+import aiohttp
+
+from .rate_limiter import RateLimitException
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    Retries failed requests with jittered exponential backoff within a per-call deadline.
+
+    Idempotent requests are retried on connection errors, timeouts and `retry_statuses`.
+    Other requests are only retried when they provably never reached the server: the
+    connection could not be established, or the server refused them with 429.
+
+    Args:
+        max_attempts (int): Maximum number of attempts per call, including the first one.
+        base_delay (float): Backoff of the first retry in seconds, doubled on every retry.
+        max_delay (float): Upper bound of a single backoff in seconds.
+        deadline (float, optional): Time budget of a call in seconds, including all retries.
+        retry_statuses (Iterable[int]): HTTP statuses that are retried for idempotent requests.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        deadline: Optional[float] = 30.0,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts should be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.elapsed = 0.0
+        self.max_elapsed = 0.0
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns the delay before retry number `attempt` (starting at 1), using full jitter.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    def is_retryable(self, error: BaseException, idempotent: bool) -> bool:
+        if isinstance(error, (RateLimitException, aiohttp.ClientConnectorError)):
+            return True
+        if not idempotent:
+            return False
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in self.retry_statuses
+        return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+    async def run(self, call: Callable[[], Awaitable], idempotent: bool):
+        started = time.monotonic()
+        attempt = 0
+        self.calls += 1
+        try:
+            while True:
+                attempt += 1
+                self.attempts += 1
+                remaining = None
+                if self.deadline is not None:
+                    remaining = self.deadline - (time.monotonic() - started)
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError(f"Deadline of {self.deadline}s exceeded")
+                try:
+                    return await asyncio.wait_for(call(), remaining)
+                except Exception as error:
+                    delay = self.backoff(attempt, getattr(error, "retry_after", None))
+                    out_of_time = (
+                        self.deadline is not None
+                        and time.monotonic() - started + delay >= self.deadline
+                    )
+                    if (
+                        attempt >= self.max_attempts
+                        or out_of_time
+                        or not self.is_retryable(error, idempotent)
+                    ):
+                        self.failures += 1
+                        error.attempts = attempt
+                        error.elapsed = time.monotonic() - started
+                        raise
+                    self.retries += 1
+                    await asyncio.sleep(delay)
+        finally:
+            elapsed = time.monotonic() - started
+            self.elapsed += elapsed
+            self.max_elapsed = max(self.max_elapsed, elapsed)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "failures": self.failures,
+            "attempts_per_call": self.attempts / calls,
+            "avg_elapsed": self.elapsed / calls,
+            "max_elapsed": self.max_elapsed,
+        }
@@ -0,0 +1,50 @@
+import os
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from .encode import get_order_bytes
+
+
+def sign_order(signer, data: dict) -> dict:
+    """
+    Encodes the order data and signs it, returns the payload expected by the order endpoints.
+    """
+    message_bytes = get_order_bytes(data)
+    signature = signer.sign_data(message_bytes)
+    signature_hex = signature.hex() if isinstance(signature, bytes) else signature
+
+    return {
+        "data": data,
+        "encoding": "hex",
+        "message": message_bytes.hex(),
+        "signature": signature_hex,
+    }
+
+
+def sign_orders(signer, orders: List[dict]) -> List[dict]:
+    return [sign_order(signer, data) for data in orders]
+
+
+def signing_workers(workers: Optional[int] = None) -> int:
+    """
+    Returns the number of signing workers, the number of CPUs unless `workers` is set.
+    """
+    return workers or os.cpu_count() or 1
+
+
+def create_signing_executor(kind: str = "thread", workers: Optional[int] = None) -> Executor:
+    """
+    Creates the pool used for signing bulk orders.
+
+    Args:
+        kind (str): "thread" or "process".
+        workers (int, optional): Number of workers. Defaults to the number of CPUs.
+    """
+    workers = signing_workers(workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ultrade-signing")
+    if kind == "process":
+        # forked workers inherit the parent random state, reseed so order nonces stay unique
+        return ProcessPoolExecutor(max_workers=workers, initializer=random.seed)
+    raise ValueError("signing_pool should be either 'thread' or 'process'")
@@ -0,0 +1,59 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class RequestCoalescer:
+    """
+    Shares one in-flight call between all callers asking for the same key and optionally
+    keeps the result for a short time.
+
+    Results are handed to every caller as the same object, they should be treated as read-only.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self.requests = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable], ttl: float = 0):
+        self.requests += 1
+
+        if ttl > 0:
+            cached = self._cache.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self.cache_hits += 1
+                    return cached[1]
+                del self._cache[key]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._on_done(key, done, ttl))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _on_done(self, key: Hashable, future: asyncio.Future, ttl: float):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if ttl > 0 and not future.cancelled() and future.exception() is None:
+            self._cache[key] = (time.monotonic() + ttl, future.result())
+
+    def clear(self):
+        self._cache.clear()
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        requests = self.requests or 1
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "hit_ratio": self.cache_hits / requests,
+            "coalesce_ratio": self.coalesced / requests,
+        }
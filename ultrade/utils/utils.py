@@ -1,8 +1,8 @@
 import re
 import base58
-import json
 from algosdk.encoding import is_valid_address as is_valid_algorand_address
 from ..types import WormholeChains
+from .json_codec import get_json_codec
 
 
 def is_valid_evm_address(address: str) -> bool:
@@ -29,4 +29,4 @@ def get_wh_id_by_address(address: str):
 
 
 def toJson(data):
-    return json.dumps(data, separators=(",", ":"))
+    return get_json_codec().canonical_dumps(data)